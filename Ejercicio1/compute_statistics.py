@@ -1,40 +1,124 @@
 """
 Módulo: compute_statistics.py
-Descripción: Este programa calcula estadísticas descriptivas básicas 
-(media, mediana, moda, varianza y desviación estándar) a partir de un archivo de números.
-Los resultados se muestran en la consola y se guardan en un archivo de resultados.
+Descripción: Este programa calcula estadísticas descriptivas básicas
+(media, mediana, moda, varianza y desviación estándar) a partir de uno o varios
+archivos de números. Los resultados se muestran en la consola y se guardan en un
+archivo de resultados.
 """
 
-import sys
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
 import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from comun.archivos import dividir_en_rangos, expandir_rutas
+from comun.instrumentacion import Instrumentacion, agregar_argumentos
+from comun.lector_numerico import (
+    AdvertenciasAcotadas,
+    convertir_lineas,
+    iterar_bloques_de_numeros,
+    iterar_lotes_de_lineas,
+    reportar_advertencias,
+)
+from cuantiles import (
+    EstimadorP2,
+    TDigest,
+    mediana_por_seleccion,
+    percentiles_por_seleccion,
+)
+from frecuencias import (
+    FrecuenciaConDesborde,
+    FrecuenciaExacta,
+    SpaceSaving,
+    moda_desde_frecuencias,
+)
+
+def iterar_numeros_desde_archivo(ruta_archivo):
+    """
+    Genera los números de un archivo uno por uno, sin guardarlos en memoria.
+    Ignora líneas con datos inválidos y muestra las advertencias al terminar.
+    """
+    advertencias = []
+    for bloque in iterar_bloques_de_numeros(ruta_archivo, advertencias):
+        yield from bloque
+    reportar_advertencias(advertencias)
 
 def leer_numeros_desde_archivo(ruta_archivo):
     """
     Lee números desde un archivo y los almacena en una lista.
     Ignora líneas con datos inválidos y muestra advertencias.
     """
-    numeros = []
-    with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
-        for numero_linea, linea in enumerate(archivo, start=1):
-            try:
-                numero = float(linea.strip())
-                numeros.append(numero)
-            except ValueError:
-                print(f"Dato inválido en la línea {numero_linea}: '{linea.strip()}' (ignorado)")
-    return numeros
+    return list(iterar_numeros_desde_archivo(ruta_archivo))
 
 def calcular_media(numeros):
     """Calcula y devuelve la media de una lista de números."""
     return sum(numeros) / len(numeros)
 
 def calcular_mediana(numeros):
-    """Calcula y devuelve la mediana de una lista de números."""
-    numeros_ordenados = sorted(numeros)
-    n = len(numeros_ordenados)
-    mitad = n // 2
-    if n % 2 == 0:
-        return (numeros_ordenados[mitad - 1] + numeros_ordenados[mitad]) / 2
-    return numeros_ordenados[mitad]
+    """
+    Calcula y devuelve la mediana de una lista de números.
+    Copia los datos a un búfer compacto array('d') y selecciona los elementos
+    centrales en tiempo lineal, sin ordenar la lista completa.
+    """
+    return mediana_por_seleccion(array('d', numeros))
+
+def calcular_mediana_aproximada(numeros):
+    """
+    Estima la mediana de un iterable de números con memoria constante (P²).
+    Útil para entradas que no caben en memoria; devuelve None si no hay números.
+    La opción --mediana-aproximada usa en cambio el t-digest del acumulador,
+    porque sus resúmenes parciales se pueden fusionar y guardar en la caché.
+    """
+    estimador = EstimadorP2(0.5)
+    for numero in numeros:
+        estimador.agregar(numero)
+    return estimador.valor()
+
+def calcular_percentiles(numeros, percentiles):
+    """
+    Calcula varios percentiles (0 a 100) de una lista de números con una sola
+    selección parcial sobre un búfer array('d').
+    Devuelve un diccionario {percentil: valor}.
+    """
+    return percentiles_por_seleccion(array('d', numeros), percentiles)
+
+def construir_sketch(numeros, compresion=100):
+    """
+    Resume un iterable de números en un t-digest.
+    Los sketches de distintos archivos se pueden combinar con fusionar_sketches().
+    """
+    sketch = TDigest(compresion)
+    for numero in numeros:
+        sketch.agregar(numero)
+    return sketch
+
+def fusionar_sketches(sketches):
+    """Combina varios t-digest en uno nuevo sin modificar los originales."""
+    fusionado = None
+    for sketch in sketches:
+        if fusionado is None:
+            fusionado = TDigest(sketch.compresion)
+        fusionado.fusionar(sketch)
+    return fusionado
+
+def calcular_percentiles_aproximados(sketch, percentiles):
+    """
+    Estima varios percentiles (0 a 100) a partir de un t-digest.
+    Devuelve un diccionario {percentil: valor}.
+    """
+    return {percentil: sketch.cuantil(percentil / 100) for percentil in percentiles}
 
 def calcular_moda(numeros):
     """
@@ -44,9 +128,7 @@ def calcular_moda(numeros):
     frecuencia = {}
     for numero in numeros:
         frecuencia[numero] = frecuencia.get(numero, 0) + 1
-    max_frecuencia = max(frecuencia.values())
-    modas = [clave for clave, valor in frecuencia.items() if valor == max_frecuencia]
-    return modas if len(modas) > 1 else modas[0]
+    return moda_desde_frecuencias(frecuencia)
 
 def calcular_varianza(numeros, media):
     """Calcula y devuelve la varianza de una lista de números."""
@@ -56,45 +138,677 @@ def calcular_desviacion_estandar(varianza):
     """Calcula y devuelve la desviación estándar a partir de la varianza."""
     return varianza ** 0.5
 
+class AcumuladorEstadistico:
+    """
+    Acumula en una sola pasada las estadísticas de un flujo de números.
+    La media y la varianza se actualizan con el método de Welford, la moda con una
+    tabla de frecuencias y la mediana se obtiene de un búfer compacto array('d').
+    Con mediana_aproximada=True no se guardan los valores: la mediana y los
+    percentiles se estiman con un t-digest de memoria acotada.
+    modo_moda elige la tabla de frecuencias: 'exacta' (en memoria), 'aproximada'
+    (Space-Saving con capacidad_moda contadores) o 'desborde' (exacta, con corridas
+    en disco a partir de umbral_desborde valores distintos).
+    """
+
+    def __init__(self, mediana_aproximada=False, modo_moda='exacta',
+                 capacidad_moda=1000, umbral_desborde=1_000_000):
+        self.cantidad = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        if modo_moda == 'aproximada':
+            self.frecuencia = SpaceSaving(capacidad_moda)
+        elif modo_moda == 'desborde':
+            self.frecuencia = FrecuenciaConDesborde(umbral_desborde)
+        else:
+            self.frecuencia = FrecuenciaExacta()
+        if mediana_aproximada:
+            self.valores = None
+            self.sketch = TDigest()
+        else:
+            self.valores = array('d')
+            self.sketch = None
+
+    def agregar(self, numero):
+        """Incorpora un número al acumulador."""
+        self.cantidad += 1
+        delta = numero - self.media
+        self.media += delta / self.cantidad
+        self.m2 += delta * (numero - self.media)
+        self.frecuencia.agregar(numero)
+        if self.valores is not None:
+            self.valores.append(numero)
+        else:
+            self.sketch.agregar(numero)
+
+    def agregar_bloque(self, numeros):
+        """
+        Incorpora una lista de números de una sola vez.
+        La media y el M2 del bloque se combinan con los acumulados mediante la
+        fórmula paralela de Welford (Chan et al.); la tabla de frecuencias y el
+        búfer de valores se actualizan con operaciones en bloque.
+        """
+        cantidad = len(numeros)
+        if cantidad == 0:
+            return
+        media_bloque = sum(numeros) / cantidad
+        m2_bloque = sum((numero - media_bloque) ** 2 for numero in numeros)
+        self.combinar_momentos(cantidad, media_bloque, m2_bloque)
+        self.frecuencia.agregar_bloque(numeros)
+        if self.valores is not None:
+            self.valores.extend(numeros)
+        else:
+            for numero in numeros:
+                self.sketch.agregar(numero)
+
+    def combinar_momentos(self, cantidad, media, m2):
+        """Combina la cantidad, media y M2 de otro conjunto de datos con los acumulados."""
+        if cantidad == 0:
+            return
+        total = self.cantidad + cantidad
+        delta = media - self.media
+        self.media += delta * cantidad / total
+        self.m2 += m2 + delta * delta * self.cantidad * cantidad / total
+        self.cantidad = total
+
+    def fusionar(self, otro):
+        """
+        Incorpora las estadísticas parciales de otro acumulador (cantidad, media, M2,
+        frecuencias y valores o sketch) sin volver a leer sus datos.
+        Ambos acumuladores deben usar los mismos modos de mediana y de moda.
+        """
+        self.combinar_momentos(otro.cantidad, otro.media, otro.m2)
+        self.frecuencia.fusionar(otro.frecuencia)
+        if self.valores is not None:
+            self.valores.extend(otro.valores)
+        else:
+            self.sketch.fusionar(otro.sketch)
+        return self
+
+    def agregar_desde(self, numeros):
+        """Incorpora todos los números de un iterable y devuelve el acumulador."""
+        for numero in numeros:
+            self.agregar(numero)
+        return self
+
+    def to_dict(self):
+        """
+        Devuelve el estado combinable del acumulador como un diccionario serializable
+        (JSON). En modo exacto los valores se guardan como histograma de pares
+        [valor, conteo], que basta para la mediana y los percentiles exactos; si la
+        tabla de frecuencias es exacta, ella misma es el histograma y no se repite.
+        La moda con desborde a disco no se puede serializar.
+        """
+        histograma = None
+        if self.valores is not None and not isinstance(self.frecuencia, FrecuenciaExacta):
+            histograma = [[valor, conteo] for valor, conteo in Counter(self.valores).items()]
+        return {
+            "cantidad": self.cantidad,
+            "media": self.media,
+            "m2": self.m2,
+            "frecuencia": self.frecuencia.to_dict(),
+            "sketch": None if self.sketch is None else self.sketch.to_dict(),
+            "histograma": histograma,
+        }
+
+    @classmethod
+    def from_dict(cls, datos):
+        """
+        Reconstruye un acumulador a partir de to_dict(). En modo exacto el búfer de
+        valores se rehace desde el histograma, en orden de valor distinto.
+        """
+        acumulador = cls(mediana_aproximada=datos["sketch"] is not None)
+        acumulador.cantidad = datos["cantidad"]
+        acumulador.media = datos["media"]
+        acumulador.m2 = datos["m2"]
+        if datos["frecuencia"]["modo"] == 'aproximada':
+            acumulador.frecuencia = SpaceSaving.from_dict(datos["frecuencia"])
+        else:
+            acumulador.frecuencia = FrecuenciaExacta.from_dict(datos["frecuencia"])
+        if datos["sketch"] is not None:
+            acumulador.sketch = TDigest.from_dict(datos["sketch"])
+            return acumulador
+        histograma = datos["histograma"]
+        if histograma is None:
+            histograma = datos["frecuencia"]["conteos"]
+        for valor, conteo in histograma:
+            acumulador.valores.extend(repeat(valor, conteo))
+        return acumulador
+
+    def varianza(self):
+        """Devuelve la varianza poblacional de los números acumulados."""
+        return self.m2 / self.cantidad
+
+    def mediana(self):
+        """
+        Devuelve la mediana de los números acumulados.
+        En modo exacto reordena el búfer interno en sitio.
+        """
+        if self.valores is None:
+            return self.sketch.cuantil(0.5)
+        return mediana_por_seleccion(self.valores)
+
+    def estadisticas(self, percentiles=(), top_k=0):
+        """
+        Devuelve un diccionario con media, mediana, moda, varianza y percentiles.
+        Con top_k > 0 incluye también los top_k valores más frecuentes como tuplas
+        (valor, conteo, error).
+        """
+        estadisticas = {
+            "media": self.media,
+            "mediana": self.mediana(),
+            "moda": self.moda(),
+            "varianza": self.varianza(),
+            "percentiles": self.percentiles(percentiles),
+        }
+        if top_k:
+            estadisticas["frecuentes"] = self.frecuencia.top(top_k)
+        return estadisticas
+
+    def percentiles(self, percentiles):
+        """
+        Devuelve un diccionario {percentil: valor} de los números acumulados.
+        En modo exacto reordena el búfer interno en sitio.
+        """
+        if self.valores is None:
+            return calcular_percentiles_aproximados(self.sketch, percentiles)
+        return percentiles_por_seleccion(self.valores, percentiles)
+
+    def moda(self):
+        """Devuelve la moda de los números acumulados."""
+        return self.frecuencia.moda()
+
+    def cerrar(self):
+        """Libera los archivos temporales de la moda con desborde, si los hay."""
+        if isinstance(self.frecuencia, FrecuenciaConDesborde):
+            self.frecuencia.cerrar()
+
+def cargar_numeros_numpy(ruta_archivo, advertencias):
+    """
+    Carga los números de un archivo en un arreglo float64 contiguo. Usa el mismo
+    lector por bloques y las mismas reglas que el backend de Python: cada bloque
+    bien formado se convierte de una vez con np.fromiter() y los bloques con
+    líneas inválidas (incluidas las vacías) pasan por convertir_lineas(), que las
+    agrega a advertencias.
+    """
+    bloques = []
+    lineas_leidas = 0
+    for lineas in iterar_lotes_de_lineas(ruta_archivo):
+        try:
+            bloque = np.fromiter(map(float, lineas), dtype=np.float64, count=len(lineas))
+        except ValueError:
+            bloque = np.array(
+                convertir_lineas(lineas, lineas_leidas, advertencias), dtype=np.float64
+            )
+        bloques.append(bloque)
+        lineas_leidas += len(lineas)
+    if not bloques:
+        return np.empty(0, dtype=np.float64)
+    return np.concatenate(bloques)
+
+def calcular_estadisticas_numpy(numeros, percentiles=()):
+    """
+    Calcula media, mediana, moda, varianza y percentiles de un arreglo float64.
+    La mediana usa np.partition y la moda np.unique con conteos; las modas empatadas
+    se devuelven en el orden de su primera aparición, igual que calcular_moda().
+    """
+    n = numeros.size
+    mitad = n // 2
+    if n % 2 == 0:
+        particion = np.partition(numeros, [mitad - 1, mitad])
+        mediana = (particion[mitad - 1] + particion[mitad]) / 2
+    else:
+        mediana = np.partition(numeros, mitad)[mitad]
+
+    valores, primeras, conteos = np.unique(numeros, return_index=True, return_counts=True)
+    maximas = conteos == conteos.max()
+    modas = valores[maximas][np.argsort(primeras[maximas])].tolist()
+
+    resultados_percentiles = {}
+    if percentiles:
+        valores_percentiles = np.percentile(numeros, percentiles).tolist()
+        resultados_percentiles = dict(zip(percentiles, valores_percentiles))
+
+    return {
+        "media": float(numeros.mean()),
+        "mediana": float(mediana),
+        "moda": modas if len(modas) > 1 else modas[0],
+        "varianza": float(numeros.var()),
+        "percentiles": resultados_percentiles,
+    }
+
+def formatear_resultados(estadisticas, tiempo_transcurrido):
+    """Devuelve el texto del reporte a partir del diccionario de estadísticas."""
+    return (
+        f"Media: {estadisticas['media']}\n"
+        f"Mediana: {estadisticas['mediana']}\n"
+        f"Moda: {estadisticas['moda']}\n"
+        f"Varianza: {estadisticas['varianza']}\n"
+        f"Desviación estándar: {calcular_desviacion_estandar(estadisticas['varianza'])}\n"
+        + "".join(
+            f"Percentil {percentil:g}: {valor}\n"
+            for percentil, valor in estadisticas['percentiles'].items()
+        )
+        + "".join(
+            f"Frecuente {posicion}: {valor} (conteo {conteo}, error ≤ {error})\n"
+            for posicion, (valor, conteo, error)
+            in enumerate(estadisticas.get('frecuentes', ()), start=1)
+        )
+        + f"Tiempo transcurrido: {tiempo_transcurrido:.5f} segundos"
+    )
+
+def leer_lista_percentiles(texto):
+    """Convierte un texto como '50,90,99' en una lista de percentiles válidos."""
+    try:
+        percentiles = [float(parte) for parte in texto.split(',') if parte.strip()]
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"Percentiles inválidos: '{texto}'") from error
+    if any(not 0 <= percentil <= 100 for percentil in percentiles):
+        raise argparse.ArgumentTypeError("Los percentiles deben estar entre 0 y 100.")
+    return percentiles
+
+def leer_entero_positivo(texto):
+    """Convierte un argumento de la línea de comandos en un entero mayor o igual que 1."""
+    try:
+        valor = int(texto)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"Número entero inválido: '{texto}'") from error
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"Debe ser un entero mayor o igual que 1: {valor}")
+    return valor
+
+def acumular_archivo(ruta_archivo, **opciones):
+    """
+    Lee un archivo en bloques y devuelve su acumulador junto con la lista de
+    líneas inválidas, sin imprimir nada. Las opciones se pasan al acumulador.
+    """
+    acumulador = AcumuladorEstadistico(**opciones)
+    advertencias = []
+    for bloque in iterar_bloques_de_numeros(ruta_archivo, advertencias):
+        acumulador.agregar_bloque(bloque)
+    return acumulador, advertencias
+
+SUFIJO_CACHE = '.estadisticas.json'
+VERSION_CACHE = 4
+TAMANO_LECTURA_HASH = 1 << 20
+
+def calcular_hash_contenido(ruta_archivo, fin):
+    """
+    Calcula el hash SHA-256 de todo el prefijo [0, fin) del archivo, leído por
+    bloques. Sirve para detectar si el contenido ya procesado cambió en cualquier
+    posición; hashear es mucho más barato que volver a analizar los números.
+    """
+    resumen = hashlib.sha256()
+    with open(ruta_archivo, 'rb') as archivo:
+        restante = fin
+        while restante > 0:
+            datos = archivo.read(min(TAMANO_LECTURA_HASH, restante))
+            if not datos:
+                break
+            resumen.update(datos)
+            restante -= len(datos)
+    return resumen.hexdigest()
+
+def fin_ultima_linea_completa(ruta_archivo, tamano):
+    """Devuelve la posición que sigue al último salto de línea del archivo (0 si no hay)."""
+    if tamano == 0:
+        return 0
+    with open(ruta_archivo, 'rb') as archivo:
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            return mapa.rfind(b'\n') + 1
+
+def cargar_cache(ruta_archivo, opciones, estado_archivo):
+    """
+    Carga la caché de un archivo si sigue siendo válida para su contenido actual.
+    Es válida si el archivo no cambió (mismo tamaño y fecha de modificación) o,
+    si cambió, cuando el hash de todo el prefijo ya procesado coincide; es decir,
+    solo se le agregaron datos al final.
+    Devuelve (acumulador, desplazamiento, líneas procesadas, advertencias) o None;
+    las advertencias son AdvertenciasAcotadas con la muestra y el total guardados.
+    """
+    try:
+        with open(ruta_archivo + SUFIJO_CACHE, 'r', encoding='utf-8') as archivo:
+            cache = json.load(archivo)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if (cache.get("version") != VERSION_CACHE
+            or cache.get("opciones") != opciones
+            or cache["desplazamiento"] > estado_archivo.st_size):
+        return None
+    sin_cambios = (cache["tamano"] == estado_archivo.st_size
+                   and cache["mtime_ns"] == estado_archivo.st_mtime_ns)
+    if not sin_cambios and (
+            calcular_hash_contenido(ruta_archivo, cache["desplazamiento"]) != cache["hash"]):
+        return None
+
+    acumulador = AcumuladorEstadistico.from_dict(cache["acumulador"])
+    advertencias = AdvertenciasAcotadas(cache["advertencias"], cache["total_advertencias"])
+    return acumulador, cache["desplazamiento"], cache["lineas"], advertencias
+
+def guardar_cache(ruta_archivo, opciones, acumulador, progreso):
+    """
+    Guarda el estado combinable del archivo (to_dict() del acumulador, sin los
+    valores) y el hash del prefijo procesado; progreso es la tupla (desplazamiento,
+    líneas, advertencias) de lo procesado. De las advertencias solo se guardan la
+    muestra acotada y el total. Si no se puede escribir, solo avisa.
+    """
+    desplazamiento, lineas, advertencias = progreso
+    estado_archivo = os.stat(ruta_archivo)
+    cache = {
+        "version": VERSION_CACHE,
+        "ruta": os.path.abspath(ruta_archivo),
+        "tamano": estado_archivo.st_size,
+        "mtime_ns": estado_archivo.st_mtime_ns,
+        "hash": calcular_hash_contenido(ruta_archivo, desplazamiento),
+        "desplazamiento": desplazamiento,
+        "lineas": lineas,
+        "opciones": opciones,
+        "acumulador": acumulador.to_dict(),
+        "advertencias": advertencias.muestra,
+        "total_advertencias": advertencias.total,
+    }
+    ruta_cache = ruta_archivo + SUFIJO_CACHE
+    try:
+        with open(ruta_cache + '.tmp', 'w', encoding='utf-8') as archivo:
+            json.dump(cache, archivo)
+        os.replace(ruta_cache + '.tmp', ruta_cache)
+    except OSError as error:
+        print(f"No se pudo guardar la caché de '{ruta_archivo}': {error}")
+
+def acumular_con_cache(ruta_archivo, **opciones):
+    """
+    Igual que acumular_archivo(), pero reutiliza la caché del archivo: solo analiza
+    las líneas completas agregadas desde la última ejecución y actualiza la caché.
+    Una última línea sin salto de línea se incluye en el resultado pero no en la
+    caché, porque todavía podría completarse. La caché solo se reutiliza si fue
+    creada con las mismas opciones; no admite la moda con desborde a disco.
+    Las advertencias se devuelven como AdvertenciasAcotadas: se detallan solo las
+    primeras, pero len() da el total de líneas inválidas.
+    """
+    if opciones.get("modo_moda") == 'desborde':
+        raise ValueError("La caché no admite la moda con desborde a disco.")
+    estado_archivo = os.stat(ruta_archivo)
+    cargado = cargar_cache(ruta_archivo, opciones, estado_archivo)
+    sin_cache = cargado is None
+    if sin_cache:
+        cargado = (AcumuladorEstadistico(**opciones), 0, 0, AdvertenciasAcotadas())
+    acumulador, desplazamiento, lineas_leidas, advertencias = cargado
+
+    fin_completo = fin_ultima_linea_completa(ruta_archivo, estado_archivo.st_size)
+    if fin_completo != desplazamiento or sin_cache:
+        for lineas in iterar_lotes_de_lineas(ruta_archivo, desplazamiento, fin_completo):
+            acumulador.agregar_bloque(convertir_lineas(lineas, lineas_leidas, advertencias))
+            lineas_leidas += len(lineas)
+        guardar_cache(ruta_archivo, opciones, acumulador,
+                      (fin_completo, lineas_leidas, advertencias))
+
+    if fin_completo < estado_archivo.st_size:
+        advertencias = advertencias.copia()
+        for lineas in iterar_lotes_de_lineas(ruta_archivo, fin_completo):
+            acumulador.agregar_bloque(convertir_lineas(lineas, lineas_leidas, advertencias))
+    return acumulador, advertencias
+
+def procesar_archivo_de_lote(ruta_archivo, percentiles, top_k=0, usar_cache=False,
+                             **opciones):
+    """
+    Tarea de un proceso del lote: calcula las estadísticas de un archivo.
+    Devuelve (acumulador, estadísticas o None, advertencias, tiempo transcurrido).
+    """
+    tiempo_inicio = time.time()
+    if usar_cache:
+        acumulador, advertencias = acumular_con_cache(ruta_archivo, **opciones)
+    else:
+        acumulador, advertencias = acumular_archivo(ruta_archivo, **opciones)
+    estadisticas = None
+    if acumulador.cantidad > 0:
+        estadisticas = acumulador.estadisticas(percentiles, top_k)
+    return acumulador, estadisticas, advertencias, time.time() - tiempo_inicio
+
+def procesar_lote(rutas, argumentos, instrumentacion):
+    """
+    Procesa varios archivos en un ProcessPoolExecutor y devuelve el reporte con un
+    bloque de resultados por archivo más un bloque agregado, que se obtiene
+    fusionando los acumuladores parciales de cada archivo.
+    """
+    opciones = opciones_de_acumulador(argumentos)
+    agregado = AcumuladorEstadistico(**opciones)
+    bloques = []
+    with (instrumentacion.fase("lote"),
+          ProcessPoolExecutor(max_workers=argumentos.procesos) as ejecutor):
+        tareas = [
+            ejecutor.submit(
+                procesar_archivo_de_lote, ruta, argumentos.percentiles,
+                argumentos.top, argumentos.cache, **opciones
+            )
+            for ruta in rutas
+        ]
+        for ruta, tarea in zip(rutas, tareas):
+            acumulador, estadisticas, advertencias, tiempo = tarea.result()
+            instrumentacion.contar(acumulador.cantidad, len(advertencias))
+            if advertencias:
+                print(f"Advertencias en {ruta}:")
+                reportar_advertencias(advertencias)
+            if estadisticas is None:
+                bloques.append(f"=== {ruta} ===\nNo hay números válidos para procesar.")
+                continue
+            bloques.append(f"=== {ruta} ===\n" + formatear_resultados(estadisticas, tiempo))
+            agregado.fusionar(acumulador)
+
+    encabezado = f"=== Agregado ({len(rutas)} archivos, {agregado.cantidad} números) ===\n"
+    if agregado.cantidad == 0:
+        bloques.append(encabezado + "No hay números válidos para procesar.")
+    else:
+        with instrumentacion.fase("estadisticas"):
+            estadisticas = agregado.estadisticas(argumentos.percentiles, argumentos.top)
+        bloques.append(
+            encabezado + formatear_resultados(estadisticas, instrumentacion.transcurrido())
+        )
+    agregado.cerrar()
+    return "\n\n".join(bloques)
+
+def acumular_rango(ruta_archivo, inicio, fin, **opciones):
+    """
+    Tarea de un proceso: analiza y reduce el rango de bytes [inicio, fin).
+    Devuelve (acumulador, advertencias con números de línea relativos al rango,
+    cantidad de líneas del rango).
+    """
+    acumulador = AcumuladorEstadistico(**opciones)
+    advertencias = []
+    lineas_leidas = 0
+    for lineas in iterar_lotes_de_lineas(ruta_archivo, inicio, fin):
+        acumulador.agregar_bloque(convertir_lineas(lineas, lineas_leidas, advertencias))
+        lineas_leidas += len(lineas)
+    return acumulador, advertencias, lineas_leidas
+
+def acumular_en_paralelo(ruta_archivo, procesos=None, **opciones):
+    """
+    Divide un archivo en rangos de bytes, reduce cada rango en un proceso distinto
+    y fusiona los acumuladores parciales en orden. Devuelve (acumulador,
+    advertencias) con los números de línea globales del archivo.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    rangos = dividir_en_rangos(ruta_archivo, procesos)
+    acumulador = AcumuladorEstadistico(**opciones)
+    advertencias = []
+    lineas_previas = 0
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        tareas = [
+            ejecutor.submit(acumular_rango, ruta_archivo, inicio, fin, **opciones)
+            for inicio, fin in rangos
+        ]
+        for tarea in tareas:
+            parcial, advertencias_rango, lineas = tarea.result()
+            acumulador.fusionar(parcial)
+            advertencias.extend(
+                (lineas_previas + numero_linea, linea)
+                for numero_linea, linea in advertencias_rango
+            )
+            lineas_previas += lineas
+    return acumulador, advertencias
+
+def opciones_de_acumulador(argumentos):
+    """Devuelve las opciones de AcumuladorEstadistico elegidas en la línea de comandos."""
+    return {
+        "mediana_aproximada": argumentos.mediana_aproximada,
+        "modo_moda": argumentos.moda,
+        "capacidad_moda": argumentos.capacidad_moda,
+        "umbral_desborde": argumentos.umbral_desborde,
+    }
+
+def procesar_un_archivo(ruta_archivo, argumentos, instrumentacion):
+    """
+    Calcula las estadísticas de un solo archivo con el backend elegido y registra
+    sus fases en la instrumentación.
+    Devuelve el reporte, o None si el archivo no contiene números válidos.
+    """
+    usar_numpy = argumentos.backend == "numpy" or (
+        argumentos.backend == "auto" and np is not None
+        and not (argumentos.mediana_aproximada or argumentos.paralelo or argumentos.cache
+                 or argumentos.moda != 'exacta' or argumentos.top)
+    )
+    if usar_numpy and np is None:
+        print("NumPy no está instalado; se usa el backend de Python.")
+        usar_numpy = False
+
+    if usar_numpy:
+        advertencias = []
+        with instrumentacion.fase("lectura"):
+            numeros = cargar_numeros_numpy(ruta_archivo, advertencias)
+        instrumentacion.contar(numeros.size, len(advertencias))
+        reportar_advertencias(advertencias)
+        if numeros.size == 0:
+            return None
+        with instrumentacion.fase("estadisticas"):
+            estadisticas = calcular_estadisticas_numpy(numeros, argumentos.percentiles)
+    else:
+        opciones = opciones_de_acumulador(argumentos)
+        with instrumentacion.fase("lectura_y_acumulacion"):
+            if argumentos.paralelo:
+                acumulador, advertencias = acumular_en_paralelo(
+                    ruta_archivo, argumentos.procesos, **opciones
+                )
+            elif argumentos.cache:
+                acumulador, advertencias = acumular_con_cache(ruta_archivo, **opciones)
+            else:
+                acumulador, advertencias = acumular_archivo(ruta_archivo, **opciones)
+        instrumentacion.contar(acumulador.cantidad, len(advertencias))
+        reportar_advertencias(advertencias)
+        if acumulador.cantidad == 0:
+            acumulador.cerrar()
+            return None
+        with instrumentacion.fase("estadisticas"):
+            estadisticas = acumulador.estadisticas(argumentos.percentiles, argumentos.top)
+        acumulador.cerrar()
+
+    return formatear_resultados(estadisticas, instrumentacion.transcurrido())
+
+def validar_argumentos(parser, argumentos):
+    """
+    Rechaza con parser.error() las combinaciones de opciones que no se pueden
+    cumplir: la caché con la moda con desborde y el backend NumPy con opciones que
+    solo implementa el backend de Python.
+    """
+    if argumentos.cache and argumentos.moda == "desborde":
+        parser.error("--cache no es compatible con --moda desborde")
+    if argumentos.backend == "numpy":
+        incompatibles = [
+            opcion for opcion, activa in (
+                ("--paralelo", argumentos.paralelo),
+                ("--cache", argumentos.cache),
+                ("--mediana-aproximada", argumentos.mediana_aproximada),
+                ("--moda " + argumentos.moda, argumentos.moda != "exacta"),
+                ("--top", argumentos.top),
+            ) if activa
+        ]
+        if incompatibles:
+            parser.error(
+                f"--backend numpy no es compatible con {', '.join(incompatibles)}; "
+                "use --backend python o auto"
+            )
+
 def main():
     """
     Función principal del programa.
     Lee números desde el archivo especificado, calcula estadísticas descriptivas,
-    mide el tiempo de ejecución y guarda los resultados.
+    mide el tiempo de ejecución y guarda los resultados. Con varios archivos o un
+    patrón glob, los procesa en lote y agrega los resultados.
     """
-    if len(sys.argv) != 2:
-        print("Uso: python compute_statistics.py archivoConDatos.txt")
-        return
-    
-    ruta_archivo = sys.argv[1]
-    tiempo_inicio = time.time()
+    parser = argparse.ArgumentParser(
+        prog="compute_statistics.py",
+        description="Calcula estadísticas descriptivas de un archivo de números."
+    )
+    parser.add_argument(
+        "archivos", nargs="+",
+        help="archivo con un número por línea; varios archivos o un patrón glob activan "
+             "el modo lote"
+    )
+    parser.add_argument(
+        "--mediana-aproximada", action="store_true",
+        help="estima la mediana y los percentiles con un t-digest en lugar de guardar los datos"
+    )
+    parser.add_argument(
+        "--percentiles", type=leer_lista_percentiles, default=[],
+        help="percentiles adicionales separados por comas, por ejemplo 50,90,99"
+    )
+    parser.add_argument(
+        "--backend", choices=("auto", "python", "numpy"), default="auto",
+        help="motor de cálculo de un solo archivo; 'auto' usa NumPy si está instalado"
+    )
+    parser.add_argument(
+        "--procesos", type=leer_entero_positivo, default=None,
+        help="número de procesos del modo lote o paralelo (por omisión, uno por núcleo)"
+    )
+    parser.add_argument(
+        "--paralelo", action="store_true",
+        help="divide un solo archivo en rangos de bytes y los reduce en paralelo"
+    )
+    parser.add_argument(
+        "--cache", action="store_true",
+        help="guarda el estado junto a cada archivo y solo procesa las líneas nuevas"
+    )
+    parser.add_argument(
+        "--moda", choices=("exacta", "aproximada", "desborde"), default="exacta",
+        help="tabla de frecuencias: exacta en memoria, Space-Saving de memoria acotada "
+             "o exacta con volcado a disco"
+    )
+    parser.add_argument(
+        "--capacidad-moda", type=int, default=1000,
+        help="contadores del resumen Space-Saving de --moda aproximada"
+    )
+    parser.add_argument(
+        "--umbral-desborde", type=int, default=1_000_000,
+        help="valores distintos en memoria antes de volcar a disco con --moda desborde"
+    )
+    parser.add_argument(
+        "--top", type=int, default=0, metavar="K",
+        help="muestra los K valores más frecuentes con su cota de error"
+    )
+    agregar_argumentos(parser)
+    argumentos = parser.parse_args()
+    validar_argumentos(parser, argumentos)
 
-    numeros = leer_numeros_desde_archivo(ruta_archivo)
-    if not numeros:
+    instrumentacion = Instrumentacion.desde_argumentos("compute_statistics", argumentos)
+    rutas = expandir_rutas(argumentos.archivos)
+    if not rutas:
+        print("Ningún archivo coincide con los patrones indicados.")
+        instrumentacion.terminar()
+        return
+    if len(rutas) == 1 and not glob.has_magic(argumentos.archivos[0]):
+        resultados = procesar_un_archivo(rutas[0], argumentos, instrumentacion)
+    else:
+        if argumentos.backend == "numpy":
+            print("El modo lote usa el backend de Python; se ignora --backend numpy.")
+        resultados = procesar_lote(rutas, argumentos, instrumentacion)
+    if resultados is None:
         print("No hay números válidos para procesar.")
+        instrumentacion.terminar()
         return
 
-    media = calcular_media(numeros)
-    mediana = calcular_mediana(numeros)
-    moda = calcular_moda(numeros)
-    varianza = calcular_varianza(numeros, media)
-    desviacion_estandar = calcular_desviacion_estandar(varianza)
-
-    tiempo_transcurrido = time.time() - tiempo_inicio
-
-    resultados = (
-        f"Media: {media}\n"
-        f"Mediana: {mediana}\n"
-        f"Moda: {moda}\n"
-        f"Varianza: {varianza}\n"
-        f"Desviación estándar: {desviacion_estandar}\n"
-        f"Tiempo transcurrido: {tiempo_transcurrido:.5f} segundos"
-    )
-
-    print(resultados)
+    with instrumentacion.fase("salida"):
+        print(resultados)
 
-    with open("ResultadosEstadisticas.txt", "w", encoding="utf-8") as archivo_resultados:
-        archivo_resultados.write(resultados)
+        with open("ResultadosEstadisticas.txt", "w", encoding="utf-8") as archivo_resultados:
+            archivo_resultados.write(resultados)
+    instrumentacion.terminar()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,343 @@
+"""
+Módulo: cuantiles.py
+Descripción: Algoritmos de selección y estimación de cuantiles usados por
+compute_statistics.py. Incluye una selección en tiempo lineal (introselect) que
+trabaja en sitio sobre un búfer array('d'), una selección múltiple que responde
+varios percentiles con una sola ordenación parcial, un estimador P² de memoria
+acotada para obtener una mediana aproximada sin guardar los datos y un t-digest
+combinable para estimar percentiles por partes y fusionar los resultados.
+"""
+
+import math
+from bisect import insort
+from itertools import islice
+
+
+def _particionar(buffer, izquierda, derecha):
+    """
+    Particiona buffer[izquierda:derecha + 1] en sitio en tres tramos (menores, iguales
+    y mayores que la mediana de tres). Devuelve los límites (menor, mayor) del tramo
+    de elementos iguales al pivote, lo que evita degradarse con datos repetidos.
+    """
+    centro = (izquierda + derecha) // 2
+    primero, medio, ultimo = buffer[izquierda], buffer[centro], buffer[derecha]
+    if primero > medio:
+        primero, medio = medio, primero
+    pivote = max(primero, min(medio, ultimo))
+    menor, i, mayor = izquierda, izquierda, derecha
+    while i <= mayor:
+        valor = buffer[i]
+        if valor < pivote:
+            buffer[i], buffer[menor] = buffer[menor], valor
+            menor += 1
+            i += 1
+        elif valor > pivote:
+            buffer[i], buffer[mayor] = buffer[mayor], valor
+            mayor -= 1
+        else:
+            i += 1
+    return menor, mayor
+
+
+def seleccionar(buffer, k, izquierda=0, derecha=None):
+    """
+    Reordena buffer en sitio y devuelve el k-ésimo menor elemento (k empieza en 0).
+    Al terminar, todo elemento a la izquierda de k es menor o igual que buffer[k]
+    y todo elemento a su derecha es mayor o igual. Si la partición se degrada, el
+    tramo restante se ordena para garantizar O(n log n) en el peor caso.
+    """
+    if derecha is None:
+        derecha = len(buffer) - 1
+    profundidad_maxima = 2 * max(derecha - izquierda + 1, 1).bit_length()
+    while izquierda < derecha:
+        if profundidad_maxima == 0:
+            buffer[izquierda:derecha + 1] = type(buffer)(
+                buffer.typecode, sorted(buffer[izquierda:derecha + 1])
+            )
+            break
+        profundidad_maxima -= 1
+        menor, mayor = _particionar(buffer, izquierda, derecha)
+        if k < menor:
+            derecha = menor - 1
+        elif k > mayor:
+            izquierda = mayor + 1
+        else:
+            break
+    return buffer[k]
+
+
+def mediana_por_seleccion(buffer):
+    """
+    Calcula la mediana de un búfer array('d') en tiempo lineal, reordenándolo en sitio.
+    """
+    n = len(buffer)
+    mitad = n // 2
+    superior = seleccionar(buffer, mitad)
+    if n % 2 == 0:
+        inferior = max(islice(buffer, mitad))
+        return (inferior + superior) / 2
+    return superior
+
+
+def _seleccionar_varios(buffer, rangos, izquierda, derecha):
+    """
+    Coloca en su posición ordenada cada índice de la lista ordenada rangos,
+    particionando solo los tramos de buffer[izquierda:derecha + 1] que los contienen.
+    """
+    pendientes = [(rangos, izquierda, derecha)]
+    while pendientes:
+        rangos, izquierda, derecha = pendientes.pop()
+        if not rangos or izquierda >= derecha:
+            continue
+        if len(rangos) == 1:
+            seleccionar(buffer, rangos[0], izquierda, derecha)
+            continue
+        menor, mayor = _particionar(buffer, izquierda, derecha)
+        pendientes.append(([k for k in rangos if k < menor], izquierda, menor - 1))
+        pendientes.append(([k for k in rangos if k > mayor], mayor + 1, derecha))
+
+
+def percentiles_por_seleccion(buffer, percentiles):
+    """
+    Calcula varios percentiles (0 a 100) de un búfer array('d') reordenándolo en sitio.
+    Usa interpolación lineal entre los rangos vecinos, de modo que el percentil 50
+    coincide con la mediana. Devuelve un diccionario {percentil: valor}.
+    """
+    n = len(buffer)
+    posiciones = {p: p / 100 * (n - 1) for p in percentiles}
+    rangos = set()
+    for posicion in posiciones.values():
+        rangos.add(int(posicion))
+        rangos.add(min(int(posicion) + 1, n - 1))
+    _seleccionar_varios(buffer, sorted(rangos), 0, n - 1)
+    resultado = {}
+    for percentil, posicion in posiciones.items():
+        inferior = int(posicion)
+        superior = min(inferior + 1, n - 1)
+        fraccion = posicion - inferior
+        if fraccion == 0:
+            resultado[percentil] = buffer[inferior]
+        else:
+            resultado[percentil] = (
+                buffer[inferior] * (1 - fraccion) + buffer[superior] * fraccion
+            )
+    return resultado
+
+
+class EstimadorP2:
+    """
+    Estimador P² (Jain y Chlamtac) de un cuantil con memoria constante.
+    Mantiene cinco marcadores cuyas alturas se ajustan con interpolación parabólica
+    a medida que llegan los datos; no guarda los valores observados.
+    Dos estimadores no se pueden fusionar, por eso compute_statistics.py usa el
+    t-digest cuando el flujo se procesa por partes.
+    """
+
+    def __init__(self, cuantil=0.5):
+        self.cuantil = cuantil
+        self.cantidad = 0
+        self.alturas = []
+        self.posiciones = [1, 2, 3, 4, 5]
+        self.deseadas = [1, 1 + 2 * cuantil, 1 + 4 * cuantil, 3 + 2 * cuantil, 5]
+        self.incrementos = [0, cuantil / 2, cuantil, (1 + cuantil) / 2, 1]
+
+    def agregar(self, numero):
+        """Incorpora un número a la estimación."""
+        self.cantidad += 1
+        alturas = self.alturas
+        if self.cantidad <= 5:
+            insort(alturas, numero)
+            return
+
+        if numero < alturas[0]:
+            alturas[0] = numero
+            celda = 0
+        elif numero >= alturas[4]:
+            alturas[4] = numero
+            celda = 3
+        else:
+            celda = 0
+            while numero >= alturas[celda + 1]:
+                celda += 1
+
+        posiciones = self.posiciones
+        for i in range(celda + 1, 5):
+            posiciones[i] += 1
+        for i in range(5):
+            self.deseadas[i] += self.incrementos[i]
+
+        for i in range(1, 4):
+            diferencia = self.deseadas[i] - posiciones[i]
+            if ((diferencia >= 1 and posiciones[i + 1] - posiciones[i] > 1)
+                    or (diferencia <= -1 and posiciones[i - 1] - posiciones[i] < -1)):
+                paso = 1 if diferencia > 0 else -1
+                candidata = self._parabolica(i, paso)
+                if alturas[i - 1] < candidata < alturas[i + 1]:
+                    alturas[i] = candidata
+                else:
+                    alturas[i] = self._lineal(i, paso)
+                posiciones[i] += paso
+
+    def _parabolica(self, i, paso):
+        """Predicción parabólica de la nueva altura del marcador i."""
+        q = self.alturas
+        n = self.posiciones
+        return q[i] + paso / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + paso) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - paso) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _lineal(self, i, paso):
+        """Predicción lineal de la nueva altura del marcador i."""
+        q = self.alturas
+        n = self.posiciones
+        return q[i] + paso * (q[i + paso] - q[i]) / (n[i + paso] - n[i])
+
+    def valor(self):
+        """
+        Devuelve la estimación actual del cuantil, o None si no hay datos.
+        Con cinco datos o menos el resultado es exacto.
+        """
+        if self.cantidad == 0:
+            return None
+        if self.cantidad > 5:
+            return self.alturas[2]
+        rango = self.cuantil * (self.cantidad - 1)
+        inferior = int(rango)
+        if inferior + 1 >= self.cantidad:
+            return self.alturas[inferior]
+        fraccion = rango - inferior
+        return (self.alturas[inferior]
+                + (self.alturas[inferior + 1] - self.alturas[inferior]) * fraccion)
+
+
+class TDigest:
+    """
+    Sketch t-digest (variante de fusión) para estimar cuantiles con memoria acotada.
+    Resume los datos en centroides (media, peso) cuyo tamaño máximo depende de la
+    compresión y de la función de escala k1, más fina en los extremos. Dos t-digest
+    se pueden fusionar, por lo que es posible resumir archivos o bloques por
+    separado y combinar los sketches sin volver a leer los números.
+    """
+
+    def __init__(self, compresion=100):
+        self.compresion = compresion
+        self.centroides = []
+        self.pendientes = []
+        self.cantidad = 0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def agregar(self, numero, peso=1):
+        """Incorpora un número (o un centroide con su peso) al sketch."""
+        self.pendientes.append((numero, peso))
+        self.cantidad += peso
+        self.minimo = min(self.minimo, numero)
+        self.maximo = max(self.maximo, numero)
+        if len(self.pendientes) >= 5 * self.compresion:
+            self.comprimir()
+
+    def fusionar(self, otro):
+        """Incorpora a este sketch los centroides de otro t-digest y lo devuelve."""
+        otro.comprimir()
+        for media, peso in otro.centroides:
+            self.pendientes.append((media, peso))
+        self.cantidad += otro.cantidad
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        self.comprimir()
+        return self
+
+    def _escala(self, cuantil):
+        """Función de escala k1 del t-digest."""
+        return self.compresion / (2 * math.pi) * math.asin(2 * cuantil - 1)
+
+    def _escala_inversa(self, valor):
+        """Inversa de la función de escala k1."""
+        if valor >= self.compresion / 4:
+            return 1.0
+        return (math.sin(valor * 2 * math.pi / self.compresion) + 1) / 2
+
+    def comprimir(self):
+        """Fusiona los puntos pendientes con los centroides existentes."""
+        if not self.pendientes:
+            return
+        puntos = sorted(self.centroides + self.pendientes)
+        self.pendientes = []
+        total = self.cantidad
+        nuevos = []
+        media_actual, peso_actual = puntos[0]
+        peso_previo = 0
+        limite = self._escala_inversa(self._escala(0.0) + 1)
+        for media, peso in islice(puntos, 1, None):
+            if (peso_previo + peso_actual + peso) / total <= limite:
+                peso_actual += peso
+                media_actual += (media - media_actual) * peso / peso_actual
+            else:
+                nuevos.append((media_actual, peso_actual))
+                peso_previo += peso_actual
+                limite = self._escala_inversa(self._escala(peso_previo / total) + 1)
+                media_actual, peso_actual = media, peso
+        nuevos.append((media_actual, peso_actual))
+        self.centroides = nuevos
+
+    def cuantil(self, cuantil):
+        """
+        Estima el cuantil indicado (entre 0 y 1) interpolando entre centroides.
+        Devuelve None si el sketch está vacío.
+        """
+        self.comprimir()
+        if not self.centroides:
+            return None
+        if not 0 < cuantil < 1:
+            return self.minimo if cuantil <= 0 else self.maximo
+        if len(self.centroides) == 1:
+            return self.centroides[0][0]
+        return self._interpolar(cuantil * self.cantidad)
+
+    def _interpolar(self, indice):
+        """
+        Estima el valor de rango `indice` (entre 0 y la cantidad) interpolando
+        entre los centroides ya comprimidos, o con el mínimo y el máximo en las colas.
+        """
+        centroides = self.centroides
+        media, peso = centroides[0]
+        if indice < peso / 2:
+            return self.minimo + (media - self.minimo) * indice / (peso / 2)
+
+        acumulado = peso / 2
+        for (media_izq, peso_izq), (media_der, peso_der) in zip(
+                centroides, islice(centroides, 1, None)):
+            tramo = (peso_izq + peso_der) / 2
+            if acumulado + tramo > indice:
+                return media_izq + (media_der - media_izq) * (indice - acumulado) / tramo
+            acumulado += tramo
+
+        media, peso = centroides[-1]
+        restante = self.cantidad - indice
+        if restante <= 0:
+            return self.maximo
+        if peso <= 1:
+            return media
+        return self.maximo - (self.maximo - media) * restante / (peso / 2)
+
+    def to_dict(self):
+        """Devuelve una representación serializable (JSON) del sketch."""
+        self.comprimir()
+        return {
+            "compresion": self.compresion,
+            "cantidad": self.cantidad,
+            "minimo": self.minimo,
+            "maximo": self.maximo,
+            "centroides": [list(centroide) for centroide in self.centroides],
+        }
+
+    @classmethod
+    def from_dict(cls, datos):
+        """Reconstruye un t-digest a partir de su representación serializada."""
+        sketch = cls(datos["compresion"])
+        sketch.cantidad = datos["cantidad"]
+        sketch.minimo = datos["minimo"]
+        sketch.maximo = datos["maximo"]
+        sketch.centroides = [tuple(centroide) for centroide in datos["centroides"]]
+        return sketch
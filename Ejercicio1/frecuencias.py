@@ -0,0 +1,199 @@
+"""
+Módulo: frecuencias.py
+Descripción: Tablas de frecuencias usadas por compute_statistics.py para calcular
+la moda. Todas comparten la misma interfaz (agregar, agregar_bloque, fusionar,
+moda y top): una tabla exacta en memoria, un resumen Space-Saving de memoria
+acotada que devuelve los valores más frecuentes con su cota de error, y una tabla
+exacta que vuelca corridas ordenadas a disco cuando hay demasiados valores
+distintos. El resumen Space-Saving se define en comun/space_saving.py, porque
+también lo usa word_count.py, y se reexporta aquí.
+"""
+
+import heapq
+import os
+import struct
+import tempfile
+from collections import Counter
+from itertools import groupby
+
+from comun.space_saving import SpaceSaving  # pylint: disable=unused-import
+
+
+def moda_desde_frecuencias(frecuencia):
+    """
+    Devuelve la moda a partir de una tabla {número: frecuencia}.
+    Devuelve una lista si hay múltiples modas.
+    """
+    max_frecuencia = max(frecuencia.values())
+    modas = [clave for clave, valor in frecuencia.items() if valor == max_frecuencia]
+    return modas if len(modas) > 1 else modas[0]
+
+
+class FrecuenciaExacta:
+    """
+    Tabla de frecuencias exacta en memoria, en orden de primera aparición.
+    Los conteos se guardan en un Counter.
+    """
+
+    def __init__(self, conteos=None):
+        self.conteos = Counter(conteos)
+
+    def agregar(self, numero):
+        """Cuenta una aparición de un número."""
+        self.conteos[numero] += 1
+
+    def agregar_bloque(self, numeros):
+        """Cuenta todas las apariciones de una lista de números."""
+        self.conteos.update(numeros)
+
+    def fusionar(self, otra):
+        """Suma a esta tabla los conteos de otra."""
+        self.conteos.update(otra.conteos)
+        return self
+
+    def moda(self):
+        """Devuelve la moda; una lista si hay múltiples modas."""
+        return moda_desde_frecuencias(self.conteos)
+
+    def top(self, k):
+        """Devuelve los k valores más frecuentes como tuplas (valor, conteo, error=0)."""
+        return [(valor, conteo, 0) for valor, conteo in self.conteos.most_common(k)]
+
+    def to_dict(self):
+        """Devuelve una representación serializable (JSON) de la tabla."""
+        return {
+            "modo": "exacta",
+            "conteos": [[valor, conteo] for valor, conteo in self.conteos.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, datos):
+        """Reconstruye la tabla a partir de to_dict()."""
+        return cls(dict(datos["conteos"]))
+
+
+REGISTRO_CORRIDA = struct.Struct('<dqq')
+REGISTROS_POR_LECTURA = 4096
+
+
+class FrecuenciaConDesborde:
+    """
+    Tabla de frecuencias exacta con memoria acotada.
+    Cuenta en un diccionario hasta `umbral` valores distintos; al superarlo, vuelca
+    el diccionario a un archivo temporal como una corrida ordenada de registros
+    (valor, conteo, orden de primera aparición) y empieza uno nuevo. La moda se
+    obtiene con una mezcla de k vías de todas las corridas, sumando los conteos de
+    cada valor y conservando el orden de primera aparición para los empates.
+    Llamar a cerrar() elimina los archivos temporales.
+    """
+
+    def __init__(self, umbral=1_000_000, directorio=None):
+        self.umbral = umbral
+        self.directorio = directorio
+        self.conteos = {}
+        self.orden_base = 0
+        self.corridas = []
+
+    def agregar(self, numero):
+        """Cuenta una aparición de un número."""
+        entrada = self.conteos.get(numero)
+        if entrada is None:
+            self.conteos[numero] = [1, self.orden_base + len(self.conteos)]
+            if len(self.conteos) > self.umbral:
+                self.volcar()
+        else:
+            entrada[0] += 1
+
+    def agregar_bloque(self, numeros):
+        """Cuenta una lista de números, volcando a disco si se supera el umbral."""
+        for numero, conteo in Counter(numeros).items():
+            entrada = self.conteos.get(numero)
+            if entrada is None:
+                self.conteos[numero] = [conteo, self.orden_base + len(self.conteos)]
+            else:
+                entrada[0] += conteo
+        if len(self.conteos) > self.umbral:
+            self.volcar()
+
+    def volcar(self):
+        """Escribe el diccionario actual como una corrida ordenada en disco."""
+        if not self.conteos:
+            return
+        descriptor, ruta = tempfile.mkstemp(
+            prefix='moda_', suffix='.corrida', dir=self.directorio)
+        with os.fdopen(descriptor, 'wb') as archivo:
+            for numero in sorted(self.conteos):
+                conteo, orden = self.conteos[numero]
+                archivo.write(REGISTRO_CORRIDA.pack(numero, conteo, orden))
+        self.corridas.append((ruta, 0))
+        self.orden_base += len(self.conteos)
+        self.conteos = {}
+
+    def fusionar(self, otra):
+        """
+        Incorpora las corridas de otra tabla como si sus datos siguieran a los de
+        esta. Las corridas de la otra tabla pasan a ser responsabilidad de esta.
+        """
+        self.volcar()
+        otra.volcar()
+        self.corridas.extend(
+            (ruta, desplazamiento + self.orden_base) for ruta, desplazamiento in otra.corridas
+        )
+        self.orden_base += otra.orden_base
+        otra.corridas = []
+        return self
+
+    @staticmethod
+    def _leer_corrida(ruta, desplazamiento):
+        """Genera los registros (valor, conteo, orden) de una corrida en disco."""
+        with open(ruta, 'rb') as archivo:
+            while True:
+                datos = archivo.read(REGISTRO_CORRIDA.size * REGISTROS_POR_LECTURA)
+                if not datos:
+                    break
+                for numero, conteo, orden in REGISTRO_CORRIDA.iter_unpack(datos):
+                    yield numero, conteo, orden + desplazamiento
+
+    def _iterar_totales(self):
+        """Genera (valor, conteo total, primera aparición) en orden de valor."""
+        en_memoria = [(numero, conteo, orden)
+                      for numero, (conteo, orden) in sorted(self.conteos.items())]
+        fuentes = [self._leer_corrida(ruta, desplazamiento)
+                   for ruta, desplazamiento in self.corridas]
+        fuentes.append(iter(en_memoria))
+        mezcla = heapq.merge(*fuentes, key=lambda registro: registro[0])
+        for numero, registros in groupby(mezcla, key=lambda registro: registro[0]):
+            conteo_total = 0
+            primera = None
+            for _, conteo, orden in registros:
+                conteo_total += conteo
+                primera = orden if primera is None else min(primera, orden)
+            yield numero, conteo_total, primera
+
+    def moda(self):
+        """Devuelve la moda exacta; una lista si hay múltiples modas."""
+        maximo = 0
+        modas = []
+        for numero, conteo, orden in self._iterar_totales():
+            if conteo > maximo:
+                maximo = conteo
+                modas = [(orden, numero)]
+            elif conteo == maximo:
+                modas.append((orden, numero))
+        modas = [numero for _, numero in sorted(modas)]
+        return modas if len(modas) > 1 else modas[0]
+
+    def top(self, k):
+        """Devuelve los k valores más frecuentes como tuplas (valor, conteo, error=0)."""
+        mayores = heapq.nlargest(
+            k, self._iterar_totales(), key=lambda registro: (registro[1], -registro[2]))
+        return [(numero, conteo, 0) for numero, conteo, _ in mayores]
+
+    def cerrar(self):
+        """Elimina los archivos temporales de las corridas."""
+        for ruta, _ in self.corridas:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+        self.corridas = []
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas unitarias para la caché incremental de compute_statistics.py.
+Se verifica que la caché se reutiliza al agregar líneas y que se descarta
+cuando cambia el contenido ya procesado.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from comun.lector_numerico import MAXIMO_ADVERTENCIAS
+from compute_statistics import SUFIJO_CACHE, acumular_archivo, acumular_con_cache
+
+LINEAS = 60000
+
+
+class TestCacheIncremental(unittest.TestCase):
+    """Pruebas unitarias para verificar la validez de la caché incremental."""
+
+    def setUp(self):
+        """Crea un archivo de números mayor que los bloques de lectura."""
+        self.temp_dir_obj = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.ruta = os.path.join(self.temp_dir_obj.name, "numeros.txt")
+        with open(self.ruta, "w", encoding="utf-8") as archivo:
+            archivo.write("100\n" * LINEAS)
+        acumulador, _ = acumular_con_cache(self.ruta)
+        self.assertEqual(acumulador.cantidad, LINEAS)
+        self.assertTrue(os.path.exists(self.ruta + SUFIJO_CACHE))
+
+    def tearDown(self):
+        """Limpia el entorno de prueba eliminando el directorio temporal."""
+        self.temp_dir_obj.cleanup()
+
+    def test_agregar_lineas(self):
+        """
+        Verifica que las líneas agregadas al final se suman a las ya procesadas.
+        """
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write("400\n")
+        acumulador, advertencias = acumular_con_cache(self.ruta)
+        self.assertEqual(acumulador.cantidad, LINEAS + 1)
+        self.assertAlmostEqual(acumulador.media, (100 * LINEAS + 400) / (LINEAS + 1))
+        self.assertEqual(len(advertencias), 0)
+        self.assertEqual(list(advertencias), [])
+
+    def test_editar_mitad_del_archivo(self):
+        """
+        Verifica que una edición del mismo tamaño en la mitad del archivo,
+        lejos del inicio y del final, invalida la caché.
+        """
+        estado = os.stat(self.ruta)
+        with open(self.ruta, "r+b") as archivo:
+            archivo.seek(4 * (LINEAS // 2))
+            archivo.write(b"700\n")
+        os.utime(self.ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1))
+        self.assertEqual(os.path.getsize(self.ruta), estado.st_size)
+        acumulador, _ = acumular_con_cache(self.ruta)
+        self.assertEqual(acumulador.cantidad, LINEAS)
+        self.assertAlmostEqual(acumulador.media, (100 * (LINEAS - 1) + 700) / LINEAS)
+        self.assertEqual(acumulador.moda(), 100)
+
+    def test_cache_sin_valores(self):
+        """
+        Verifica que la caché guarda el histograma y no los valores, y que la
+        mediana y los percentiles exactos siguen coincidiendo tras agregar líneas.
+        """
+        with open(self.ruta, "w", encoding="utf-8") as archivo:
+            archivo.writelines(f"{numero % 97}\n" for numero in range(LINEAS))
+        opciones = {"modo_moda": "aproximada"}
+        acumular_con_cache(self.ruta, **opciones)
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write("500\n1000\n")
+        acumulador, _ = acumular_con_cache(self.ruta, **opciones)
+        esperado, _ = acumular_archivo(self.ruta, **opciones)
+
+        percentiles = (1, 25, 50, 75, 99, 100)
+        self.assertEqual(acumulador.mediana(), esperado.mediana())
+        self.assertEqual(acumulador.percentiles(percentiles), esperado.percentiles(percentiles))
+        self.assertEqual(os.listdir(self.temp_dir_obj.name),
+                         ["numeros.txt", "numeros.txt" + SUFIJO_CACHE])
+        with open(self.ruta + SUFIJO_CACHE, encoding="utf-8") as archivo:
+            self.assertEqual(len(json.load(archivo)["acumulador"]["histograma"]), 99)
+
+    def test_advertencias_acotadas(self):
+        """
+        Verifica que la caché guarda solo una muestra de las líneas inválidas
+        pero conserva su total al reutilizarse.
+        """
+        invalidas = 3 * MAXIMO_ADVERTENCIAS
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write("x\n" * invalidas)
+        acumular_con_cache(self.ruta)
+        with open(self.ruta + SUFIJO_CACHE, encoding="utf-8") as archivo:
+            cache = json.load(archivo)
+        self.assertEqual(len(cache["advertencias"]), MAXIMO_ADVERTENCIAS)
+        self.assertEqual(cache["total_advertencias"], invalidas)
+
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write("y\n")
+        acumulador, advertencias = acumular_con_cache(self.ruta)
+        self.assertEqual(acumulador.cantidad, LINEAS)
+        self.assertEqual(len(advertencias), invalidas + 1)
+        self.assertEqual(advertencias[0], (LINEAS + 1, "x"))
+
+
+if __name__ == '__main__':
+    unittest.main()
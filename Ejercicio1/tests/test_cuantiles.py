@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas unitarias para los algoritmos de cuantiles de cuantiles.py.
+Se comparan la selección, el estimador P² y el t-digest con los percentiles de
+una lista ordenada.
+"""
+
+import random
+import unittest
+from array import array
+from cuantiles import EstimadorP2, TDigest, mediana_por_seleccion, percentiles_por_seleccion
+
+PERCENTILES = (0, 1, 10, 25, 50, 75, 90, 99, 100)
+
+
+def percentil_ordenado(ordenados, percentil):
+    """Percentil con interpolación lineal calculado sobre una lista ordenada."""
+    posicion = percentil / 100 * (len(ordenados) - 1)
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    fraccion = posicion - inferior
+    return ordenados[inferior] * (1 - fraccion) + ordenados[superior] * fraccion
+
+
+class TestSeleccion(unittest.TestCase):
+    """Pruebas unitarias para verificar la selección en tiempo lineal."""
+
+    def test_percentiles_por_seleccion(self):
+        """
+        Verifica que los percentiles coinciden con los de la lista ordenada,
+        con datos repetidos y tamaños pares e impares.
+        """
+        aleatorio = random.Random(1)
+        for cantidad in (1, 2, 3, 10, 101, 1000):
+            for valores_distintos in (3, 1000):
+                numeros = [float(aleatorio.randrange(valores_distintos))
+                           for _ in range(cantidad)]
+                ordenados = sorted(numeros)
+                resultado = percentiles_por_seleccion(array('d', numeros), PERCENTILES)
+                for percentil in PERCENTILES:
+                    self.assertAlmostEqual(
+                        resultado[percentil], percentil_ordenado(ordenados, percentil)
+                    )
+
+    def test_mediana_por_seleccion(self):
+        """
+        Verifica la mediana de listas de tamaño par e impar.
+        """
+        self.assertEqual(mediana_por_seleccion(array('d', [5, 1, 3])), 3)
+        self.assertEqual(mediana_por_seleccion(array('d', [4, 1, 3, 2])), 2.5)
+
+
+class TestEstimadorP2(unittest.TestCase):
+    """Pruebas unitarias para verificar el estimador P² de un cuantil."""
+
+    def test_pocos_datos_exacto(self):
+        """
+        Verifica que sin datos no hay estimación y que con cinco datos o menos
+        el resultado coincide con el percentil de la lista ordenada.
+        """
+        estimador = EstimadorP2(0.5)
+        self.assertIsNone(estimador.valor())
+        numeros = [7.0, 1.0, 4.0, 2.0]
+        for numero in numeros:
+            estimador.agregar(numero)
+        self.assertEqual(estimador.valor(), percentil_ordenado(sorted(numeros), 50))
+
+    def test_estimacion_de_cuantiles(self):
+        """
+        Verifica que el rango de la estimación queda cerca del cuantil pedido.
+        """
+        aleatorio = random.Random(8)
+        numeros = [aleatorio.gauss(0, 1) for _ in range(20000)]
+        for cuantil in (0.1, 0.5, 0.9):
+            estimador = EstimadorP2(cuantil)
+            for numero in numeros:
+                estimador.agregar(numero)
+            rango = sum(numero <= estimador.valor() for numero in numeros) / len(numeros)
+            self.assertLess(abs(rango - cuantil), 0.01)
+
+
+class TestTDigest(unittest.TestCase):
+    """Pruebas unitarias para verificar la precisión del t-digest."""
+
+    def test_fusion_de_sketches(self):
+        """
+        Verifica que fusionar los sketches de cuatro partes da cuantiles con un
+        error de rango menor al 1 % y conserva la cantidad, el mínimo y el máximo.
+        """
+        aleatorio = random.Random(2)
+        numeros = [aleatorio.gauss(0, 1) for _ in range(20000)]
+        partes = [TDigest() for _ in range(4)]
+        for posicion, numero in enumerate(numeros):
+            partes[posicion % 4].agregar(numero)
+        fusionado = TDigest()
+        for parte in partes:
+            fusionado.fusionar(parte)
+
+        ordenados = sorted(numeros)
+        self.assertEqual(fusionado.cantidad, len(numeros))
+        self.assertEqual(fusionado.cuantil(0), ordenados[0])
+        self.assertEqual(fusionado.cuantil(1), ordenados[-1])
+        for cuantil in (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99):
+            estimado = fusionado.cuantil(cuantil)
+            rango = sum(numero <= estimado for numero in numeros) / len(numeros)
+            self.assertLess(abs(rango - cuantil), 0.01)
+
+    def test_sketch_vacio(self):
+        """
+        Verifica que un sketch vacío no estima ningún cuantil.
+        """
+        self.assertIsNone(TDigest().cuantil(0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
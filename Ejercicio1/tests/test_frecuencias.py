@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas unitarias para las tablas de frecuencias de frecuencias.py.
+Se comparan la tabla con desborde a disco y el resumen Space-Saving con un Counter.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+from frecuencias import FrecuenciaConDesborde, FrecuenciaExacta, SpaceSaving
+
+
+def datos_sesgados(cantidad, semilla):
+    """Genera números con una distribución sesgada hacia los valores pequeños."""
+    aleatorio = random.Random(semilla)
+    return [float(int(aleatorio.paretovariate(1.2))) for _ in range(cantidad)]
+
+
+class TestFrecuenciaConDesborde(unittest.TestCase):
+    """Pruebas unitarias para verificar el volcado a disco y la mezcla de k vías."""
+
+    def setUp(self):
+        """Configura el entorno de prueba utilizando un directorio temporal."""
+        self.temp_dir_obj = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.temp_dir = self.temp_dir_obj.name
+
+    def tearDown(self):
+        """Limpia el entorno de prueba eliminando el directorio temporal."""
+        self.temp_dir_obj.cleanup()
+
+    def test_volcado_igual_a_counter(self):
+        """
+        Verifica que con un umbral pequeño se vuelcan varias corridas y que la
+        moda y los más frecuentes coinciden con los de un Counter, incluido el
+        orden de primera aparición en los empates.
+        """
+        numeros = [float(numero % 37) for numero in range(5000)] + [36.0, 5.0, 36.0, 5.0]
+        referencia = FrecuenciaExacta()
+        tabla = FrecuenciaConDesborde(umbral=8, directorio=self.temp_dir)
+        for inicio in range(0, len(numeros), 100):
+            tabla.agregar_bloque(numeros[inicio:inicio + 100])
+            referencia.agregar_bloque(numeros[inicio:inicio + 100])
+        self.assertGreater(len(tabla.corridas), 1)
+
+        self.assertEqual(tabla.moda(), referencia.moda())
+        self.assertEqual(tabla.top(10), referencia.top(10))
+        tabla.cerrar()
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_fusion_con_desborde(self):
+        """
+        Verifica que fusionar tablas con corridas en disco da los mismos conteos
+        que un Counter de todos los datos.
+        """
+        partes = [datos_sesgados(3000, semilla) for semilla in range(3)]
+        tablas = []
+        for parte in partes:
+            tabla = FrecuenciaConDesborde(umbral=16, directorio=self.temp_dir)
+            for numero in parte:
+                tabla.agregar(numero)
+            tablas.append(tabla)
+        fusionada = tablas[0].fusionar(tablas[1]).fusionar(tablas[2])
+
+        conteos = Counter(numero for parte in partes for numero in parte)
+        totales = list(fusionada._iterar_totales())  # pylint: disable=protected-access
+        self.assertEqual({numero: conteo for numero, conteo, _ in totales}, dict(conteos))
+        self.assertEqual([conteo for _, conteo, _ in fusionada.top(5)],
+                         [conteo for _, conteo in conteos.most_common(5)])
+        fusionada.cerrar()
+
+
+class TestSpaceSaving(unittest.TestCase):
+    """Pruebas unitarias para verificar las cotas de error de Space-Saving."""
+
+    def verificar_cotas(self, resumen, conteos):
+        """
+        Verifica que conteo - error <= frecuencia real <= conteo para cada valor
+        guardado y que todo valor con frecuencia mayor que total / capacidad
+        está en el resumen.
+        """
+        total = sum(conteos.values())
+        self.assertEqual(resumen.total, total)
+        for valor, conteo, error in resumen.top(resumen.capacidad):
+            self.assertLessEqual(conteo - error, conteos[valor])
+            self.assertLessEqual(conteos[valor], conteo)
+        guardados = {valor for valor, _, _ in resumen.top(resumen.capacidad)}
+        for valor, conteo in conteos.items():
+            if conteo > total / resumen.capacidad:
+                self.assertIn(valor, guardados)
+
+    def test_cotas_de_error(self):
+        """
+        Verifica las cotas de error con más valores distintos que contadores.
+        """
+        numeros = datos_sesgados(20000, 4)
+        resumen = SpaceSaving(capacidad=20)
+        for inicio in range(0, len(numeros), 500):
+            resumen.agregar_bloque(numeros[inicio:inicio + 500])
+        conteos = Counter(numeros)
+        self.assertGreater(len(conteos), resumen.capacidad)
+        self.verificar_cotas(resumen, conteos)
+
+    def test_cotas_tras_fusionar(self):
+        """
+        Verifica que las cotas de error se mantienen al fusionar resúmenes.
+        """
+        partes = [datos_sesgados(8000, semilla) for semilla in (5, 6, 7)]
+        resumenes = []
+        for parte in partes:
+            resumen = SpaceSaving(capacidad=20)
+            resumen.agregar_bloque(parte)
+            resumenes.append(resumen)
+        fusionado = resumenes[0].fusionar(resumenes[1]).fusionar(resumenes[2])
+        self.verificar_cotas(fusionado, Counter(numero for parte in partes for numero in parte))
+
+
+if __name__ == '__main__':
+    unittest.main()
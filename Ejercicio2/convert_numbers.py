@@ -2,31 +2,120 @@
 Este programa convierte números enteros desde un archivo a sus representaciones
 en binario y hexadecimal. Los resultados se muestran en pantalla y se guardan
 en un archivo llamado ConversionResults.txt.
+Admite complemento a dos de ancho fijo (--ancho), conversión en paralelo
+(--paralelo) y salida en el formato binario columnar de resultados_columnares.py.
 """
 
+import argparse
+import contextlib
+import decimal
+import os
+import queue
 import sys
-import time
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
+from comun import lector_numerico
+from comun.instrumentacion import Instrumentacion, agregar_argumentos
+from comun.lector_numerico import reportar_advertencias
+from resultados_columnares import RANGO_INT64, EscritorColumnar
 
-def leer_numeros_desde_archivo(ruta_archivo):
+
+FILAS_POR_ESCRITURA = 4096
+TAMANO_BUFFER_SALIDA = 1 << 20
+ENCABEZADO_RESULTADOS = "Número Decimal\tBinario\t\tHexadecimal\n" + "-" * 50 + "\n"
+ANCHOS_FIJOS = (8, 16, 32, 64)
+TABLA_BITS = tuple(format(octeto, "08b") for octeto in range(256))
+TABLA_HEX = tuple(format(octeto, "02x") for octeto in range(256))
+CODIGOS_POR_ANCHO = {array(codigo).itemsize * 8: codigo for codigo in "BHILQ"}
+DIGITOS_NUMERO_GRANDE = 4000
+LIMITE_NUMERO_GRANDE = 10 ** DIGITOS_NUMERO_GRANDE
+DIGITOS_POR_TRAMO = 512
+BITS_POR_TRAMO = 128
+OCTETOS_POR_FRAGMENTO = 1 << 16
+
+
+def entero_desde_decimal(texto):
+    """
+    Convierte un literal decimal largo en entero por divide y vencerás: los dígitos
+    se parten a la mitad recursivamente y valor = izquierda * 10**len(derecha) +
+    derecha. Los productos usan la multiplicación de Karatsuba de Python, así que
+    el costo es subcuadrático, y cada tramo de DIGITOS_POR_TRAMO dígitos queda por
+    debajo del límite de dígitos de int().
+
+    :param texto: Literal (str o bytes) con signo opcional y solo dígitos ASCII.
+    :return: Entero equivalente.
+    :raises ValueError: Si el texto no es un entero decimal.
+    """
+    if isinstance(texto, bytes):
+        texto = texto.decode("ascii")
+    digitos = texto.strip()
+    negativo = digitos.startswith("-")
+    if digitos[:1] in ("-", "+"):
+        digitos = digitos[1:]
+    if not (digitos.isascii() and digitos.isdigit()):
+        raise ValueError("El texto no es un entero decimal.")
+    potencias = {}
+
+    def analizar(inicio, fin):
+        if fin - inicio <= DIGITOS_POR_TRAMO:
+            return int(digitos[inicio:fin])
+        medio = (inicio + fin) // 2
+        if fin - medio not in potencias:
+            potencias[fin - medio] = 10 ** (fin - medio)
+        return analizar(inicio, medio) * potencias[fin - medio] + analizar(medio, fin)
+
+    valor = analizar(0, len(digitos))
+    return -valor if negativo else valor
+
+
+def convertir_entero(linea):
+    """
+    Convierte una línea en entero. Los literales de más de DIGITOS_NUMERO_GRANDE
+    caracteres, que int() rechaza, se convierten con entero_desde_decimal().
+
+    :param linea: Línea (str o bytes) sin el salto de línea final.
+    :return: Entero equivalente.
+    :raises ValueError: Si la línea no es un entero decimal.
+    """
+    if len(linea) > DIGITOS_NUMERO_GRANDE:
+        return entero_desde_decimal(linea)
+    return int(linea)
+
+
+def iterar_bloques_de_numeros(ruta_archivo, advertencias, rango=None):
+    """
+    Genera una lista de enteros válidos por cada bloque del archivo, leído con
+    el lector común de comun/lector_numerico.py. Los lotes bien formados se
+    convierten con int(); los demás, línea por línea con convertir_entero().
+
+    :param ruta_archivo: Ruta del archivo de entrada.
+    :param advertencias: Lista donde se agregan las líneas inválidas.
+    :param rango: Tupla opcional (mínimo, máximo) de los números admitidos.
+    :return: Generador de listas de números válidos.
+    """
+    conversion = lector_numerico.Conversion(int, convertir_entero, rango)
+    return lector_numerico.iterar_bloques_de_numeros(ruta_archivo, advertencias, conversion)
+
+
+def leer_numeros_desde_archivo(ruta_archivo, advertencias=None):
     """
     Lee números desde un archivo y los almacena en una lista.
-    Ignora líneas con datos inválidos y muestra advertencias.
+    Ignora líneas con datos inválidos y muestra las advertencias al terminar.
 
     :param ruta_archivo: Ruta del archivo de entrada.
+    :param advertencias: Lista opcional donde se agregan las líneas inválidas.
     :return: Lista de números válidos.
     """
     numeros = []
-    with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
-        for numero_linea, linea in enumerate(archivo, start=1):
-            try:
-                numero = int(linea.strip())
-                numeros.append(numero)
-            except ValueError:
-                print(
-                    f"Dato inválido en la línea {numero_linea}: "
-                    f"'{linea.strip()}' (ignorado)"
-                )
+    if advertencias is None:
+        advertencias = []
+    for bloque in iterar_bloques_de_numeros(ruta_archivo, advertencias):
+        numeros.extend(bloque)
+    reportar_advertencias(advertencias)
     return numeros
 
 
@@ -50,38 +139,492 @@ def convertir_hexadecimal(numero):
     return hex(numero)[2:]
 
 
-def main():
+def convertir_lote(numeros):
     """
-    Función principal del programa.
-    Lee números desde un archivo, los convierte a binario y hexadecimal,
-    mide el tiempo de ejecución y guarda los resultados.
+    Convierte un lote de números a binario y hexadecimal con el mismo formato que
+    convertir_binario() y convertir_hexadecimal(), pero sin una llamada a función
+    por número: bin() y hex() se aplican directamente dentro de cada columna.
+
+    :param numeros: Lista de números enteros.
+    :return: Tupla (binarios, hexadecimales) de listas de cadenas.
+    """
+    binarios = [bin(numero)[2:] for numero in numeros]
+    hexadecimales = [hex(numero)[2:] for numero in numeros]
+    return binarios, hexadecimales
+
+
+def decimal_desde_entero(numero):
+    """
+    Convierte un entero grande a texto decimal por divide y vencerás. En lugar de
+    str(), que es cuadrático y está limitado por sys.get_int_max_str_digits(),
+    parte los bits a la mitad recursivamente y recompone el valor como
+    decimal.Decimal, cuya multiplicación es subcuadrática y cuyo texto se obtiene
+    en tiempo lineal.
+
+    :param numero: Número entero.
+    :return: Representación decimal como cadena.
+    """
+    if numero < 0:
+        return "-" + decimal_desde_entero(-numero)
+    potencias = {}
+
+    def potencia_de_dos(exponente):
+        if exponente not in potencias:
+            if exponente <= BITS_POR_TRAMO:
+                potencias[exponente] = decimal.Decimal(2) ** exponente
+            else:
+                mitad = exponente >> 1
+                potencias[exponente] = (
+                    potencia_de_dos(mitad) * potencia_de_dos(exponente - mitad)
+                )
+        return potencias[exponente]
+
+    def componer(valor, bits):
+        if bits <= BITS_POR_TRAMO:
+            return decimal.Decimal(valor)
+        mitad = bits >> 1
+        alto = valor >> mitad
+        return (componer(valor - (alto << mitad), mitad)
+                + componer(alto, bits - mitad) * potencia_de_dos(mitad))
+
+    with decimal.localcontext() as contexto:
+        contexto.prec = decimal.MAX_PREC
+        contexto.Emax = decimal.MAX_EMAX
+        contexto.Emin = decimal.MIN_EMIN
+        contexto.traps[decimal.Inexact] = True
+        return str(componer(numero, numero.bit_length()))
+
+
+def iterar_fragmentos_de_fila_grande(numero):
+    """
+    Genera por fragmentos la fila del reporte de un número grande. Los bytes de su
+    magnitud se traducen de OCTETOS_POR_FRAGMENTO en OCTETOS_POR_FRAGMENTO con
+    TABLA_BITS y bytes.hex(), así que las cadenas binaria y hexadecimal nunca se
+    crean completas. El formato coincide con formatear_filas().
+
+    :param numero: Número entero.
+    :return: Generador de fragmentos de texto de la fila.
+    """
+    magnitud = abs(numero)
+    octetos = magnitud.to_bytes(max((magnitud.bit_length() + 7) // 8, 1), "big")
+    signo = numero < 0
+    yield decimal_desde_entero(numero) + "\t\t" + "b" * signo + format(octetos[0], "b")
+    for inicio in range(1, len(octetos), OCTETOS_POR_FRAGMENTO):
+        yield "".join(map(TABLA_BITS.__getitem__,
+                          octetos[inicio:inicio + OCTETOS_POR_FRAGMENTO]))
+    yield "\t\t" + "x" * signo + format(octetos[0], "x")
+    for inicio in range(1, len(octetos), OCTETOS_POR_FRAGMENTO):
+        yield octetos[inicio:inicio + OCTETOS_POR_FRAGMENTO].hex()
+    yield "\n"
+
+
+def rango_de_ancho(ancho):
+    """
+    Devuelve el rango de enteros con signo que caben en complemento a dos con un
+    ancho fijo de bits. Los valores sin signo por encima del máximo no se admiten,
+    porque su representación coincidiría con la de un negativo (200 y -56 en 8 bits).
+
+    :param ancho: Ancho en bits (8, 16, 32 o 64).
+    :return: Tupla (mínimo, máximo).
+    """
+    return -(1 << (ancho - 1)), (1 << (ancho - 1)) - 1
+
+
+def convertir_lote_complemento_a_dos(numeros, ancho):
+    """
+    Convierte un lote de números a binario y hexadecimal en complemento a dos de
+    ancho fijo. Los valores se enmascaran al ancho y se empaquetan en un array
+    big-endian; cada byte se traduce a sus 8 bits con TABLA_BITS y los dígitos
+    hexadecimales salen de los mismos bytes. Con 8 bits se indexan directamente
+    TABLA_BITS y TABLA_HEX.
+
+    :param numeros: Lista de números dentro de rango_de_ancho(ancho).
+    :param ancho: Ancho en bits (8, 16, 32 o 64).
+    :return: Tupla (binarios, hexadecimales) de listas de cadenas de ancho fijo.
+    """
+    mascara = (1 << ancho) - 1
+    if ancho == 8:
+        valores = [numero & mascara for numero in numeros]
+        return [TABLA_BITS[valor] for valor in valores], [TABLA_HEX[valor] for valor in valores]
+    enmascarados = array(CODIGOS_POR_ANCHO[ancho], [numero & mascara for numero in numeros])
+    if sys.byteorder == "little":
+        enmascarados.byteswap()
+    octetos = enmascarados.tobytes()
+    bits = "".join(map(TABLA_BITS.__getitem__, octetos))
+    hexadecimal = octetos.hex()
+    digitos = ancho // 4
+    return (
+        [bits[i:i + ancho] for i in range(0, len(bits), ancho)],
+        [hexadecimal[i:i + digitos] for i in range(0, len(hexadecimal), digitos)],
+    )
+
+
+def formatear_filas(numeros, ancho=None):
+    """
+    Formatea un lote de números como filas del reporte en una sola cadena.
+    Con un ancho fijo, el decimal se alinea a la derecha y todas las filas miden
+    lo mismo. En el formato libre cada fila se arma en una sola pasada, con el
+    decimal antes que bin() y hex(), para que un número que str() no puede
+    formatear falle antes de crear sus cadenas binaria y hexadecimal.
+
+    :param numeros: Lista de números enteros.
+    :param ancho: Ancho en bits del complemento a dos, o None para el formato libre.
+    :return: Texto con una fila (decimal, binario, hexadecimal) por número.
+    :raises ValueError: Si un número supera el límite de dígitos de str().
+    """
+    if ancho is None:
+        return "".join([
+            f"{numero}\t\t{bin(numero)[2:]}\t\t{hex(numero)[2:]}\n" for numero in numeros
+        ])
+    binarios, hexadecimales = convertir_lote_complemento_a_dos(numeros, ancho)
+    ancho_decimal = max(len(str(limite)) for limite in rango_de_ancho(ancho))
+    return "".join([
+        f"{numero:>{ancho_decimal}}\t\t{binario}\t\t{hexadecimal}\n"
+        for numero, binario, hexadecimal in zip(numeros, binarios, hexadecimales)
+    ])
+
+
+def iterar_fragmentos_de_filas(numeros, ancho=None):
+    """
+    Genera el texto de las filas de un lote. Normalmente es una sola cadena de
+    formatear_filas(); si el lote trae números que str() no puede formatear, las
+    filas de los números de más de DIGITOS_NUMERO_GRANDE dígitos se generan con
+    iterar_fragmentos_de_fila_grande() y las demás se agrupan como de costumbre.
+
+    :param numeros: Lista de números enteros.
+    :param ancho: Ancho en bits del complemento a dos, o None para el formato libre.
+    :return: Generador de fragmentos de texto.
     """
-    if len(sys.argv) != 2:
-        print("Uso: python convert_numbers.py archivoConDatos.txt")
+    try:
+        texto = formatear_filas(numeros, ancho)
+    except ValueError:
+        texto = None
+    if texto is not None:
+        yield texto
         return
+    normales = []
+    for numero in numeros:
+        if -LIMITE_NUMERO_GRANDE < numero < LIMITE_NUMERO_GRANDE:
+            normales.append(numero)
+            continue
+        if normales:
+            yield formatear_filas(normales, ancho)
+            normales = []
+        yield from iterar_fragmentos_de_fila_grande(numero)
+    if normales:
+        yield formatear_filas(normales, ancho)
+
+
+def formatear_fragmentos(numeros, ancho=None):
+    """
+    Devuelve en una lista los fragmentos de iterar_fragmentos_de_filas(), para
+    poder enviarlos de un proceso a otro.
+
+    :param numeros: Lista de números enteros.
+    :param ancho: Ancho en bits del complemento a dos, o None para el formato libre.
+    :return: Lista de fragmentos de texto.
+    """
+    return list(iterar_fragmentos_de_filas(numeros, ancho))
+
+
+def escribir_conversiones(ruta_archivo, destinos, advertencias, ancho=None):
+    """
+    Lee el archivo por bloques y escribe en cada destino el encabezado y las filas
+    convertidas, de FILAS_POR_ESCRITURA en FILAS_POR_ESCRITURA. Solo se mantiene en
+    memoria el bloque actual. El encabezado se escribe con el primer número válido.
+
+    :param ruta_archivo: Ruta del archivo de entrada.
+    :param destinos: Lista de archivos de texto abiertos para escritura.
+    :param advertencias: Lista donde se agregan las líneas inválidas.
+    :param ancho: Ancho en bits del complemento a dos, o None para el formato libre.
+        Con un ancho fijo, los números que no caben se reportan como inválidos.
+    :return: Cantidad de números convertidos.
+    """
+    rango = None if ancho is None else rango_de_ancho(ancho)
+    cantidad = 0
+    for bloque in iterar_bloques_de_numeros(ruta_archivo, advertencias, rango):
+        for inicio in range(0, len(bloque), FILAS_POR_ESCRITURA):
+            lote = bloque[inicio:inicio + FILAS_POR_ESCRITURA]
+            if cantidad == 0:
+                for destino in destinos:
+                    destino.write(ENCABEZADO_RESULTADOS)
+            for texto in iterar_fragmentos_de_filas(lote, ancho):
+                for destino in destinos:
+                    destino.write(texto)
+            cantidad += len(lote)
+    return cantidad
+
+
+def leer_bloques_en_hilo(bloques, cola):
+    """
+    Tarea del hilo lector: coloca en la cola cada bloque de números y, al
+    terminar, None. Si la lectura falla, coloca la excepción para que el hilo
+    principal la vuelva a lanzar en lugar de esperar indefinidamente.
+
+    :param bloques: Iterable de listas de números, por ejemplo el generador de
+        iterar_bloques_de_numeros(); se recorre en el hilo lector.
+    :param cola: Cola acotada donde se depositan los bloques.
+    """
+    try:
+        for bloque in bloques:
+            if bloque:
+                cola.put(bloque)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        cola.put(error)
+        return
+    cola.put(None)
+
+
+def ejecutar_tuberia(bloques, tarea, consumir, procesos=None):
+    """
+    Tubería productor/consumidor: un hilo lector recorre los bloques (y así los
+    analiza), un ProcessPoolExecutor aplica `tarea` a cada bloque y el hilo
+    principal llama a consumir(bloque, resultado) en el orden de la entrada. La
+    cola de bloques y las tareas en curso están acotadas a dos por proceso, de
+    modo que la memoria no crece con el tamaño del archivo.
+
+    :param bloques: Iterable de listas de números, como iterar_bloques_de_numeros().
+    :param tarea: Función de nivel de módulo (serializable) que recibe un bloque.
+    :param consumir: Función que recibe cada bloque con el resultado de su tarea.
+    :param procesos: Número de procesos (por omisión, uno por núcleo).
+    """
+    procesos = procesos or os.cpu_count() or 1
+    cola = queue.Queue(maxsize=2 * procesos)
+    lector = threading.Thread(
+        target=leer_bloques_en_hilo, args=(bloques, cola),
+        daemon=True,
+    )
+    lector.start()
+    en_curso = deque()
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        while True:
+            bloque = cola.get()
+            if bloque is None:
+                break
+            if isinstance(bloque, Exception):
+                raise bloque
+            en_curso.append((bloque, ejecutor.submit(tarea, bloque)))
+            if len(en_curso) >= 2 * procesos:
+                bloque, pendiente = en_curso.popleft()
+                consumir(bloque, pendiente.result())
+        while en_curso:
+            bloque, pendiente = en_curso.popleft()
+            consumir(bloque, pendiente.result())
+    lector.join()
+
+
+def escribir_conversiones_en_paralelo(ruta_archivo, destinos, advertencias, ancho=None,
+                                      procesos=None):
+    """
+    Igual que escribir_conversiones(), pero con ejecutar_tuberia(): los bloques se
+    formatean en un grupo de procesos y se escriben en el orden de la entrada.
+
+    :param ruta_archivo: Ruta del archivo de entrada.
+    :param destinos: Lista de archivos de texto abiertos para escritura.
+    :param advertencias: Lista donde se agregan las líneas inválidas.
+    :param ancho: Ancho en bits del complemento a dos, o None para el formato libre.
+    :param procesos: Número de procesos (por omisión, uno por núcleo).
+    :return: Cantidad de números convertidos.
+    """
+    cantidad = 0
+
+    def escribir(bloque, fragmentos):
+        nonlocal cantidad
+        if cantidad == 0:
+            fragmentos[0] = ENCABEZADO_RESULTADOS + fragmentos[0]
+        for texto in fragmentos:
+            for destino in destinos:
+                destino.write(texto)
+        cantidad += len(bloque)
 
-    ruta_archivo = sys.argv[1]
-    tiempo_inicio = time.time()
+    rango = None if ancho is None else rango_de_ancho(ancho)
+    ejecutar_tuberia(
+        iterar_bloques_de_numeros(ruta_archivo, advertencias, rango),
+        partial(formatear_fragmentos, ancho=ancho), escribir, procesos,
+    )
+    return cantidad
 
-    numeros = leer_numeros_desde_archivo(ruta_archivo)
-    if not numeros:
+
+def convertir_columnas(numeros, ancho=None):
+    """
+    Convierte un lote con el formato elegido: libre o complemento a dos de ancho fijo.
+
+    :param numeros: Lista de números enteros.
+    :param ancho: Ancho en bits del complemento a dos, o None para el formato libre.
+    :return: Tupla (binarios, hexadecimales) de listas de cadenas.
+    """
+    if ancho is None:
+        return convertir_lote(numeros)
+    return convertir_lote_complemento_a_dos(numeros, ancho)
+
+
+def escribir_columnar(ruta_archivo, escritor, advertencias, opciones):
+    """
+    Convierte el archivo por bloques y agrega las columnas a un EscritorColumnar.
+    La columna decimal es int64, así que los números que no caben en ella se
+    reportan como inválidos.
+
+    :param ruta_archivo: Ruta del archivo de entrada.
+    :param escritor: EscritorColumnar abierto.
+    :param advertencias: Lista donde se agregan las líneas inválidas.
+    :param opciones: Objeto con los atributos ancho (bits del complemento a dos o
+        None), paralelo (si convierte con ejecutar_tuberia()) y procesos, como los
+        argumentos de main().
+    :return: Cantidad de números convertidos.
+    """
+    ancho = opciones.ancho
+    minimo, maximo = RANGO_INT64
+    if ancho is not None:
+        minimo_ancho, maximo_ancho = rango_de_ancho(ancho)
+        minimo, maximo = max(minimo, minimo_ancho), min(maximo, maximo_ancho)
+    bloques = iterar_bloques_de_numeros(ruta_archivo, advertencias, (minimo, maximo))
+    if opciones.paralelo:
+        ejecutar_tuberia(
+            bloques, partial(convertir_columnas, ancho=ancho),
+            lambda bloque, columnas: escritor.agregar(bloque, *columnas), opciones.procesos,
+        )
+    else:
+        for bloque in bloques:
+            escritor.agregar(bloque, *convertir_columnas(bloque, ancho))
+    return escritor.cantidad
+
+
+def crear_parser():
+    """
+    Crea el analizador de la línea de comandos del programa.
+
+    :return: argparse.ArgumentParser con las opciones de conversión e instrumentación.
+    """
+    parser = argparse.ArgumentParser(
+        prog="convert_numbers.py",
+        description="Convierte números enteros a binario y hexadecimal."
+    )
+    parser.add_argument("archivo", help="archivo con un número entero por línea")
+    parser.add_argument(
+        "--salida", default=None,
+        help="archivo de resultados (por omisión, ConversionResults.txt o, en formato "
+             "columnar, ConversionResults.col)"
+    )
+    parser.add_argument(
+        "--formato", choices=("texto", "columnar"), default="texto",
+        help="tabla de texto o archivo columnar binario para otros programas"
+    )
+    parser.add_argument(
+        "--silencioso", action="store_true",
+        help="no muestra la tabla en pantalla; solo la escribe en el archivo"
+    )
+    parser.add_argument(
+        "--ancho", type=int, choices=ANCHOS_FIJOS, default=None,
+        help="muestra cada número en complemento a dos con este ancho fijo de bits"
+    )
+    parser.add_argument(
+        "--paralelo", action="store_true",
+        help="lee, convierte y escribe en una tubería con un grupo de procesos"
+    )
+    parser.add_argument(
+        "--procesos", type=int, default=None,
+        help="número de procesos del modo paralelo (por omisión, uno por núcleo)"
+    )
+    agregar_argumentos(parser)
+    return parser
+
+
+def convertir_a_columnar(argumentos, instrumentacion):
+    """
+    Convierte el archivo de entrada y guarda los resultados en formato columnar.
+    Si no hay números válidos, descarta el archivo de salida.
+
+    :param argumentos: Argumentos de la línea de comandos.
+    :param instrumentacion: Instrumentacion donde se registran las fases.
+    """
+    advertencias = []
+    ruta_salida = argumentos.salida or "ConversionResults.col"
+    escritor = EscritorColumnar(ruta_salida, argumentos.ancho)
+    completado = False
+    try:
+        with instrumentacion.fase("conversion_y_escritura"):
+            cantidad = escribir_columnar(
+                argumentos.archivo, escritor, advertencias, argumentos
+            )
+        completado = True
+    finally:
+        if not completado:
+            escritor.descartar()
+    instrumentacion.contar(cantidad, len(advertencias))
+    reportar_advertencias(advertencias)
+    if not cantidad:
+        escritor.descartar()
         print("No hay números válidos para procesar.")
         return
+    with instrumentacion.fase("salida"):
+        escritor.cerrar()
+    print(f"Resultados columnares: {cantidad} números en {ruta_salida}")
+    print(f"Tiempo transcurrido: {instrumentacion.transcurrido():.5f} segundos")
 
-    resultados = "Número Decimal\tBinario\t\tHexadecimal\n" + "-" * 50 + "\n"
 
-    for numero in numeros:
-        binario = convertir_binario(numero)
-        hexadecimal = convertir_hexadecimal(numero)
-        resultados += f"{numero}\t\t{binario}\t\t{hexadecimal}\n"
+def convertir_a_texto(argumentos, instrumentacion):
+    """
+    Convierte el archivo de entrada y escribe la tabla de texto en flujo. El
+    reporte se escribe primero en un archivo temporal que reemplaza al definitivo
+    al terminar.
 
-    tiempo_transcurrido = time.time() - tiempo_inicio
-    resultados += f"\nTiempo transcurrido: {tiempo_transcurrido:.5f} segundos"
+    :param argumentos: Argumentos de la línea de comandos.
+    :param instrumentacion: Instrumentacion donde se registran las fases.
+    """
+    advertencias = []
+    ruta_salida = argumentos.salida or "ConversionResults.txt"
+    ruta_temporal = ruta_salida + ".parcial"
+    completado = False
+    try:
+        with open(ruta_temporal, "w", encoding="utf-8",
+                  buffering=TAMANO_BUFFER_SALIDA) as archivo_resultados:
+            destinos = [archivo_resultados]
+            if not argumentos.silencioso:
+                destinos.append(sys.stdout)
+            with instrumentacion.fase("conversion_y_escritura"):
+                if argumentos.paralelo:
+                    cantidad = escribir_conversiones_en_paralelo(
+                        argumentos.archivo, destinos, advertencias, argumentos.ancho,
+                        argumentos.procesos
+                    )
+                else:
+                    cantidad = escribir_conversiones(
+                        argumentos.archivo, destinos, advertencias, argumentos.ancho
+                    )
+            if cantidad:
+                tiempo_transcurrido = instrumentacion.transcurrido()
+                pie = f"\nTiempo transcurrido: {tiempo_transcurrido:.5f} segundos"
+                archivo_resultados.write(pie)
+                if not argumentos.silencioso:
+                    print(pie)
+        completado = True
+    finally:
+        if not completado:
+            with contextlib.suppress(OSError):
+                os.remove(ruta_temporal)
+    instrumentacion.contar(cantidad, len(advertencias))
+    reportar_advertencias(advertencias)
+
+    if not cantidad:
+        os.remove(ruta_temporal)
+        print("No hay números válidos para procesar.")
+    else:
+        os.replace(ruta_temporal, ruta_salida)
 
-    print(resultados)
 
-    with open("ConversionResults.txt", "w", encoding="utf-8") as archivo_resultados:
-        archivo_resultados.write(resultados)
+def main():
+    """
+    Función principal del programa.
+    Lee números desde un archivo, los convierte a binario y hexadecimal,
+    mide el tiempo de ejecución y guarda los resultados en el formato elegido.
+    """
+    argumentos = crear_parser().parse_args()
+    instrumentacion = Instrumentacion.desde_argumentos("convert_numbers", argumentos)
+    if argumentos.formato == "columnar":
+        convertir_a_columnar(argumentos, instrumentacion)
+    else:
+        convertir_a_texto(argumentos, instrumentacion)
+    instrumentacion.terminar()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+"""
+Formato columnar binario para los resultados de convert_numbers.py.
+
+Un archivo columnar guarda los números convertidos en columnas contiguas, listas
+para mapearse en memoria sin volver a analizar texto:
+
+    [MAGIA]
+    [decimales]        int64, un valor por fila
+    [binario.offsets]  uint64, filas + 1 desplazamientos dentro de binario.datos
+    [binario.datos]    bytes ASCII de todas las cadenas binarias, una tras otra
+    [hex.offsets]      uint64, filas + 1 desplazamientos dentro de hex.datos
+    [hex.datos]        bytes ASCII de todas las cadenas hexadecimales
+    [pie]              JSON con la posición y el tamaño de cada sección
+    [largo del pie]    uint64 little-endian
+    [MAGIA]
+
+La cadena de la fila i de una columna de texto ocupa datos[offsets[i]:offsets[i + 1]].
+Cada sección empieza en un múltiplo de 8 bytes. Mientras se escribe, cada columna
+se acumula en un archivo temporal propio, de modo que la escritura es en flujo y
+la memoria no crece con la cantidad de filas.
+"""
+
+import contextlib
+import json
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+
+
+MAGIA = b"CONVCOL1"
+VERSION_FORMATO = 1
+ALINEACION = 8
+LARGO_PIE = 8
+SECCIONES = ("decimales", "binario.offsets", "binario.datos", "hex.offsets", "hex.datos")
+RANGO_INT64 = (-(1 << 63), (1 << 63) - 1)
+
+
+class EscritorColumnar:
+    """
+    Escribe un archivo columnar por lotes. Se usa como administrador de contexto;
+    al salir sin errores ensambla el archivo final y, si hubo un error, descarta
+    los temporales.
+    """
+
+    def __init__(self, ruta, ancho=None):
+        """
+        :param ruta: Ruta del archivo columnar a crear.
+        :param ancho: Ancho en bits del complemento a dos usado, o None.
+        """
+        self.ruta = ruta
+        self.ancho = ancho
+        self.cantidad = 0
+        self.fin_binario = 0
+        self.fin_hex = 0
+        self.directorio = tempfile.mkdtemp(
+            prefix="columnas_", dir=os.path.dirname(os.path.abspath(ruta))
+        )
+        self.partes = {
+            seccion: open(os.path.join(self.directorio, seccion), "wb")  # pylint: disable=consider-using-with
+            for seccion in SECCIONES
+        }
+        self.partes["binario.offsets"].write(array("Q", [0]).tobytes())
+        self.partes["hex.offsets"].write(array("Q", [0]).tobytes())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+
+    def agregar(self, numeros, binarios, hexadecimales):
+        """
+        Agrega un lote de filas a las columnas.
+
+        :param numeros: Lista de enteros que caben en int64.
+        :param binarios: Lista de cadenas binarias, una por número.
+        :param hexadecimales: Lista de cadenas hexadecimales, una por número.
+        """
+        self.partes["decimales"].write(array("q", numeros).tobytes())
+        self.fin_binario = self._agregar_cadenas(
+            binarios, "binario.offsets", "binario.datos", self.fin_binario
+        )
+        self.fin_hex = self._agregar_cadenas(
+            hexadecimales, "hex.offsets", "hex.datos", self.fin_hex
+        )
+        self.cantidad += len(numeros)
+
+    def _agregar_cadenas(self, cadenas, seccion_offsets, seccion_datos, fin):
+        """Escribe un lote de cadenas y sus desplazamientos; devuelve el nuevo fin."""
+        offsets = array("Q")
+        for cadena in cadenas:
+            fin += len(cadena)
+            offsets.append(fin)
+        self.partes[seccion_offsets].write(offsets.tobytes())
+        self.partes[seccion_datos].write("".join(cadenas).encode("ascii"))
+        return fin
+
+    def cerrar(self):
+        """
+        Ensambla las columnas en el archivo final, agrega el pie y elimina los
+        temporales.
+
+        :return: Cantidad de filas escritas.
+        """
+        for parte in self.partes.values():
+            parte.close()
+        pie = {
+            "version": VERSION_FORMATO,
+            "filas": self.cantidad,
+            "ancho": self.ancho,
+            "orden_bytes": sys.byteorder,
+            "secciones": {},
+        }
+        ruta_temporal = self.ruta + ".parcial"
+        with open(ruta_temporal, "wb") as archivo:
+            archivo.write(MAGIA)
+            for seccion in SECCIONES:
+                relleno = -archivo.tell() % ALINEACION
+                archivo.write(b"\0" * relleno)
+                inicio = archivo.tell()
+                with open(os.path.join(self.directorio, seccion), "rb") as parte:
+                    shutil.copyfileobj(parte, archivo, 1 << 20)
+                pie["secciones"][seccion] = [inicio, archivo.tell() - inicio]
+            texto_pie = json.dumps(pie).encode("utf-8")
+            archivo.write(texto_pie)
+            archivo.write(len(texto_pie).to_bytes(LARGO_PIE, "little"))
+            archivo.write(MAGIA)
+        os.replace(ruta_temporal, self.ruta)
+        shutil.rmtree(self.directorio, ignore_errors=True)
+        return self.cantidad
+
+    def descartar(self):
+        """
+        Cierra y elimina los temporales sin crear el archivo final. Los errores al
+        cerrar se ignoran para no ocultar el error que llevó a descartar.
+        """
+        for parte in self.partes.values():
+            with contextlib.suppress(OSError):
+                parte.close()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+
+class LectorColumnar:
+    """
+    Lee un archivo columnar mapeándolo en memoria. Cada sección se expone en
+    `columnas` como memoryview sin copiar los datos (tipado para la columna de
+    decimales y los desplazamientos), por lo que también puede envolverse con
+    np.frombuffer().
+    """
+
+    def __init__(self, ruta):
+        """
+        :param ruta: Ruta de un archivo creado con EscritorColumnar.
+        :raises ValueError: Si el archivo no tiene el formato esperado.
+        """
+        with open(ruta, "rb") as archivo:
+            self.mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.vista = memoryview(self.mapa)
+        self.columnas = {}
+        try:
+            self.pie = self._leer_pie()
+            for seccion, codigo in zip(SECCIONES, ("q", "Q", None, "Q", None)):
+                self.columnas[seccion] = self._columna(seccion, codigo)
+        except (ValueError, KeyError):
+            self.cerrar()
+            raise
+
+    @property
+    def ancho(self):
+        """Ancho en bits del complemento a dos usado al convertir, o None."""
+        return self.pie["ancho"]
+
+    @property
+    def decimales(self):
+        """Columna de decimales como memoryview de int64."""
+        return self.columnas["decimales"]
+
+    def _leer_pie(self):
+        """
+        Valida la magia del archivo y devuelve el pie JSON.
+
+        :raises ValueError: Si falta la magia, el pie no se puede leer o alguna
+            sección no cabe en el archivo.
+        """
+        final = len(self.mapa) - len(MAGIA)
+        if (len(self.mapa) < 2 * len(MAGIA) + LARGO_PIE
+                or self.mapa[:len(MAGIA)] != MAGIA or self.mapa[final:] != MAGIA):
+            raise ValueError("El archivo no es un resultado columnar de convert_numbers.")
+        largo = int.from_bytes(self.mapa[final - LARGO_PIE:final], "little")
+        pie = json.loads(self.mapa[final - LARGO_PIE - largo:final - LARGO_PIE])
+        if pie["version"] != VERSION_FORMATO:
+            raise ValueError(f"Versión de formato columnar no admitida: {pie['version']}.")
+        for seccion in SECCIONES:
+            inicio, largo = pie["secciones"][seccion]
+            if inicio < 0 or largo < 0 or inicio + largo > final:
+                raise ValueError(f"La sección {seccion} está fuera del archivo.")
+        return pie
+
+    def _columna(self, nombre, codigo):
+        """
+        Devuelve una sección como memoryview; si se indica un código de array,
+        tipado con ese código. Si el archivo se escribió con otro orden de bytes,
+        devuelve una copia convertida.
+        """
+        inicio, largo = self.pie["secciones"][nombre]
+        if codigo is None:
+            return self.vista[inicio:inicio + largo]
+        if largo % array(codigo).itemsize:
+            raise ValueError(f"La sección {nombre} no tiene un tamaño válido.")
+        if self.pie["orden_bytes"] == sys.byteorder:
+            return self.vista[inicio:inicio + largo].cast(codigo)
+        valores = array(codigo, self.vista[inicio:inicio + largo])
+        valores.byteswap()
+        return memoryview(valores)
+
+    def __len__(self):
+        return self.pie["filas"]
+
+    def _cadena(self, columna, indice):
+        """Devuelve la cadena de la fila indicada de una columna de texto."""
+        offsets = self.columnas[columna + ".offsets"]
+        return str(self.columnas[columna + ".datos"][offsets[indice]:offsets[indice + 1]], "ascii")
+
+    def binario(self, indice):
+        """Devuelve la cadena binaria de la fila indicada."""
+        return self._cadena("binario", indice)
+
+    def hexadecimal(self, indice):
+        """Devuelve la cadena hexadecimal de la fila indicada."""
+        return self._cadena("hex", indice)
+
+    def __getitem__(self, indice):
+        """Devuelve la fila indicada como tupla (decimal, binario, hexadecimal)."""
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Fila fuera de rango.")
+        return self.decimales[indice], self.binario(indice), self.hexadecimal(indice)
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+    def cerrar(self):
+        """
+        Libera las vistas y el mapeo en memoria. Las vistas obtenidas del lector
+        (por ejemplo, arreglos de np.frombuffer) deben liberarse antes.
+        """
+        for vista in self.columnas.values():
+            vista.release()
+        self.columnas = {}
+        self.vista.release()
+        self.mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
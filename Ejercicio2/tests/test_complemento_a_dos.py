@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas unitarias para el modo de complemento a dos de ancho fijo de
+convert_numbers.py. Se verifican los límites del rango con signo de cada ancho.
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from convert_numbers import ANCHOS_FIJOS, escribir_conversiones, rango_de_ancho
+
+
+class TestComplementoADos(unittest.TestCase):
+    """Pruebas unitarias para verificar los límites del complemento a dos."""
+
+    def setUp(self):
+        """Configura el entorno de prueba utilizando un directorio temporal."""
+        self.temp_dir_obj = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.ruta = os.path.join(self.temp_dir_obj.name, "numeros.txt")
+
+    def tearDown(self):
+        """Limpia el entorno de prueba eliminando el directorio temporal."""
+        self.temp_dir_obj.cleanup()
+
+    def convertir(self, lineas, ancho):
+        """Convierte las líneas dadas y devuelve (filas, advertencias)."""
+        with open(self.ruta, "w", encoding="utf-8") as archivo:
+            archivo.write("\n".join(lineas) + "\n")
+        destino = io.StringIO()
+        advertencias = []
+        escribir_conversiones(self.ruta, [destino], advertencias, ancho)
+        filas = [fila.split() for fila in destino.getvalue().splitlines()[2:]]
+        return filas, advertencias
+
+    def test_rango_con_signo(self):
+        """
+        Verifica que cada ancho admite exactamente el rango con signo.
+        """
+        for ancho in ANCHOS_FIJOS:
+            self.assertEqual(
+                rango_de_ancho(ancho), (-(2 ** (ancho - 1)), 2 ** (ancho - 1) - 1)
+            )
+
+    def test_limites_de_ocho_bits(self):
+        """
+        Verifica que -128 y 127 se convierten y que 128, 200 y -129 se rechazan,
+        de modo que 200 ya no comparte representación con -56.
+        """
+        filas, advertencias = self.convertir(
+            ["-128", "127", "-56", "128", "200", "-129"], 8
+        )
+        self.assertEqual(filas, [
+            ["-128", "10000000", "80"],
+            ["127", "01111111", "7f"],
+            ["-56", "11001000", "c8"],
+        ])
+        self.assertEqual(advertencias, [(4, "128"), (5, "200"), (6, "-129")])
+
+
+if __name__ == '__main__':
+    unittest.main()
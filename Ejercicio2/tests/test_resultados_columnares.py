@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas unitarias para el formato columnar de resultados_columnares.py.
+Se escribe un archivo columnar, se vuelve a leer y se comparan las filas.
+"""
+
+import copy
+import json
+import os
+import sys
+import tempfile
+import unittest
+from resultados_columnares import LARGO_PIE, MAGIA, EscritorColumnar, LectorColumnar
+
+
+class TestResultadosColumnares(unittest.TestCase):
+    """Pruebas unitarias para verificar la escritura y la lectura columnar."""
+
+    def setUp(self):
+        """Configura el entorno de prueba utilizando un directorio temporal."""
+        self.temp_dir_obj = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.temp_dir = self.temp_dir_obj.name
+        self.ruta = os.path.join(self.temp_dir, "resultados.col")
+
+    def tearDown(self):
+        """Limpia el entorno de prueba eliminando el directorio temporal."""
+        self.temp_dir_obj.cleanup()
+
+    def escribir(self, lotes, ancho=None):
+        """Escribe los lotes de números dados y devuelve las filas esperadas."""
+        filas = []
+        with EscritorColumnar(self.ruta, ancho) as escritor:
+            for numeros in lotes:
+                binarios = [format(numero % (1 << 64), "b") for numero in numeros]
+                hexadecimales = [format(numero % (1 << 64), "x") for numero in numeros]
+                escritor.agregar(numeros, binarios, hexadecimales)
+                filas.extend(zip(numeros, binarios, hexadecimales))
+        return filas
+
+    def test_ida_y_vuelta(self):
+        """
+        Verifica que las filas escritas en varios lotes se leen iguales, con los
+        límites de int64, y que el escritor no deja temporales.
+        """
+        filas = self.escribir([[0, 1, -1, 255], [], [2 ** 63 - 1, -(2 ** 63), 42]], ancho=64)
+        self.assertEqual(os.listdir(self.temp_dir), ["resultados.col"])
+
+        with LectorColumnar(self.ruta) as lector:
+            self.assertEqual(len(lector), len(filas))
+            self.assertEqual(lector.ancho, 64)
+            self.assertEqual(list(lector), filas)
+            self.assertEqual(lector[-1], filas[-1])
+            self.assertEqual(lector.decimales.tolist(), [fila[0] for fila in filas])
+            with self.assertRaises(IndexError):
+                _ = lector[len(filas)]
+
+    def test_archivo_vacio(self):
+        """
+        Verifica que un archivo columnar sin filas se puede leer.
+        """
+        self.escribir([])
+        with LectorColumnar(self.ruta) as lector:
+            self.assertEqual(len(lector), 0)
+            self.assertIsNone(lector.ancho)
+            self.assertEqual(list(lector), [])
+
+    def test_descartar_tras_error(self):
+        """
+        Verifica que un error durante la escritura se propaga sin cambios y que el
+        escritor no deja el archivo final ni temporales.
+        """
+        with self.assertRaises(ZeroDivisionError):
+            with EscritorColumnar(self.ruta) as escritor:
+                escritor.agregar([1], ["1"], ["1"])
+                _ = 1 / 0
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def mapeos_abiertos(self):
+        """Cuenta los mapeos en memoria del archivo columnar en este proceso."""
+        with open("/proc/self/maps", encoding="utf-8") as mapas:
+            return sum(linea.rstrip().endswith(self.ruta) for linea in mapas)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "requiere /proc/self/maps")
+    def test_pie_invalido(self):
+        """
+        Verifica que un pie al que le falta una sección, con una sección fuera
+        del archivo o una magia incorrecta produce KeyError o ValueError y no
+        deja el archivo mapeado en memoria.
+        """
+        self.escribir([[1, 2, 3]])
+        with open(self.ruta, "rb") as archivo:
+            contenido = archivo.read()
+        final = len(contenido) - len(MAGIA)
+        largo = int.from_bytes(contenido[final - LARGO_PIE:final], "little")
+        inicio_pie = final - LARGO_PIE - largo
+        pie = json.loads(contenido[inicio_pie:final - LARGO_PIE])
+
+        sin_seccion = copy.deepcopy(pie)
+        del sin_seccion["secciones"]["hex.datos"]
+        fuera_de_rango = copy.deepcopy(pie)
+        fuera_de_rango["secciones"]["hex.datos"] = [0, len(contenido) * 2]
+        for pie_roto, error in ((sin_seccion, KeyError), (fuera_de_rango, ValueError)):
+            texto = json.dumps(pie_roto).encode("utf-8")
+            with open(self.ruta, "wb") as archivo:
+                archivo.write(contenido[:inicio_pie] + texto
+                              + len(texto).to_bytes(LARGO_PIE, "little") + MAGIA)
+            with self.assertRaises(error):
+                LectorColumnar(self.ruta)
+            self.assertEqual(self.mapeos_abiertos(), 0)
+
+        with open(self.ruta, "wb") as archivo:
+            archivo.write(b"X" * len(contenido))
+        with self.assertRaises(ValueError):
+            LectorColumnar(self.ruta)
+        self.assertEqual(self.mapeos_abiertos(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
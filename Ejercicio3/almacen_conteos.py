@@ -0,0 +1,214 @@
+"""
+Almacén persistente e incremental de conteos de palabras para word_count.py.
+
+Los conteos se guardan en una base SQLite con cuatro tablas:
+
+    metadatos  clave/valor; guarda el tokenizador con que se creó el almacén
+    palabras   id (orden de primera aparición), palabra y frecuencia total
+    archivos   ruta absoluta, tamaño, huella SHA-256, último byte y palabras
+    conteos    frecuencia de cada palabra en cada archivo
+
+Cada archivo se registra con su huella de contenido, así que una nueva pasada
+sobre el mismo corpus salta los archivos sin cambios. Si un archivo solo creció
+(la huella de sus primeros bytes coincide con la guardada), basta con contar lo
+agregado; si cambió de otra forma, sus conteos anteriores se restan de los
+totales antes de sumar los nuevos. Cada archivo se registra en una transacción:
+sus conteos se cargan con un executemany en una tabla temporal y desde ella se
+suman con un upsert por tabla, en lugar de una sentencia por palabra.
+"""
+
+import hashlib
+import sqlite3
+from collections import Counter
+
+VERSION_ESQUEMA = 1
+TAMANO_LECTURA = 1 << 20
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS metadatos (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS palabras (
+    id INTEGER PRIMARY KEY,
+    palabra TEXT NOT NULL UNIQUE,
+    frecuencia INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS archivos (
+    id INTEGER PRIMARY KEY,
+    ruta TEXT NOT NULL UNIQUE,
+    tamano INTEGER NOT NULL,
+    huella TEXT NOT NULL,
+    ultimo_octeto INTEGER,
+    palabras INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conteos (
+    archivo INTEGER NOT NULL,
+    palabra INTEGER NOT NULL,
+    frecuencia INTEGER NOT NULL,
+    PRIMARY KEY (archivo, palabra)
+) WITHOUT ROWID;
+"""
+LOTE = "CREATE TEMP TABLE IF NOT EXISTS lote (palabra TEXT NOT NULL, frecuencia INTEGER NOT NULL)"
+SUMAR_PALABRAS = """
+INSERT INTO palabras (palabra, frecuencia)
+SELECT palabra, frecuencia FROM lote WHERE true ORDER BY rowid
+ON CONFLICT (palabra) DO UPDATE SET frecuencia = frecuencia + excluded.frecuencia
+"""
+SUMAR_CONTEOS = """
+INSERT INTO conteos (archivo, palabra, frecuencia)
+SELECT ?, palabras.id, lote.frecuencia FROM lote JOIN palabras USING (palabra) WHERE true
+ON CONFLICT (archivo, palabra) DO UPDATE SET frecuencia = frecuencia + excluded.frecuencia
+"""
+RESTAR_CONTEOS = """
+UPDATE palabras SET frecuencia = frecuencia - (
+    SELECT frecuencia FROM conteos WHERE archivo = ?1 AND palabra = palabras.id
+)
+WHERE id IN (SELECT palabra FROM conteos WHERE archivo = ?1)
+"""
+
+def resumir_archivo(ruta, largo_previo=None):
+    """
+    Lee el archivo una vez y devuelve (tamaño, huella, huella_previa, último byte).
+    La huella es el SHA-256 en hexadecimal del contenido; huella_previa es la de
+    sus primeros `largo_previo` bytes, o None si no se pidió o el archivo es más
+    corto. El último byte es None si el archivo está vacío.
+    """
+    resumen = hashlib.sha256()
+    huella_previa = None
+    tamano = 0
+    ultimo_octeto = None
+    with open(ruta, "rb") as archivo:
+        while True:
+            datos = archivo.read(TAMANO_LECTURA)
+            if not datos:
+                break
+            if largo_previo is not None and tamano <= largo_previo < tamano + len(datos):
+                corte = largo_previo - tamano
+                resumen.update(datos[:corte])
+                huella_previa = resumen.copy().hexdigest()
+                resumen.update(datos[corte:])
+            else:
+                resumen.update(datos)
+            tamano += len(datos)
+            ultimo_octeto = datos[-1]
+    if largo_previo is not None and largo_previo == tamano:
+        huella_previa = resumen.hexdigest()
+    return tamano, resumen.hexdigest(), huella_previa, ultimo_octeto
+
+class AlmacenConteos:
+    """
+    Conteos de palabras acumulados en una base SQLite. Todos los archivos de un
+    almacén deben contarse con el mismo tokenizador; abrirlo con otro es un error.
+    """
+
+    def __init__(self, ruta, tokenizador="espacios"):
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        try:
+            self._preparar(tokenizador)
+        except (sqlite3.Error, ValueError):
+            self.conexion.close()
+            raise
+        self.tokenizador = tokenizador
+
+    def _preparar(self, tokenizador):
+        """Crea las tablas si no existen y valida la versión y el tokenizador."""
+        self.conexion.execute("PRAGMA journal_mode = WAL")
+        self.conexion.execute("PRAGMA synchronous = NORMAL")
+        with self.conexion:
+            self.conexion.executescript(ESQUEMA)
+            self.conexion.execute(LOTE)
+            self.conexion.executemany(
+                "INSERT OR IGNORE INTO metadatos (clave, valor) VALUES (?, ?)",
+                [("version", str(VERSION_ESQUEMA)), ("tokenizador", tokenizador)],
+            )
+        metadatos = dict(self.conexion.execute("SELECT clave, valor FROM metadatos"))
+        if metadatos["version"] != str(VERSION_ESQUEMA):
+            raise ValueError(f"Versión de almacén no admitida: {metadatos['version']}.")
+        if metadatos["tokenizador"] != tokenizador:
+            raise ValueError(
+                f"El almacén {self.ruta} se creó con el tokenizador "
+                f"'{metadatos['tokenizador']}', no '{tokenizador}'."
+            )
+
+    def archivo(self, ruta):
+        """
+        Devuelve lo registrado para la ruta como diccionario (id, tamano, huella,
+        ultimo_octeto, palabras), o None si el archivo no está en el almacén.
+        """
+        fila = self.conexion.execute(
+            "SELECT id, tamano, huella, ultimo_octeto, palabras FROM archivos WHERE ruta = ?",
+            (ruta,),
+        ).fetchone()
+        if fila is None:
+            return None
+        return dict(zip(("id", "tamano", "huella", "ultimo_octeto", "palabras"), fila))
+
+    def registrar(self, ruta, estado, frecuencias, *, ampliar=False):
+        """
+        Registra el contenido actual de un archivo en una sola transacción.
+        `estado` es un diccionario con las mismas claves que devuelve archivo()
+        salvo id: tamano, huella y ultimo_octeto del archivo completo, y palabras,
+        la cantidad de palabras contadas en `frecuencias`.
+        Con ampliar=True, `frecuencias` son las de los bytes agregados al final y
+        se suman a lo ya registrado; si no, reemplazan a los conteos anteriores del
+        archivo, que se restan de los totales.
+        """
+        tamano, huella = estado["tamano"], estado["huella"]
+        ultimo_octeto, palabras = estado["ultimo_octeto"], estado["palabras"]
+        with self.conexion:
+            previo = self.archivo(ruta)
+            if previo is None:
+                identificador = self.conexion.execute(
+                    "INSERT INTO archivos (ruta, tamano, huella, ultimo_octeto, palabras) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (ruta, tamano, huella, ultimo_octeto, palabras),
+                ).lastrowid
+            else:
+                identificador = previo["id"]
+                if ampliar:
+                    palabras += previo["palabras"]
+                else:
+                    self.conexion.execute(RESTAR_CONTEOS, (identificador,))
+                    self.conexion.execute(
+                        "DELETE FROM conteos WHERE archivo = ?", (identificador,)
+                    )
+                self.conexion.execute(
+                    "UPDATE archivos SET tamano = ?, huella = ?, ultimo_octeto = ?, "
+                    "palabras = ? WHERE id = ?",
+                    (tamano, huella, ultimo_octeto, palabras, identificador),
+                )
+            self.conexion.execute("DELETE FROM lote")
+            self.conexion.executemany("INSERT INTO lote VALUES (?, ?)", frecuencias.items())
+            self.conexion.execute(SUMAR_PALABRAS)
+            self.conexion.execute(SUMAR_CONTEOS, (identificador,))
+            self.conexion.execute("DELETE FROM lote")
+
+    def frecuencias(self):
+        """
+        Devuelve un Counter con las frecuencias totales del almacén, en orden de
+        primera aparición. Las palabras que ya no aparecen en ningún archivo se
+        omiten.
+        """
+        return Counter(dict(self.conexion.execute(
+            "SELECT palabra, frecuencia FROM palabras WHERE frecuencia > 0 ORDER BY id"
+        )))
+
+    def total_palabras(self):
+        """Devuelve la cantidad total de palabras de los archivos registrados."""
+        return self.conexion.execute(
+            "SELECT COALESCE(SUM(palabras), 0) FROM archivos"
+        ).fetchone()[0]
+
+    def __len__(self):
+        return self.conexion.execute("SELECT COUNT(*) FROM archivos").fetchone()[0]
+
+    def cerrar(self):
+        """Cierra la conexión con la base."""
+        self.conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
@@ -0,0 +1,326 @@
+"""
+Índice invertido persistente para word_count.py.
+
+Para cada término guarda dónde aparece: el documento, el número de línea y el
+desplazamiento en bytes de la aparición dentro del archivo. El índice se escribe
+en un solo archivo compacto que se consulta mapeándolo en memoria, sin volver a
+leer el corpus:
+
+    [MAGIA]
+    [postings]          listas de apariciones de cada término, en varint-delta
+    [terminos.datos]    términos en UTF-8, concatenados en orden de bytes
+    [terminos.offsets]  términos + 1 desplazamientos en terminos.datos
+    [postings.offsets]  términos + 1 desplazamientos en postings
+    [frecuencias]       apariciones de cada término
+    [pie]               JSON con los documentos, el tokenizador y las secciones
+    [largo del pie]     uint64 little-endian
+    [MAGIA]
+
+Cada aparición se codifica como tres varint sin signo (LEB128): la diferencia de
+documento con la aparición anterior y, dentro del mismo documento, las
+diferencias de línea y de desplazamiento; al cambiar de documento, la línea y el
+desplazamiento se guardan completos. Las tablas numéricas del diccionario usan
+enteros sin signo de 32 bits si sus valores caben y de 64 bits si no. El
+diccionario de términos está ordenado, así que una búsqueda es una búsqueda
+binaria sobre el archivo mapeado.
+"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_left
+
+MAGIA = b"WCINDX01"
+VERSION_FORMATO = 1
+ALINEACION = 8
+LARGO_PIE = 8
+BYTES_DE_CONTEXTO = 4096
+CODIGO_32_BITS = "I" if array("I").itemsize == 4 else "L"
+
+def tabla_compacta(valores):
+    """Devuelve los enteros como array sin signo de 32 bits si caben, o de 64 bits."""
+    if not valores or max(valores) < 1 << 32:
+        return array(CODIGO_32_BITS, valores)
+    return array("Q", valores)
+
+def desplazamientos(partes):
+    """
+    Devuelve como tabla compacta el desplazamiento de cada parte al concatenarlas,
+    seguido del largo total.
+    """
+    offsets = [0]
+    for parte in partes:
+        offsets.append(offsets[-1] + len(parte))
+    return tabla_compacta(offsets)
+
+def escribir_seccion(archivo, pie, nombre, partes):
+    """
+    Escribe una sección alineada a ALINEACION bytes, concatenando sus partes, y
+    anota en el pie su posición y su largo. Si la sección es una tabla (array),
+    anota también su ancho en bits.
+    """
+    if isinstance(partes, array):
+        pie["tipos"][nombre] = partes.itemsize * 8
+        partes = [partes.tobytes()]
+    archivo.write(b"\0" * (-archivo.tell() % ALINEACION))
+    inicio = archivo.tell()
+    archivo.writelines(partes)
+    pie["secciones"][nombre] = [inicio, archivo.tell() - inicio]
+
+def codificar_varint(valor, destino):
+    """Agrega a un bytearray un entero no negativo codificado como varint LEB128."""
+    while valor >= 0x80:
+        destino.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    destino.append(valor)
+
+def decodificar_varints(datos):
+    """Genera los enteros codificados como varint LEB128 en una secuencia de bytes."""
+    valor = 0
+    corrimiento = 0
+    for octeto in datos:
+        valor |= (octeto & 0x7F) << corrimiento
+        if octeto & 0x80:
+            corrimiento += 7
+        else:
+            yield valor
+            valor = 0
+            corrimiento = 0
+
+class ConstructorIndice:
+    """
+    Acumula las apariciones de cada término y escribe el índice con guardar().
+    Las apariciones de un término deben agregarse en el orden del corpus
+    (documento, y dentro de él, desplazamiento creciente); cada una se codifica
+    al llegar, así que en memoria solo ocupa unos pocos bytes.
+    """
+
+    def __init__(self, tokenizador="espacios"):
+        self.tokenizador = tokenizador
+        self.documentos = []
+        self.postings = {}
+        self.apariciones = 0
+
+    def agregar_documento(self, ruta):
+        """
+        Registra un documento por su ruta absoluta, para que el índice se pueda
+        consultar desde cualquier directorio, y devuelve su número.
+        """
+        self.documentos.append(os.path.abspath(ruta))
+        return len(self.documentos) - 1
+
+    def agregar(self, termino, documento, linea, desplazamiento):
+        """Registra una aparición de un término."""
+        entrada = self.postings.get(termino)
+        if entrada is None:
+            entrada = self.postings[termino] = [bytearray(), 0, 0, 0, 0]
+        datos, documento_previo, linea_previa, desplazamiento_previo, _ = entrada
+        if documento != documento_previo:
+            linea_previa = desplazamiento_previo = 0
+        codificar_varint(documento - documento_previo, datos)
+        codificar_varint(linea - linea_previa, datos)
+        codificar_varint(desplazamiento - desplazamiento_previo, datos)
+        entrada[1:] = [documento, linea, desplazamiento, entrada[4] + 1]
+        self.apariciones += 1
+
+    def guardar(self, ruta):
+        """
+        Escribe el índice en un archivo temporal que reemplaza a `ruta` al terminar.
+        Devuelve la cantidad de términos.
+        """
+        terminos = sorted(self.postings, key=lambda termino: termino.encode("utf-8"))
+        codificados = [termino.encode("utf-8") for termino in terminos]
+        postings = [self.postings[termino][0] for termino in terminos]
+        pie = {
+            "version": VERSION_FORMATO,
+            "tokenizador": self.tokenizador,
+            "documentos": self.documentos,
+            "terminos": len(terminos),
+            "apariciones": self.apariciones,
+            "orden_bytes": sys.byteorder,
+            "secciones": {},
+            "tipos": {},
+        }
+        secciones = (
+            ("postings", postings),
+            ("terminos.datos", codificados),
+            ("terminos.offsets", desplazamientos(codificados)),
+            ("postings.offsets", desplazamientos(postings)),
+            ("frecuencias", tabla_compacta([self.postings[termino][4] for termino in terminos])),
+        )
+        ruta_temporal = ruta + ".parcial"
+        with open(ruta_temporal, "wb") as archivo:
+            archivo.write(MAGIA)
+            for nombre, partes in secciones:
+                escribir_seccion(archivo, pie, nombre, partes)
+            texto_pie = json.dumps(pie, ensure_ascii=False).encode("utf-8")
+            archivo.write(texto_pie)
+            archivo.write(len(texto_pie).to_bytes(LARGO_PIE, "little"))
+            archivo.write(MAGIA)
+        os.replace(ruta_temporal, ruta)
+        return len(terminos)
+
+class _TerminosOrdenados:
+    """Vista de solo lectura de los términos codificados, para usar con bisect."""
+
+    def __init__(self, datos, offsets):
+        self.datos = datos
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, indice):
+        return bytes(self.datos[self.offsets[indice]:self.offsets[indice + 1]])
+
+class LectorIndice:
+    """
+    Consulta un índice creado con ConstructorIndice mapeándolo en memoria.
+    Los términos deben pasarse ya normalizados con el mismo tokenizador que se
+    usó al construirlo (ver el atributo `tokenizador`). Cada sección se expone en
+    `secciones` como memoryview sobre el archivo mapeado.
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, "rb") as archivo:
+            self.mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.vista = memoryview(self.mapa)
+        self.secciones = {}
+        try:
+            self.pie = self._leer_pie()
+            for nombre in ("postings", "terminos.datos"):
+                self.secciones[nombre] = self._seccion(nombre)
+            for nombre in ("terminos.offsets", "postings.offsets", "frecuencias"):
+                self.secciones[nombre] = self._columna(nombre)
+        except (ValueError, KeyError):
+            self.cerrar()
+            raise
+        self.terminos = _TerminosOrdenados(
+            self.secciones["terminos.datos"], self.secciones["terminos.offsets"]
+        )
+
+    @property
+    def tokenizador(self):
+        """Nombre del tokenizador con que se construyó el índice."""
+        return self.pie["tokenizador"]
+
+    @property
+    def documentos(self):
+        """Rutas absolutas de los documentos indexados, por número de documento."""
+        return self.pie["documentos"]
+
+    def _leer_pie(self):
+        """Valida la magia del archivo y devuelve el pie JSON."""
+        final = len(self.mapa) - len(MAGIA)
+        if (len(self.mapa) < 2 * len(MAGIA) + LARGO_PIE
+                or self.mapa[:len(MAGIA)] != MAGIA or self.mapa[final:] != MAGIA):
+            raise ValueError("El archivo no es un índice invertido de word_count.")
+        largo = int.from_bytes(self.mapa[final - LARGO_PIE:final], "little")
+        pie = json.loads(self.mapa[final - LARGO_PIE - largo:final - LARGO_PIE])
+        if pie["version"] != VERSION_FORMATO:
+            raise ValueError(f"Versión de índice no admitida: {pie['version']}.")
+        for nombre, (inicio, largo) in pie["secciones"].items():
+            if inicio < 0 or largo < 0 or inicio + largo > final:
+                raise ValueError(f"La sección {nombre} está fuera del archivo.")
+        return pie
+
+    def _seccion(self, nombre):
+        """Devuelve un memoryview de bytes sobre una sección del archivo."""
+        inicio, largo = self.pie["secciones"][nombre]
+        return self.vista[inicio:inicio + largo]
+
+    def _columna(self, nombre):
+        """
+        Devuelve una tabla numérica como memoryview tipado. Si el archivo se
+        escribió con otro orden de bytes, devuelve una copia convertida.
+        """
+        codigo = CODIGO_32_BITS if self.pie["tipos"][nombre] == 32 else "Q"
+        if self.pie["secciones"][nombre][1] % array(codigo).itemsize:
+            raise ValueError(f"La sección {nombre} no tiene un tamaño válido.")
+        if self.pie["orden_bytes"] == sys.byteorder:
+            return self._seccion(nombre).cast(codigo)
+        valores = array(codigo, self._seccion(nombre))
+        valores.byteswap()
+        return memoryview(valores)
+
+    def __len__(self):
+        return len(self.terminos)
+
+    def __contains__(self, termino):
+        return self._posicion(termino) != -1
+
+    def _posicion(self, termino):
+        """Devuelve la posición del término en el diccionario, o -1 si no está."""
+        clave = termino.encode("utf-8")
+        posicion = bisect_left(self.terminos, clave)
+        if posicion < len(self.terminos) and self.terminos[posicion] == clave:
+            return posicion
+        return -1
+
+    def frecuencia(self, termino):
+        """Devuelve cuántas veces aparece el término en el corpus."""
+        posicion = self._posicion(termino)
+        return 0 if posicion == -1 else self.secciones["frecuencias"][posicion]
+
+    def buscar(self, termino):
+        """
+        Devuelve las apariciones del término como tuplas
+        (ruta del documento, número de línea, desplazamiento en bytes), en el orden
+        del corpus. Devuelve una lista vacía si el término no está en el índice.
+        """
+        posicion = self._posicion(termino)
+        if posicion == -1:
+            return []
+        offsets = self.secciones["postings.offsets"]
+        datos = self.secciones["postings"][offsets[posicion]:offsets[posicion + 1]]
+        apariciones = []
+        documento = linea = desplazamiento = 0
+        valores = decodificar_varints(datos)
+        for delta_documento, delta_linea, delta_desplazamiento in zip(valores, valores, valores):
+            if delta_documento:
+                documento += delta_documento
+                linea = desplazamiento = 0
+            linea += delta_linea
+            desplazamiento += delta_desplazamiento
+            apariciones.append((self.documentos[documento], linea, desplazamiento))
+        return apariciones
+
+    def terminos_con_prefijo(self, prefijo):
+        """Genera en orden los términos del índice que empiezan con el prefijo."""
+        clave = prefijo.encode("utf-8")
+        posicion = bisect_left(self.terminos, clave)
+        while posicion < len(self.terminos):
+            termino = self.terminos[posicion]
+            if not termino.startswith(clave):
+                break
+            yield termino.decode("utf-8")
+            posicion += 1
+
+    def cerrar(self):
+        """Libera las vistas y el mapeo en memoria."""
+        for vista in self.secciones.values():
+            vista.release()
+        self.secciones = {}
+        self.vista.release()
+        self.mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+def leer_linea(ruta_documento, desplazamiento):
+    """
+    Devuelve el texto de la línea del documento que contiene el desplazamiento en
+    bytes indicado, leyendo solo los alrededores de la aparición.
+    """
+    with open(ruta_documento, "rb") as archivo:
+        inicio = max(0, desplazamiento - BYTES_DE_CONTEXTO)
+        archivo.seek(inicio)
+        previo = archivo.read(desplazamiento - inicio)
+        corte = previo.rfind(b"\n")
+        linea = previo[corte + 1:] + archivo.readline()
+    return linea.decode("utf-8", errors="replace").rstrip("\r\n")
@@ -0,0 +1,92 @@
+"""
+Conteo de n-gramas (bigramas, trigramas, ...) para word_count.py.
+
+Los n-gramas se forman con una ventana deslizante sobre el flujo de términos que
+produce el tokenizador, en la misma pasada del conteo de palabras. Los últimos
+n - 1 términos de cada bloque se conservan para formar los n-gramas que cruzan
+el límite entre bloques; la ventana se reinicia al cambiar de archivo, así que
+ningún n-grama mezcla dos documentos.
+
+Un diccionario exacto de n-gramas crece mucho antes que el de palabras, por lo
+que hay tres modos:
+
+    exacto      Counter con todos los n-gramas.
+    aproximado  resumen Space-Saving (comun/space_saving.py) con a lo sumo
+                `capacidad` contadores; cada conteo viene con su cota de error.
+    auto        exacto mientras haya hasta `umbral` n-gramas distintos; al
+                superarlo conserva los `capacidad` más frecuentes (con error 0)
+                y sigue con Space-Saving.
+"""
+
+from collections import Counter
+
+from comun.space_saving import SpaceSaving
+
+MODOS_NGRAMAS = ("auto", "exacto", "aproximado")
+NOMBRES_NGRAMAS = {2: "Bigrama", 3: "Trigrama"}
+
+class ContadorNgramas:
+    """
+    Cuenta los n-gramas de un flujo de términos entregado por bloques con
+    agregar_terminos(). Los n-gramas se guardan como los términos unidos por un
+    espacio.
+    """
+
+    def __init__(self, n=2, modo="auto", capacidad=10_000, umbral=1_000_000):
+        if n < 2:
+            raise ValueError("Un n-grama debe tener al menos 2 términos.")
+        if modo not in MODOS_NGRAMAS:
+            raise ValueError(f"Modo de n-gramas desconocido: {modo}.")
+        self.n = n
+        self.modo = modo
+        self.capacidad = capacidad
+        self.umbral = umbral
+        self.ventana = []
+        self.total = 0
+        self.conteos = SpaceSaving(capacidad) if modo == "aproximado" else Counter()
+
+    @property
+    def aproximado(self):
+        """Indica si los conteos son estimaciones de Space-Saving."""
+        return isinstance(self.conteos, SpaceSaving)
+
+    def agregar_terminos(self, terminos):
+        """
+        Cuenta los n-gramas que forman los términos del bloque (una lista) junto
+        con los últimos n - 1 términos del bloque anterior.
+        """
+        secuencia = self.ventana + terminos
+        self.ventana = secuencia[-(self.n - 1):]
+        cantidad = len(secuencia) - self.n + 1
+        if cantidad <= 0:
+            return
+        ngramas = map(" ".join, zip(*(secuencia[k:] for k in range(self.n))))
+        self.total += cantidad
+        if self.aproximado:
+            self.conteos.agregar_bloque(ngramas)
+            return
+        self.conteos.update(ngramas)
+        if self.modo == "auto" and len(self.conteos) > self.umbral:
+            self._pasar_a_aproximado()
+
+    def reiniciar_ventana(self):
+        """Descarta la ventana para que el próximo bloque empiece un documento nuevo."""
+        self.ventana = []
+
+    def _pasar_a_aproximado(self):
+        """Reemplaza el Counter por un resumen Space-Saving con sus n-gramas más frecuentes."""
+        self.conteos = SpaceSaving.desde_conteos(self.conteos, self.capacidad)
+
+    def top(self, k=0):
+        """
+        Devuelve los k n-gramas más frecuentes (todos los guardados si k es 0) como
+        tuplas (n-grama, conteo, error), de mayor a menor conteo. En modo exacto
+        el error es 0 y los empates siguen el orden de primera aparición.
+        """
+        if self.aproximado:
+            return self.conteos.top(k or len(self.conteos.contadores))
+        return [(ngrama, conteo, 0) for ngrama, conteo in self.conteos.most_common(k or None)]
+
+    def nombre(self):
+        """Devuelve el nombre de los n-gramas contados, por ejemplo "Bigrama"."""
+        return NOMBRES_NGRAMAS.get(self.n, f"{self.n}-grama")
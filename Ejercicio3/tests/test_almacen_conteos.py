@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas unitarias para el almacén incremental de conteos de almacen_conteos.py.
+Se actualiza el almacén tras cada cambio del corpus y se comparan sus totales
+con un conteo completo desde cero.
+"""
+
+import os
+import tempfile
+import unittest
+from collections import Counter
+from almacen_conteos import AlmacenConteos
+from word_count import actualizar_almacen, contar_palabras_en_archivos
+
+
+class TestAlmacenConteos(unittest.TestCase):
+    """Pruebas unitarias para verificar la actualización incremental del almacén."""
+
+    def setUp(self):
+        """Configura el entorno de prueba utilizando un directorio temporal."""
+        self.temp_dir_obj = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.temp_dir = self.temp_dir_obj.name
+        self.ruta_almacen = os.path.join(self.temp_dir, "conteos.db")
+        self.rutas = [os.path.join(self.temp_dir, nombre) for nombre in ("a.txt", "b.txt")]
+        self.escribir(self.rutas[0], "w", "uno dos dos\n")
+        self.escribir(self.rutas[1], "w", "tres uno\n")
+
+    def tearDown(self):
+        """Limpia el entorno de prueba eliminando el directorio temporal."""
+        self.temp_dir_obj.cleanup()
+
+    @staticmethod
+    def escribir(ruta, modo, texto):
+        """Escribe o agrega texto a un archivo del corpus."""
+        with open(ruta, modo, encoding="utf-8") as archivo:
+            archivo.write(texto)
+
+    def actualizar(self, tokenizador="espacios"):
+        """
+        Actualiza el almacén con el corpus, verifica que sus totales coinciden
+        con un conteo desde cero y devuelve el resumen de la actualización.
+        """
+        with AlmacenConteos(self.ruta_almacen, tokenizador) as almacen:
+            resumen, _ = actualizar_almacen(almacen, self.rutas, tokenizador)
+            esperadas, total = contar_palabras_en_archivos(self.rutas, tokenizador)
+            self.assertEqual(almacen.frecuencias(), esperadas)
+            self.assertEqual(almacen.total_palabras(), total)
+            self.assertEqual(len(almacen), len(self.rutas))
+        return resumen
+
+    def test_actualizaciones_incrementales(self):
+        """
+        Verifica los archivos nuevos, sin cambios, ampliados al final y
+        recontados tras una edición, incluida una palabra que desaparece.
+        """
+        self.assertEqual(self.actualizar(), Counter(nuevos=2))
+        self.assertEqual(self.actualizar(), Counter(sin_cambios=2))
+
+        self.escribir(self.rutas[0], "a", "cuatro dos\n")
+        self.assertEqual(self.actualizar(), Counter(ampliados=1, sin_cambios=1))
+
+        self.escribir(self.rutas[1], "w", "cinco cinco\n")
+        self.assertEqual(self.actualizar(), Counter(recontados=1, sin_cambios=1))
+        with AlmacenConteos(self.ruta_almacen) as almacen:
+            self.assertNotIn("tres", almacen.frecuencias())
+
+    def test_ampliacion_sin_espacio_final(self):
+        """
+        Verifica que si lo registrado no terminaba en un espacio en blanco, el
+        archivo ampliado se recuenta completo porque su última palabra pudo
+        continuar en lo agregado.
+        """
+        self.escribir(self.rutas[0], "w", "uno dos")
+        self.assertEqual(self.actualizar(), Counter(nuevos=2))
+        self.escribir(self.rutas[0], "a", "tres uno\n")
+        self.assertEqual(self.actualizar(), Counter(recontados=1, sin_cambios=1))
+        with AlmacenConteos(self.ruta_almacen) as almacen:
+            self.assertIn("dostres", almacen.frecuencias())
+            self.assertNotIn("dos", almacen.frecuencias())
+
+    def test_tokenizador_distinto(self):
+        """
+        Verifica que abrir el almacén con otro tokenizador produce ValueError.
+        """
+        self.actualizar()
+        with self.assertRaises(ValueError):
+            AlmacenConteos(self.ruta_almacen, "palabras")
+        self.assertEqual(self.actualizar(), Counter(sin_cambios=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas unitarias para el índice invertido de word_count.py.
+Se escribe un índice, se vuelve a leer y se comparan las apariciones.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from indice_invertido import (
+    LARGO_PIE,
+    MAGIA,
+    ConstructorIndice,
+    LectorIndice,
+    codificar_varint,
+    decodificar_varints,
+)
+from word_count import consultar_indice, indexar_archivos
+
+VALORES_VARINT = [0, 1, 127, 128, 255, 300, 16383, 16384, 2 ** 32 - 1, 2 ** 32, 2 ** 63 + 5]
+
+
+class TestIndiceInvertido(unittest.TestCase):
+    """Pruebas unitarias para verificar el formato del índice invertido."""
+
+    def setUp(self):
+        """Configura el entorno de prueba utilizando un directorio temporal."""
+        self.temp_dir_obj = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.temp_dir = self.temp_dir_obj.name
+        self.ruta_indice = os.path.join(self.temp_dir, "indice.wci")
+
+    def tearDown(self):
+        """Limpia el entorno de prueba eliminando el directorio temporal."""
+        self.temp_dir_obj.cleanup()
+
+    def test_varint_ida_y_vuelta(self):
+        """
+        Verifica que los varint LEB128 se decodifican en los mismos valores,
+        incluidos los límites de 7, 14, 32 y 64 bits.
+        """
+        datos = bytearray()
+        for valor in VALORES_VARINT:
+            codificar_varint(valor, datos)
+        self.assertEqual(list(decodificar_varints(datos)), VALORES_VARINT)
+
+    def test_postings_ida_y_vuelta(self):
+        """
+        Verifica que las apariciones guardadas se leen iguales, con cambios de
+        documento y desplazamientos mayores que 32 bits.
+        """
+        apariciones = {
+            "hola": [(0, 1, 0), (0, 1, 5), (0, 40, 2 ** 33), (2, 1, 3)],
+            "mundo": [(1, 7, 120), (1, 7, 129), (2, 2, 2 ** 40)],
+            "ñandú": [(0, 3, 17)],
+        }
+        constructor = ConstructorIndice()
+        documentos = [constructor.agregar_documento(f"doc{numero}.txt") for numero in range(3)]
+        for termino, lista in apariciones.items():
+            for documento, linea, desplazamiento in lista:
+                constructor.agregar(termino, documentos[documento], linea, desplazamiento)
+        self.assertEqual(constructor.guardar(self.ruta_indice), 3)
+
+        with LectorIndice(self.ruta_indice) as indice:
+            self.assertEqual(len(indice), 3)
+            for termino, lista in apariciones.items():
+                esperadas = [
+                    (os.path.abspath(f"doc{documento}.txt"), linea, desplazamiento)
+                    for documento, linea, desplazamiento in lista
+                ]
+                self.assertEqual(indice.buscar(termino), esperadas)
+                self.assertEqual(indice.frecuencia(termino), len(lista))
+            self.assertEqual(indice.buscar("ausente"), [])
+            self.assertEqual(list(indice.terminos_con_prefijo("h")), ["hola"])
+
+    def test_pie_invalido(self):
+        """
+        Verifica que un pie al que le falta una sección produce KeyError y uno
+        con una sección fuera del archivo produce ValueError.
+        """
+        constructor = ConstructorIndice()
+        constructor.agregar("hola", constructor.agregar_documento("doc.txt"), 1, 0)
+        constructor.guardar(self.ruta_indice)
+        with open(self.ruta_indice, "rb") as archivo:
+            contenido = archivo.read()
+        final = len(contenido) - len(MAGIA)
+        largo_pie = int.from_bytes(contenido[final - LARGO_PIE:final], "little")
+        inicio_pie = final - LARGO_PIE - largo_pie
+
+        for cambio, error in (({"frecuencias": None}, KeyError),
+                              ({"frecuencias": [0, 2 * len(contenido)]}, ValueError)):
+            pie = json.loads(contenido[inicio_pie:final - LARGO_PIE])
+            for nombre, seccion in cambio.items():
+                if seccion is None:
+                    del pie["secciones"][nombre]
+                else:
+                    pie["secciones"][nombre] = seccion
+            texto = json.dumps(pie).encode("utf-8")
+            with open(self.ruta_indice, "wb") as archivo:
+                archivo.write(contenido[:inicio_pie] + texto
+                              + len(texto).to_bytes(LARGO_PIE, "little") + MAGIA)
+            with self.assertRaises(error):
+                LectorIndice(self.ruta_indice)
+
+    def test_documento_faltante(self):
+        """
+        Verifica que las rutas se guardan absolutas y que un documento borrado
+        se reporta en cada aparición sin interrumpir las consultas.
+        """
+        rutas = [os.path.join(self.temp_dir, nombre) for nombre in ("a.txt", "b.txt")]
+        for ruta in rutas:
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                archivo.write("uno dos\ndos\n")
+        constructor = ConstructorIndice()
+        indexar_archivos([os.path.relpath(ruta) for ruta in rutas], constructor)
+        constructor.guardar(self.ruta_indice)
+        os.remove(rutas[0])
+
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            consultar_indice(self.ruta_indice, ["dos", "uno"])
+        lineas = salida.getvalue().splitlines()
+        self.assertEqual(lineas[0], "dos: 4 apariciones")
+        self.assertTrue(lineas[1].startswith(f"{rutas[0]}:1:4: (Error:"))
+        self.assertTrue(lineas[2].startswith(f"{rutas[0]}:2:8: (Error:"))
+        self.assertEqual(lineas[3], f"{rutas[1]}:1:4: uno dos")
+        self.assertEqual(lineas[4], f"{rutas[1]}:2:8: dos")
+        self.assertEqual(lineas[5], "uno: 2 apariciones")
+
+
+if __name__ == '__main__':
+    unittest.main()
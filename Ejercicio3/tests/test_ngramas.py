@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas unitarias para el conteo de n-gramas de ngramas.py.
+Se comparan los modos exacto, aproximado y auto con un Counter de la secuencia
+completa de términos.
+"""
+
+import random
+import unittest
+from collections import Counter
+from ngramas import ContadorNgramas
+
+
+def ngramas_de(terminos, n):
+    """Cuenta los n-gramas de una secuencia completa de términos."""
+    return Counter(" ".join(terminos[k:k + n]) for k in range(len(terminos) - n + 1))
+
+
+def agregar_por_bloques(contador, terminos, tamano):
+    """Entrega los términos al contador en bloques del tamaño dado."""
+    for inicio in range(0, len(terminos), tamano):
+        contador.agregar_terminos(terminos[inicio:inicio + tamano])
+
+
+class TestContadorNgramas(unittest.TestCase):
+    """Pruebas unitarias para verificar el conteo de n-gramas por bloques."""
+
+    def setUp(self):
+        """Genera un flujo de términos con frecuencias sesgadas."""
+        aleatorio = random.Random(3)
+        self.terminos = [f"t{int(aleatorio.paretovariate(1.0))}" for _ in range(20000)]
+
+    def test_exacto_entre_bloques(self):
+        """
+        Verifica que los n-gramas que cruzan el límite entre bloques se cuentan,
+        incluso con bloques más cortos que el n-grama.
+        """
+        for n, tamano in ((2, 7), (3, 1), (3, 1000)):
+            contador = ContadorNgramas(n, modo="exacto")
+            agregar_por_bloques(contador, self.terminos, tamano)
+            esperados = ngramas_de(self.terminos, n)
+            self.assertFalse(contador.aproximado)
+            self.assertEqual(contador.total, len(self.terminos) - n + 1)
+            self.assertEqual(contador.top(), [(ngrama, conteo, 0)
+                                              for ngrama, conteo in esperados.most_common()])
+
+    def test_reiniciar_ventana(self):
+        """
+        Verifica que ningún n-grama mezcla dos documentos.
+        """
+        contador = ContadorNgramas(2, modo="exacto")
+        contador.agregar_terminos(["a", "b"])
+        contador.reiniciar_ventana()
+        contador.agregar_terminos(["c", "d"])
+        self.assertEqual(contador.top(), [("a b", 1, 0), ("c d", 1, 0)])
+        self.assertEqual(contador.nombre(), "Bigrama")
+
+    def verificar_cotas(self, contador, esperados):
+        """
+        Verifica que conteo - error <= frecuencia real <= conteo para cada
+        n-grama guardado y que los más frecuentes que total / capacidad están.
+        """
+        top = contador.top()
+        self.assertLessEqual(len(top), contador.capacidad)
+        for ngrama, conteo, error in top:
+            self.assertLessEqual(conteo - error, esperados[ngrama])
+            self.assertLessEqual(esperados[ngrama], conteo)
+        guardados = {ngrama for ngrama, _, _ in top}
+        for ngrama, conteo in esperados.items():
+            if conteo > contador.total / contador.capacidad:
+                self.assertIn(ngrama, guardados)
+
+    def test_auto_pasa_a_space_saving(self):
+        """
+        Verifica que el modo auto cuenta exacto hasta superar el umbral de
+        n-gramas distintos y luego sigue con Space-Saving dentro de sus cotas.
+        """
+        contador = ContadorNgramas(2, modo="auto", capacidad=50, umbral=200)
+        agregar_por_bloques(contador, self.terminos[:50], 10)
+        self.assertFalse(contador.aproximado)
+
+        agregar_por_bloques(contador, self.terminos[50:], 500)
+        esperados = ngramas_de(self.terminos, 2)
+        self.assertGreater(len(esperados), contador.umbral)
+        self.assertTrue(contador.aproximado)
+        self.assertEqual(contador.total, len(self.terminos) - 1)
+        self.verificar_cotas(contador, esperados)
+        self.assertEqual(contador.top(1)[0][0], esperados.most_common(1)[0][0])
+
+    def test_aproximado(self):
+        """
+        Verifica las cotas de error del modo aproximado desde el inicio.
+        """
+        contador = ContadorNgramas(3, modo="aproximado", capacidad=50)
+        agregar_por_bloques(contador, self.terminos, 500)
+        self.assertTrue(contador.aproximado)
+        self.verificar_cotas(contador, ngramas_de(self.terminos, 3))
+
+    def test_parametros_invalidos(self):
+        """
+        Verifica que n < 2 y un modo desconocido producen ValueError.
+        """
+        with self.assertRaises(ValueError):
+            ContadorNgramas(1)
+        with self.assertRaises(ValueError):
+            ContadorNgramas(2, modo="otro")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas unitarias para la tokenización y el conteo en flujo de word_count.py.
+Se compara el conteo por bloques con el de la lista completa de palabras.
+"""
+
+import os
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+import word_count
+from word_count import (
+    contar_frecuencia_palabras,
+    contar_palabras_desde_archivo,
+    contar_por_palabras,
+    leer_palabras_desde_archivo,
+    tokenizar_bloque,
+)
+
+TEXTO = (
+    "El niño dijo: «¡Hola, mundo!» y el NIÑO\trepitió hola-mundo.\n"
+    "Straße STRASSE cancio\u0301n canción l'école x_z 42\n"
+    "हिंदी हिंदी fin"
+)
+
+
+class TestTokenizadorPalabras(unittest.TestCase):
+    """Pruebas unitarias para verificar el tokenizador "palabras"."""
+
+    def test_puntuacion_y_normalizacion(self):
+        """
+        Verifica que la puntuación queda fuera de las palabras, que se conservan
+        los guiones y apóstrofos internos y que casefold() y NFC unifican las
+        distintas formas de una palabra.
+        """
+        frecuencias = Counter()
+        total = contar_por_palabras(TEXTO, frecuencias)
+        self.assertEqual(total, 21)
+        self.assertEqual(frecuencias["el"], 2)
+        self.assertEqual(frecuencias["niño"], 2)
+        self.assertEqual(frecuencias["hola-mundo"], 1)
+        self.assertEqual(frecuencias["strasse"], 2)
+        self.assertEqual(frecuencias["canción"], 2)
+        self.assertEqual(frecuencias["l'école"], 1)
+        self.assertEqual(frecuencias["हिंदी"], 2)
+        self.assertEqual((frecuencias["x"], frecuencias["z"]), (1, 1))
+        self.assertNotIn("mundo!»", frecuencias)
+
+    def test_secuencia_igual_al_conteo(self):
+        """
+        Verifica que tokenizar_bloque() produce los mismos términos que cuenta
+        cada tokenizador.
+        """
+        for tokenizador, contar_bloque in word_count.TOKENIZADORES.items():
+            frecuencias = Counter()
+            total = contar_bloque(TEXTO, frecuencias)
+            terminos = tokenizar_bloque(TEXTO, tokenizador)
+            self.assertEqual(len(terminos), total)
+            self.assertEqual(Counter(terminos), frecuencias)
+
+
+class TestConteoEnFlujo(unittest.TestCase):
+    """Pruebas unitarias para verificar el conteo de archivos bloque por bloque."""
+
+    def setUp(self):
+        """Configura el entorno de prueba utilizando un directorio temporal."""
+        self.temp_dir_obj = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.temp_dir = self.temp_dir_obj.name
+        self.ruta = os.path.join(self.temp_dir, "texto.txt")
+        with open(self.ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(TEXTO * 50)
+
+    def tearDown(self):
+        """Limpia el entorno de prueba eliminando el directorio temporal."""
+        self.temp_dir_obj.cleanup()
+
+    def test_bloques_pequenos(self):
+        """
+        Verifica que con bloques de pocos bytes ninguna palabra ni carácter
+        multibyte queda partido y que el conteo coincide con el de la lista
+        completa, en orden de primera aparición.
+        """
+        for tokenizador in word_count.TOKENIZADORES:
+            palabras = leer_palabras_desde_archivo(self.ruta, tokenizador)
+            esperadas = contar_frecuencia_palabras(palabras, tokenizador)
+            for tamano in (1, 7, 1 << 20):
+                with mock.patch.object(word_count, "TAMANO_BLOQUE", tamano):
+                    frecuencias, total = contar_palabras_desde_archivo(self.ruta, tokenizador)
+                self.assertEqual(total, len(palabras))
+                self.assertEqual(list(frecuencias.items()), list(esperadas.items()))
+
+    def test_funciones_de_lista(self):
+        """
+        Verifica que leer_palabras_desde_archivo() devuelve las palabras tal como
+        aparecen y que contar_frecuencia_palabras() las pasa a minúsculas.
+        """
+        palabras = leer_palabras_desde_archivo(self.ruta)
+        self.assertEqual(palabras, (TEXTO * 50).split())
+        self.assertEqual(contar_frecuencia_palabras(["Hola", "HOLA", "mundo"]),
+                         {"hola": 2, "mundo": 1})
+
+    def test_archivo_inexistente(self):
+        """
+        Verifica que un archivo inexistente no produce palabras.
+        """
+        ruta = os.path.join(self.temp_dir, "no_existe.txt")
+        self.assertEqual(leer_palabras_desde_archivo(ruta), [])
+        self.assertEqual(contar_palabras_desde_archivo(ruta), (Counter(), 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,72 +1,674 @@
 """
-Este módulo lee un archivo de texto, cuenta la frecuencia de cada palabra
+Este módulo lee uno o varios archivos de texto, cuenta la frecuencia de cada palabra
 y guarda los resultados en un archivo de salida llamado WordCountResults.txt.
+Opcionalmente cuenta en paralelo, reporta n-gramas, construye y consulta un
+índice invertido (indice_invertido.py) o acumula los conteos en un almacén
+SQLite persistente (almacen_conteos.py).
 """
 
+import argparse
+import heapq
+import os
+import re
+import sqlite3
 import sys
-import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 
-def leer_palabras_desde_archivo(ruta_archivo):
+from comun.archivos import dividir_en_rangos, expandir_rutas
+from comun.instrumentacion import Instrumentacion, agregar_argumentos
+from almacen_conteos import AlmacenConteos, resumir_archivo
+from indice_invertido import ConstructorIndice, LectorIndice, leer_linea
+from ngramas import MODOS_NGRAMAS, ContadorNgramas
+
+TAMANO_BLOQUE = 1 << 20
+TAMANO_MINIMO_RANGO = 1 << 22
+ESPACIOS_ASCII = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+FILAS_POR_ESCRITURA = 4096
+TAMANO_BUFFER_SALIDA = 1 << 20
+ENCABEZADO_RESULTADOS = "Palabra\t\tFrecuencia\n" + "-" * 30 + "\n"
+ORDENES = ("aparicion", "frecuencia", "alfabetico")
+TAMANO_CACHE_NORMALIZACION = 1 << 14
+
+def clase_de_marcas_combinantes():
+    """
+    Devuelve el contenido de una clase de caracteres de expresión regular con las
+    marcas combinantes (categorías Mn, Mc y Me) del plano multilingüe básico.
+    El \\w de re no las incluye, así que sin ellas "cancio\\u0301n" (con el
+    acento combinante) o "हिंदी" se partirían en varias palabras.
+    """
+    rangos = []
+    inicio = None
+    for codigo in range(0x10001):
+        es_marca = codigo < 0x10000 and unicodedata.category(chr(codigo))[0] == "M"
+        if es_marca and inicio is None:
+            inicio = codigo
+        elif not es_marca and inicio is not None:
+            rangos.append(f"\\u{inicio:04x}-\\u{codigo - 1:04x}")
+            inicio = None
+    return "".join(rangos)
+
+MARCAS_COMBINANTES = clase_de_marcas_combinantes()
+PATRON_PALABRA = re.compile(
+    rf"[^\W_]+(?:[{MARCAS_COMBINANTES}]+[^\W_]*)*"
+    rf"(?:[-'’][^\W_]+(?:[{MARCAS_COMBINANTES}]+[^\W_]*)*)*"
+)
+PATRON_ESPACIOS = re.compile(r"\S+")
+
+def ultimo_espacio(datos):
+    """
+    Devuelve la posición del último espacio en blanco ASCII de los bytes dados, o -1.
+    En UTF-8 estos bytes nunca forman parte de un carácter multibyte, así que
+    cortar después de uno no parte palabras ni caracteres.
+    """
+    return max(datos.rfind(espacio) for espacio in ESPACIOS_ASCII)
+
+def primer_espacio(datos):
+    """Devuelve la posición del primer espacio en blanco ASCII de los bytes dados, o -1."""
+    posiciones = [datos.find(espacio) for espacio in ESPACIOS_ASCII]
+    return min((posicion for posicion in posiciones if posicion != -1), default=-1)
+
+def iterar_bloques_de_texto(ruta_archivo, inicio=0, fin=None):
+    """
+    Genera el texto del rango de bytes [inicio, fin) del archivo (por omisión,
+    todo el archivo) en bloques de unos TAMANO_BLOQUE bytes decodificados como UTF-8.
+    Cada bloque termina en un espacio en blanco (o en el final del rango), así
+    que ninguna palabra queda partida entre dos bloques.
+    """
+    with open(ruta_archivo, 'rb') as archivo:
+        archivo.seek(inicio)
+        restante = None if fin is None else fin - inicio
+        resto = b""
+        while True:
+            tamano = TAMANO_BLOQUE if restante is None else min(TAMANO_BLOQUE, restante)
+            datos = archivo.read(tamano) if tamano > 0 else b""
+            if not datos:
+                break
+            if restante is not None:
+                restante -= len(datos)
+            datos = resto + datos
+            corte = ultimo_espacio(datos) + 1
+            if corte == 0:
+                resto = datos
+                continue
+            resto = datos[corte:]
+            yield datos[:corte].decode('utf-8')
+        if resto:
+            yield resto.decode('utf-8')
+
+def contar_por_espacios(texto, frecuencias):
+    """
+    Tokenizador "espacios": suma a frecuencias las palabras del bloque separadas
+    por espacios en blanco. El bloque se pasa a minúsculas de una sola vez.
+    Devuelve la cantidad de palabras del bloque.
+    """
+    palabras = texto.lower().split()
+    frecuencias.update(palabras)
+    return len(palabras)
+
+@lru_cache(maxsize=TAMANO_CACHE_NORMALIZACION)
+def normalizar_palabra(palabra):
+    """
+    Normaliza una forma de palabra con casefold() y NFC. Las formas más usadas
+    quedan en una caché LRU y no se vuelven a normalizar.
+    """
+    return unicodedata.normalize("NFC", palabra.casefold())
+
+def contar_por_palabras(texto, frecuencias):
+    """
+    Tokenizador "palabras": extrae las palabras del bloque con PATRON_PALABRA
+    (letras y dígitos con sus marcas combinantes, y apóstrofos o guiones
+    internos), de modo que la puntuación no forma parte de ellas. Las formas
+    crudas se cuentan primero y cada forma distinta se normaliza una sola vez por
+    bloque. Devuelve la cantidad de palabras del bloque.
+    """
+    crudas = Counter(PATRON_PALABRA.findall(texto))
+    for cruda, conteo in crudas.items():
+        frecuencias[normalizar_palabra(cruda)] += conteo
+    return crudas.total()
+
+def tokenizar_bloque(texto, tokenizador="espacios"):
+    """
+    Devuelve, en orden, la lista de términos normalizados del bloque: los mismos
+    que cuenta el tokenizador indicado de TOKENIZADORES. Se usa cuando además de
+    las frecuencias hace falta la secuencia, como para los n-gramas.
     """
-    Lee palabras desde un archivo y las almacena en una lista.
+    if tokenizador == "espacios":
+        return texto.lower().split()
+    return list(map(normalizar_palabra, PATRON_PALABRA.findall(texto)))
+
+TOKENIZADORES = {
+    "espacios": contar_por_espacios,
+    "palabras": contar_por_palabras,
+}
+PATRONES_DE_TOKENIZADOR = {
+    "espacios": (PATRON_ESPACIOS, str.lower),
+    "palabras": (PATRON_PALABRA, normalizar_palabra),
+}
+
+def normalizar_termino(texto, tokenizador="espacios"):
+    """Normaliza un término de consulta igual que lo hace el tokenizador indicado."""
+    return PATRONES_DE_TOKENIZADOR[tokenizador][1](texto)
+
+def iterar_terminos_de_linea(linea, tokenizador="espacios"):
+    """
+    Genera los términos normalizados de una línea con su desplazamiento en bytes
+    UTF-8 dentro de ella. Produce los mismos términos que TOKENIZADORES.
+    """
+    patron, normalizar = PATRONES_DE_TOKENIZADOR[tokenizador]
+    if linea.isascii():
+        for coincidencia in patron.finditer(linea):
+            yield normalizar(coincidencia.group()), coincidencia.start()
+        return
+    posicion_previa = bytes_previos = 0
+    for coincidencia in patron.finditer(linea):
+        inicio = coincidencia.start()
+        bytes_previos += len(linea[posicion_previa:inicio].encode("utf-8"))
+        posicion_previa = inicio
+        yield normalizar(coincidencia.group()), bytes_previos
+
+def indexar_archivos(rutas, constructor, tokenizador="espacios", ngramas=None):
+    """
+    Cuenta las palabras de los archivos línea por línea y, en la misma pasada,
+    registra en un ConstructorIndice el documento, la línea (desde 1) y el
+    desplazamiento en bytes de cada aparición. Si se pasa un ContadorNgramas,
+    también cuenta los n-gramas de cada archivo. Devuelve las frecuencias y el
+    total de palabras, iguales a las de contar_palabras_en_archivos().
+    """
+    frecuencias = Counter()
+    total = 0
+    for ruta in rutas:
+        try:
+            archivo = open(ruta, 'rb')  # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            print(f"Error: No se encontró el archivo {ruta}.")
+            continue
+        documento = constructor.agregar_documento(ruta)
+        inicio_linea = 0
+        if ngramas is not None:
+            ngramas.reiniciar_ventana()
+        with archivo:
+            for numero_linea, crudo in enumerate(archivo, start=1):
+                terminos = []
+                for termino, posicion in iterar_terminos_de_linea(
+                        crudo.decode('utf-8'), tokenizador):
+                    frecuencias[termino] += 1
+                    constructor.agregar(termino, documento, numero_linea,
+                                        inicio_linea + posicion)
+                    terminos.append(termino)
+                total += len(terminos)
+                if ngramas is not None:
+                    ngramas.agregar_terminos(terminos)
+                inicio_linea += len(crudo)
+    return frecuencias, total
+
+def consultar_indice(ruta_indice, consultas):
+    """
+    Muestra, para cada consulta, cuántas veces aparece el término en el índice y
+    cada aparición como "ruta:línea:byte: texto de la línea". Las consultas se
+    normalizan con el tokenizador con que se construyó el índice. Si un documento
+    ya no se puede leer, se indica en cada aparición y se sigue con las demás.
+    """
+    with LectorIndice(ruta_indice) as indice:
+        for consulta in consultas:
+            termino = normalizar_termino(consulta, indice.tokenizador)
+            apariciones = indice.buscar(termino)
+            print(f"{termino}: {len(apariciones)} apariciones")
+            for ruta, linea, desplazamiento in apariciones:
+                try:
+                    texto = leer_linea(ruta, desplazamiento)
+                except OSError as error:
+                    texto = f"(Error: No se pudo leer el documento: {error.strerror}.)"
+                print(f"{ruta}:{linea}:{desplazamiento}: {texto}")
+
+def leer_palabras_desde_archivo(ruta_archivo, tokenizador="espacios"):
+    """
+    Lee en flujo las palabras de un archivo y las devuelve en una lista, tal como
+    aparecen (sin normalizar), separadas con el patrón del tokenizador indicado.
     Maneja posibles errores si el archivo no existe.
+    Para contar archivos grandes conviene contar_palabras_desde_archivo(), que no
+    guarda la lista.
     """
+    patron = PATRONES_DE_TOKENIZADOR[tokenizador][0]
     palabras = []
     try:
-        with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
-            for linea in archivo:
-                palabras.extend(linea.strip().split())
+        for texto in iterar_bloques_de_texto(ruta_archivo):
+            palabras.extend(patron.findall(texto))
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo {ruta_archivo}.")
         return []
     return palabras
 
-def contar_frecuencia_palabras(palabras):
+def contar_frecuencia_palabras(palabras, tokenizador="espacios"):
+    """
+    Cuenta la frecuencia de cada palabra en la lista dada, normalizada como lo
+    hace el tokenizador indicado (minúsculas para "espacios"; casefold() y NFC
+    para "palabras"). Devuelve un Counter en orden de primera aparición.
+    """
+    return Counter(map(PATRONES_DE_TOKENIZADOR[tokenizador][1], palabras))
+
+def contar_palabras_desde_archivo(ruta_archivo, tokenizador="espacios", ngramas=None):
+    """
+    Cuenta en flujo las palabras de un archivo, bloque por bloque, sin guardar la
+    lista de palabras, con el tokenizador indicado de TOKENIZADORES. Si se pasa
+    un ContadorNgramas, le entrega los términos de cada bloque en la misma pasada.
+    Devuelve las frecuencias (en orden de primera aparición) y el total de palabras.
+    Maneja posibles errores si el archivo no existe.
+    """
+    contar_bloque = TOKENIZADORES[tokenizador]
+    frecuencias = Counter()
+    total = 0
+    if ngramas is not None:
+        ngramas.reiniciar_ventana()
+    try:
+        for texto in iterar_bloques_de_texto(ruta_archivo):
+            if ngramas is None:
+                total += contar_bloque(texto, frecuencias)
+                continue
+            terminos = tokenizar_bloque(texto, tokenizador)
+            frecuencias.update(terminos)
+            ngramas.agregar_terminos(terminos)
+            total += len(terminos)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {ruta_archivo}.")
+        return Counter(), 0
+    return frecuencias, total
+
+def contar_palabras_en_archivos(rutas, tokenizador="espacios", ngramas=None):
     """
-    Cuenta la frecuencia de cada palabra en la lista dada.
-    Convierte las palabras a minúsculas para un conteo uniforme.
+    Cuenta uno tras otro los archivos indicados como un solo corpus.
+    Devuelve las frecuencias combinadas y el total de palabras.
     """
-    frecuencias = {}
-    for palabra in palabras:
-        palabra = palabra.lower()
-        if palabra not in frecuencias:
-            frecuencias[palabra] = 1
+    frecuencias = Counter()
+    total = 0
+    for ruta in rutas:
+        parciales, cantidad = contar_palabras_desde_archivo(ruta, tokenizador, ngramas)
+        frecuencias.update(parciales)
+        total += cantidad
+    return frecuencias, total
+
+def actualizar_almacen(almacen, rutas, tokenizador="espacios"):
+    """
+    Registra los archivos en un AlmacenConteos contando solo lo que cambió desde
+    la última vez: los archivos con la misma huella se saltan; si un archivo solo
+    creció y lo registrado terminaba en un espacio en blanco, se cuenta solo el
+    rango agregado; si no, se cuenta completo y reemplaza a sus conteos previos.
+    Devuelve cuántos archivos hubo de cada tipo ("nuevos", "ampliados",
+    "recontados" y "sin_cambios") y el total de palabras contadas.
+    """
+    resumen = Counter()
+    total = 0
+    for ruta in rutas:
+        clave = os.path.abspath(ruta)
+        previo = almacen.archivo(clave)
+        try:
+            tamano, huella, huella_previa, ultimo_octeto = resumir_archivo(
+                ruta, previo["tamano"] if previo else None
+            )
+        except FileNotFoundError:
+            print(f"Error: No se encontró el archivo {ruta}.")
+            continue
+        if previo is not None and huella == previo["huella"]:
+            resumen["sin_cambios"] += 1
+            continue
+        ampliado = (
+            previo is not None and huella_previa == previo["huella"]
+            and (previo["tamano"] == 0 or previo["ultimo_octeto"] in ESPACIOS_ASCII)
+        )
+        if ampliado:
+            frecuencias, cantidad = contar_rango(ruta, previo["tamano"], tamano, tokenizador)
+            resumen["ampliados"] += 1
         else:
-            frecuencias[palabra] += 1
+            frecuencias, cantidad = contar_palabras_desde_archivo(ruta, tokenizador)
+            resumen["nuevos" if previo is None else "recontados"] += 1
+        almacen.registrar(clave, {
+            "tamano": tamano, "huella": huella, "ultimo_octeto": ultimo_octeto,
+            "palabras": cantidad,
+        }, frecuencias, ampliar=ampliado)
+        total += cantidad
+    return resumen, total
+
+def contar_rango(ruta_archivo, inicio, fin, tokenizador="espacios"):
+    """
+    Tarea de un proceso (fase map): cuenta las palabras del rango de bytes
+    [inicio, fin). Devuelve las frecuencias del rango y su total de palabras.
+    """
+    contar_bloque = TOKENIZADORES[tokenizador]
+    frecuencias = Counter()
+    total = 0
+    for texto in iterar_bloques_de_texto(ruta_archivo, inicio, fin):
+        total += contar_bloque(texto, frecuencias)
+    return frecuencias, total
+
+def fusionar_conteos(izquierda, derecha):
+    """
+    Suma a `izquierda` los conteos de `derecha` y la devuelve. Las palabras nuevas
+    quedan después de las existentes, así que el orden de primera aparición se
+    conserva si `derecha` viene después en el corpus.
+    """
+    izquierda.update(derecha)
+    return izquierda
+
+def reducir_conteos(parciales):
+    """
+    Fase reduce: fusiona en este proceso los conteos parciales en el orden del
+    corpus, de izquierda a derecha. Fusionar en los procesos del ejecutor obligaría a
+    serializar cada pareja de conteos de ida y vuelta, lo que cuesta más que
+    sumarlos aquí.
+    """
+    frecuencias = Counter()
+    for parciales_rango in parciales:
+        fusionar_conteos(frecuencias, parciales_rango)
     return frecuencias
 
-def main():
+def contar_palabras_en_paralelo(rutas, procesos=None, instrumentacion=None,
+                                tokenizador="espacios"):
     """
-    Función principal del programa.
-    Lee el archivo, cuenta la frecuencia de las palabras
-    y muestra los resultados en la pantalla y en un archivo de salida.
+    Cuenta los archivos como un solo corpus con map-reduce en un ProcessPoolExecutor.
+    Cada archivo se divide en un rango por cada TAMANO_MINIMO_RANGO bytes, hasta uno
+    por proceso; los rangos se cuentan en paralelo y los conteos parciales se
+    combinan en este proceso con reducir_conteos(). Devuelve las frecuencias y el
+    total de palabras.
     """
-    if len(sys.argv) != 2:
-        print("Uso: python word_count.py archivo_con_datos.txt")
-        return
+    procesos = procesos or os.cpu_count() or 1
+    rangos = []
+    for ruta in rutas:
+        try:
+            tamano = os.path.getsize(ruta)
+        except FileNotFoundError:
+            print(f"Error: No se encontró el archivo {ruta}.")
+            continue
+        partes = max(1, min(procesos, tamano // TAMANO_MINIMO_RANGO))
+        rangos.extend(
+            (ruta, inicio, fin)
+            for inicio, fin in dividir_en_rangos(ruta, partes, primer_espacio)
+        )
+    if instrumentacion is None:
+        instrumentacion = Instrumentacion("word_count")
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        with instrumentacion.fase("lectura_y_conteo"):
+            tareas = [
+                ejecutor.submit(contar_rango, *rango, tokenizador) for rango in rangos
+            ]
+            resultados = [tarea.result() for tarea in tareas]
+    with instrumentacion.fase("reduccion"):
+        frecuencias = reducir_conteos(parciales for parciales, _ in resultados)
+    return frecuencias, sum(total for _, total in resultados)
 
-    ruta_archivo = sys.argv[1]
-    tiempo_inicio = time.time()
+def seleccionar_palabras(frecuencias, top=0, orden="aparicion"):
+    """
+    Devuelve las filas (palabra, frecuencia) del reporte en el orden pedido:
+    "aparicion" (orden de primera aparición), "frecuencia" (de mayor a menor) o
+    "alfabetico". Con top > 0 solo se conservan las `top` palabras más frecuentes,
+    elegidas con heapq.nlargest() en O(V log K) sin ordenar todo el vocabulario.
+    Los empates de frecuencia se resuelven por orden de primera aparición.
+    """
+    if top > 0:
+        filas = heapq.nlargest(top, frecuencias.items(), key=itemgetter(1))
+        if orden == "aparicion":
+            elegidas = {palabra for palabra, _ in filas}
+            filas = [fila for fila in frecuencias.items() if fila[0] in elegidas]
+    elif orden == "frecuencia":
+        filas = sorted(frecuencias.items(), key=itemgetter(1), reverse=True)
+    else:
+        filas = frecuencias.items()
+    if orden == "alfabetico":
+        filas = sorted(filas, key=itemgetter(0))
+    return filas
 
-    palabras = leer_palabras_desde_archivo(ruta_archivo)
-    if not palabras:
-        print("No hay palabras válidas para procesar.")
-        return
+def escribir_reporte(filas, destinos):
+    """
+    Escribe en cada destino el encabezado y las filas (palabra, frecuencia) del
+    reporte, de FILAS_POR_ESCRITURA en FILAS_POR_ESCRITURA, sin armar el texto
+    completo en memoria.
+    """
+    for destino in destinos:
+        destino.write(ENCABEZADO_RESULTADOS)
+    escribir_lineas(
+        (f"{palabra}\t\t{frecuencia}\n" for palabra, frecuencia in filas), destinos
+    )
+
+def escribir_ngramas(ngramas, filas, destinos):
+    """
+    Escribe en cada destino la sección de n-gramas del reporte con las filas
+    (n-grama, conteo, error) de ContadorNgramas.top(). Si los conteos son
+    aproximados, cada fila indica su cota de error.
+    """
+    modo = "aproximado" if ngramas.aproximado else "exacto"
+    encabezado = f"\n{ngramas.nombre()} ({modo})\t\tFrecuencia\n" + "-" * 30 + "\n"
+    for destino in destinos:
+        destino.write(encabezado)
+    if ngramas.aproximado:
+        lineas = (f"{ngrama}\t\t{conteo} (error ≤ {error})\n" for ngrama, conteo, error in filas)
+    else:
+        lineas = (f"{ngrama}\t\t{conteo}\n" for ngrama, conteo, _ in filas)
+    escribir_lineas(lineas, destinos)
+
+def escribir_lineas(lineas, destinos):
+    """Escribe en cada destino las líneas dadas, de FILAS_POR_ESCRITURA en FILAS_POR_ESCRITURA."""
+    while True:
+        texto = "".join(islice(lineas, FILAS_POR_ESCRITURA))
+        if not texto:
+            break
+        for destino in destinos:
+            destino.write(texto)
+
+def crear_parser():
+    """Crea el analizador de la línea de comandos del programa."""
+    parser = argparse.ArgumentParser(
+        prog="word_count.py",
+        description="Cuenta la frecuencia de cada palabra de un archivo de texto."
+    )
+    parser.add_argument(
+        "archivos", nargs="*",
+        help="archivo de texto con las palabras; varios archivos o un patrón glob se "
+             "cuentan como un solo corpus"
+    )
+    parser.add_argument(
+        "--paralelo", action="store_true",
+        help="cuenta con map-reduce en un grupo de procesos, dividiendo los archivos "
+             "grandes en rangos de bytes"
+    )
+    parser.add_argument(
+        "--procesos", type=int, default=None,
+        help="número de procesos del modo paralelo (por omisión, uno por núcleo)"
+    )
+    parser.add_argument(
+        "--tokenizador", choices=tuple(TOKENIZADORES), default="espacios",
+        help="'espacios' separa por espacios en blanco; 'palabras' descarta la "
+             "puntuación y normaliza con casefold y NFC"
+    )
+    parser.add_argument(
+        "--indice", metavar="ARCHIVO",
+        help="construye un índice invertido de las apariciones en ARCHIVO o, con "
+             "--buscar, lo consulta"
+    )
+    parser.add_argument(
+        "--buscar", action="append", default=[], metavar="TERMINO",
+        help="muestra las apariciones del término según el índice de --indice "
+             "(se puede repetir)"
+    )
+    parser.add_argument(
+        "--almacen", metavar="ARCHIVO",
+        help="acumula los conteos en la base SQLite ARCHIVO, contando solo los "
+             "archivos nuevos o modificados, y reporta el corpus acumulado"
+    )
+    parser.add_argument(
+        "--top", type=int, default=0, metavar="K",
+        help="reporta solo las K palabras (y los K n-gramas) más frecuentes"
+    )
+    parser.add_argument(
+        "--orden", choices=ORDENES, default=None,
+        help="orden de las filas (por omisión, de aparición; con --top, por frecuencia)"
+    )
+    parser.add_argument(
+        "--ngramas", type=int, default=0, metavar="N",
+        help="cuenta también los n-gramas de N términos consecutivos (2 para bigramas)"
+    )
+    parser.add_argument(
+        "--modo-ngramas", choices=MODOS_NGRAMAS, default="auto",
+        help="'exacto' guarda todos los n-gramas; 'aproximado' usa un resumen "
+             "Space-Saving de memoria acotada; 'auto' pasa de uno a otro al superar "
+             "--umbral-ngramas n-gramas distintos"
+    )
+    parser.add_argument(
+        "--capacidad-ngramas", type=int, default=10_000, metavar="K",
+        help="contadores del resumen Space-Saving de n-gramas"
+    )
+    parser.add_argument(
+        "--umbral-ngramas", type=int, default=1_000_000, metavar="N",
+        help="n-gramas distintos que se cuentan de forma exacta en el modo 'auto'"
+    )
+    parser.add_argument(
+        "--silencioso", action="store_true",
+        help="no muestra el reporte en pantalla; solo lo escribe en el archivo"
+    )
+    agregar_argumentos(parser)
+    return parser
 
-    frecuencias = contar_frecuencia_palabras(palabras)
-    resultados = "Palabra\t\tFrecuencia\n"
-    resultados += "-" * 30 + "\n"
+def validar_argumentos(parser, argumentos):
+    """Termina con un error de uso si la combinación de opciones no es válida."""
+    if argumentos.buscar and not argumentos.indice:
+        parser.error("--buscar requiere --indice")
+    if not argumentos.buscar and not argumentos.archivos and not argumentos.almacen:
+        parser.error("se requiere al menos un archivo")
+    if argumentos.indice and argumentos.paralelo and not argumentos.buscar:
+        parser.error("--indice no es compatible con --paralelo")
+    if argumentos.ngramas and argumentos.ngramas < 2:
+        parser.error("--ngramas debe ser al menos 2")
+    if argumentos.ngramas and argumentos.paralelo:
+        parser.error("--ngramas no es compatible con --paralelo")
+    if argumentos.capacidad_ngramas < 1:
+        parser.error("--capacidad-ngramas debe ser positiva")
+    if argumentos.almacen and (argumentos.indice or argumentos.paralelo or argumentos.ngramas):
+        parser.error("--almacen no es compatible con --indice, --paralelo ni --ngramas")
 
-    for palabra, frecuencia in frecuencias.items():
-        resultados += f"{palabra}\t\t{frecuencia}\n"
+def crear_contador_ngramas(argumentos):
+    """Devuelve el ContadorNgramas pedido con --ngramas, o None si no se pidió."""
+    if not argumentos.ngramas:
+        return None
+    return ContadorNgramas(
+        argumentos.ngramas, argumentos.modo_ngramas,
+        argumentos.capacidad_ngramas, argumentos.umbral_ngramas
+    )
+
+def contar_con_almacen(argumentos, rutas, instrumentacion):
+    """
+    Actualiza el almacén de --almacen con los archivos y muestra el resumen.
+    Devuelve las frecuencias y el total de palabras de todo el corpus registrado,
+    o None si el almacén no se pudo abrir o actualizar.
+    """
+    with instrumentacion.fase("lectura_y_conteo"):
+        try:
+            with AlmacenConteos(argumentos.almacen, argumentos.tokenizador) as almacen:
+                resumen, total = actualizar_almacen(almacen, rutas, argumentos.tokenizador)
+                frecuencias = almacen.frecuencias()
+                archivos = len(almacen)
+        except (sqlite3.Error, ValueError) as error:
+            print(f"Error: {error}")
+            return None
+    print(
+        f"Almacén de conteos: {resumen['nuevos']} nuevos, {resumen['ampliados']} "
+        f"ampliados, {resumen['recontados']} recontados y {resumen['sin_cambios']} "
+        f"sin cambios; {archivos} archivos en {argumentos.almacen}"
+    )
+    return frecuencias, total
 
-    tiempo_transcurrido = time.time() - tiempo_inicio
-    resultados += f"\nTiempo transcurrido: {tiempo_transcurrido:.5f} segundos"
+def contar_e_indexar(argumentos, rutas, ngramas, instrumentacion):
+    """
+    Cuenta las palabras de los archivos y construye en la misma pasada el índice
+    invertido de --indice, que se guarda si hay alguna palabra.
+    Devuelve las frecuencias y el total de palabras.
+    """
+    constructor = ConstructorIndice(argumentos.tokenizador)
+    with instrumentacion.fase("lectura_y_conteo"):
+        frecuencias, total = indexar_archivos(
+            rutas, constructor, argumentos.tokenizador, ngramas
+        )
+    if frecuencias:
+        with instrumentacion.fase("indice"):
+            terminos = constructor.guardar(argumentos.indice)
+        print(f"Índice invertido: {terminos} términos en {argumentos.indice}")
+    return frecuencias, total
 
-    print(resultados)
+def contar_corpus(argumentos, rutas, ngramas, instrumentacion):
+    """
+    Cuenta las palabras de los archivos en el modo elegido: almacén persistente,
+    índice invertido, paralelo o secuencial. Devuelve las frecuencias y el total
+    de palabras, o None si hubo un error que ya se informó.
+    """
+    if argumentos.almacen:
+        return contar_con_almacen(argumentos, rutas, instrumentacion)
+    if argumentos.indice:
+        return contar_e_indexar(argumentos, rutas, ngramas, instrumentacion)
+    if argumentos.paralelo:
+        return contar_palabras_en_paralelo(
+            rutas, argumentos.procesos, instrumentacion, argumentos.tokenizador
+        )
+    with instrumentacion.fase("lectura_y_conteo"):
+        return contar_palabras_en_archivos(rutas, argumentos.tokenizador, ngramas)
 
-    with open("WordCountResults.txt", "w", encoding='utf-8') as archivo_resultados:
-        archivo_resultados.write(resultados)
+def escribir_resultados(argumentos, frecuencias, ngramas, instrumentacion):
+    """
+    Selecciona las filas del reporte según --top y --orden y las escribe, con la
+    sección de n-gramas si se pidió, en WordCountResults.txt y en la pantalla.
+    """
+    orden = argumentos.orden or ("frecuencia" if argumentos.top > 0 else "aparicion")
+    with instrumentacion.fase("seleccion"):
+        filas = seleccionar_palabras(frecuencias, argumentos.top, orden)
+        filas_ngramas = ngramas.top(argumentos.top) if ngramas is not None else []
+
+    with instrumentacion.fase("salida"):
+        with open("WordCountResults.txt", "w", encoding='utf-8',
+                  buffering=TAMANO_BUFFER_SALIDA) as archivo_resultados:
+            destinos = [archivo_resultados]
+            if not argumentos.silencioso:
+                destinos.append(sys.stdout)
+            escribir_reporte(filas, destinos)
+            if ngramas is not None:
+                escribir_ngramas(ngramas, filas_ngramas, destinos)
+            tiempo_transcurrido = instrumentacion.transcurrido()
+            pie = f"\nTiempo transcurrido: {tiempo_transcurrido:.5f} segundos"
+            archivo_resultados.write(pie)
+            if not argumentos.silencioso:
+                print(pie)
+
+def main():
+    """
+    Función principal del programa.
+    Lee los archivos, cuenta la frecuencia de las palabras
+    y muestra los resultados en la pantalla y en un archivo de salida.
+    """
+    parser = crear_parser()
+    argumentos = parser.parse_args()
+    validar_argumentos(parser, argumentos)
+    instrumentacion = Instrumentacion.desde_argumentos("word_count", argumentos)
+
+    if argumentos.buscar:
+        with instrumentacion.fase("consulta"):
+            try:
+                consultar_indice(argumentos.indice, argumentos.buscar)
+            except (OSError, ValueError) as error:
+                print(f"Error: {error}")
+        instrumentacion.terminar()
+        return
+
+    ngramas = crear_contador_ngramas(argumentos)
+    conteo = contar_corpus(
+        argumentos, expandir_rutas(argumentos.archivos), ngramas, instrumentacion
+    )
+    if conteo is not None:
+        frecuencias, total = conteo
+        instrumentacion.contar(total)
+        if frecuencias:
+            escribir_resultados(argumentos, frecuencias, ngramas, instrumentacion)
+        else:
+            print("No hay palabras válidas para procesar.")
+    instrumentacion.terminar()
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,9 @@
+import argparse
 import json
 import sys
-import time
+
+from comun.instrumentacion import (
+    Instrumentacion, agregar_argumentos)
 
 
 def cargar_archivo_json(ruta_archivo):
@@ -78,36 +81,44 @@ def escribir_r_en_archivo(ventas_totales, errores, tiempo_transcurrido):
 
 
 def main():
-    if len(sys.argv) != 3:
-        print("computeSales.py catalogoPrecios.json registroVentas.json")
-        sys.exit(1)
-
-    archivo_catalogo_precios = sys.argv[1]
-    archivo_registro_ventas = sys.argv[2]
-
-    catalogo_precios_data = cargar_archivo_json(archivo_catalogo_precios)
-    registro_ventas = cargar_archivo_json(archivo_registro_ventas)
+    parser = argparse.ArgumentParser(prog="computeSales.py")
+    parser.add_argument("catalogo_precios")
+    parser.add_argument("registro_ventas")
+    agregar_argumentos(parser)
+    argumentos = parser.parse_args()
+
+    instrumentacion = Instrumentacion.desde_argumentos(
+        "compute_sales", argumentos
+    )
 
-    catalogo_precios = {
-        item["title"]: item["price"] for item in catalogo_precios_data
-    }
+    with instrumentacion.fase("carga"):
+        catalogo_precios_data = cargar_archivo_json(
+            argumentos.catalogo_precios
+        )
+        registro_ventas = cargar_archivo_json(argumentos.registro_ventas)
 
-    tiempo_inicio = time.time()
+        catalogo_precios = {
+            item["title"]: item["price"] for item in catalogo_precios_data
+        }
 
-    ventas_totales, errores = calcular_ventas_totales(
-        catalogo_precios, registro_ventas
-    )
+    with instrumentacion.fase("calculo"):
+        ventas_totales, errores = calcular_ventas_totales(
+            catalogo_precios, registro_ventas
+        )
+    instrumentacion.contar(len(registro_ventas) - len(errores), len(errores))
 
-    tiempo_transcurrido = time.time() - tiempo_inicio
+    tiempo_transcurrido = instrumentacion.transcurrido()
 
-    print(f"Ventas Totales: ${ventas_totales:.2f}")
-    print(f"Tiempo de Ejecución: {tiempo_transcurrido:.2f} segundos")
-    if errores:
-        print("\nErrores:")
-        for error in errores:
-            print(f"- {error}")
+    with instrumentacion.fase("salida"):
+        print(f"Ventas Totales: ${ventas_totales:.2f}")
+        print(f"Tiempo de Ejecución: {tiempo_transcurrido:.2f} segundos")
+        if errores:
+            print("\nErrores:")
+            for error in errores:
+                print(f"- {error}")
 
-    escribir_r_en_archivo(ventas_totales, errores, tiempo_transcurrido)
+        escribir_r_en_archivo(ventas_totales, errores, tiempo_transcurrido)
+    instrumentacion.terminar()
 
 
 if __name__ == "__main__":
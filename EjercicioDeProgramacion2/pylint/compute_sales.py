@@ -4,9 +4,11 @@ El programa toma dos archivos JSON como entrada: uno con la lista de precios y o
 Los resultados se imprimen en la consola y se almacenan en un archivo de texto.
 """
 
+import argparse
 import json
 import sys
-import time
+
+from comun.instrumentacion import Instrumentacion, agregar_argumentos
 
 
 def cargar_archivo_json(ruta_archivo):
@@ -83,40 +85,47 @@ def escribir_resultados_en_archivo(ventas_totales, errores, tiempo_transcurrido)
 
 def main():
     """Función principal para cargar archivos, calcular ventas y mostrar resultados."""
-    if len(sys.argv) != 3:
-        print("Uso: python compute_sales.py catalogo_precios.json registro_ventas.json")
-        sys.exit(1)
-
-    archivo_catalogo_precios = sys.argv[1]
-    archivo_registro_ventas = sys.argv[2]
+    parser = argparse.ArgumentParser(
+        prog="compute_sales.py",
+        description="Calcula el total de ventas a partir de un catálogo de precios."
+    )
+    parser.add_argument("catalogo_precios", help="archivo JSON con la lista de precios")
+    parser.add_argument("registro_ventas", help="archivo JSON con el registro de ventas")
+    agregar_argumentos(parser)
+    argumentos = parser.parse_args()
+
+    # Iniciar medición del tiempo de ejecución, incluida la carga de los archivos
+    instrumentacion = Instrumentacion.desde_argumentos("compute_sales", argumentos)
 
     # Cargar archivos de entrada
-    catalogo_precios_data = cargar_archivo_json(archivo_catalogo_precios)
-    registro_ventas = cargar_archivo_json(archivo_registro_ventas)
-
-    # Convertir catálogo de precios en un diccionario para acceso rápido
-    catalogo_precios = {
-        item["title"]: item["price"] for item in catalogo_precios_data
-    }
+    with instrumentacion.fase("carga"):
+        catalogo_precios_data = cargar_archivo_json(argumentos.catalogo_precios)
+        registro_ventas = cargar_archivo_json(argumentos.registro_ventas)
 
-    # Iniciar medición del tiempo de ejecución
-    tiempo_inicio = time.time()
+        # Convertir catálogo de precios en un diccionario para acceso rápido
+        catalogo_precios = {
+            item["title"]: item["price"] for item in catalogo_precios_data
+        }
 
     # Calcular ventas totales y recopilar errores
-    ventas_totales, errores = calcular_ventas_totales(catalogo_precios, registro_ventas)
+    with instrumentacion.fase("calculo"):
+        ventas_totales, errores = calcular_ventas_totales(catalogo_precios, registro_ventas)
+    instrumentacion.contar(len(registro_ventas) - len(errores), len(errores))
 
     # Calcular tiempo transcurrido
-    tiempo_transcurrido = time.time() - tiempo_inicio
+    tiempo_transcurrido = instrumentacion.transcurrido()
 
     # Mostrar y guardar resultados
-    print(f"Ventas Totales: ${ventas_totales:.2f}")
-    print(f"Tiempo de Ejecución: {tiempo_transcurrido:.2f} segundos")
-    if errores:
-        print("\nErrores:")
-        for error in errores:
-            print(f"- {error}")
-
-    escribir_resultados_en_archivo(ventas_totales, errores, tiempo_transcurrido)
+    with instrumentacion.fase("salida"):
+        print(f"Ventas Totales: ${ventas_totales:.2f}")
+        print(f"Tiempo de Ejecución: {tiempo_transcurrido:.2f} segundos")
+        if errores:
+            print("\nErrores:")
+            for error in errores:
+                print(f"- {error}")
+
+        escribir_resultados_en_archivo(ventas_totales, errores, tiempo_transcurrido)
+    instrumentacion.terminar()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,518 @@
+"""
+Módulo: benchmark.py
+Descripción: Banco de pruebas de rendimiento reproducible para compute_statistics
+(Ejercicio1), convert_numbers (Ejercicio2) y word_count (Ejercicio3).
+
+Genera entradas sintéticas con la forma de los casos TC*.txt de cada ejercicio
+(limpias, con líneas inválidas o con muchos valores repetidos), mide por separado
+las fases de análisis, cálculo y salida de cada herramienta y la ejecución completa
+de su línea de comandos, y guarda el rendimiento y la memoria residente máxima en
+un archivo JSON que se puede comparar entre versiones. Cada medición se ejecuta
+en un subproceso propio para que la memoria y las importaciones no se mezclen.
+
+Uso:
+    python benchmarks/benchmark.py --tamanos 1e3 1e4 1e5 --salida resultados.json
+    python benchmarks/benchmark.py --herramientas palabras --formas limpia --tamanos 1e6
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VERSION_FORMATO = 1
+LINEAS_POR_ESCRITURA = 65536
+
+HERRAMIENTAS = {
+    "estadisticas": {
+        "directorio": "Ejercicio1",
+        "script": "compute_statistics.py",
+        "argumentos": ["--backend", "python"],
+    },
+    "conversion": {
+        "directorio": "Ejercicio2",
+        "script": "convert_numbers.py",
+        "argumentos": [],
+    },
+    "palabras": {
+        "directorio": "Ejercicio3",
+        "script": "word_count.py",
+        "argumentos": [],
+    },
+}
+FORMAS = ("limpia", "sucia", "duplicados")
+
+DATOS_INVALIDOS = ("ABA", "23,45", "11;54", "ll", "ABBA", "ERROR", "ABC", "ERR", "VAL", "")
+SIGNOS_PUNTUACION = (".", ",", ";", ":", "!", "?", "\"", "'", "(", ")")
+PROPORCION_SUCIA = 0.01
+VALORES_DISTINTOS_DUPLICADOS = 100
+
+
+def leer_tamano(texto):
+    """Convierte un tamaño como '1e6' o '250000' en un entero positivo."""
+    try:
+        tamano = int(float(texto))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"tamaño inválido: {texto!r}") from error
+    if tamano <= 0:
+        raise argparse.ArgumentTypeError(f"el tamaño debe ser positivo: {texto!r}")
+    return tamano
+
+
+def cargar_vocabulario():
+    """
+    Devuelve la lista de palabras distintas de los casos de prueba de Ejercicio3,
+    que sirve como vocabulario para generar textos sintéticos.
+    """
+    directorio = os.path.join(RAIZ, "Ejercicio3")
+    vocabulario = set()
+    for nombre in sorted(os.listdir(directorio)):
+        if nombre.startswith("TC") and nombre.endswith(".txt"):
+            with open(os.path.join(directorio, nombre), encoding="utf-8") as archivo:
+                vocabulario.update(archivo.read().split())
+    return sorted(vocabulario) or ["palabra"]
+
+
+def generar_linea_estadisticas(aleatorio, forma, repetidos):
+    """Genera una línea con el formato de Ejercicio1/TC*.txt."""
+    if forma == "duplicados":
+        return repetidos[aleatorio.randrange(len(repetidos))]
+    if forma == "sucia" and aleatorio.random() < PROPORCION_SUCIA:
+        return aleatorio.choice(DATOS_INVALIDOS)
+    if aleatorio.random() < 0.5:
+        return str(aleatorio.randint(0, 500))
+    return repr(aleatorio.uniform(-1e3, 1e3))
+
+
+def generar_linea_conversion(aleatorio, forma, repetidos):
+    """Genera una línea con el formato de Ejercicio2/TC*.txt."""
+    if forma == "duplicados":
+        return repetidos[aleatorio.randrange(len(repetidos))]
+    if forma == "sucia" and aleatorio.random() < PROPORCION_SUCIA:
+        return aleatorio.choice(DATOS_INVALIDOS)
+    return str(aleatorio.randint(-10_000_000, 10_000_000))
+
+
+def generar_linea_palabras(aleatorio, forma, repetidos):
+    """
+    Genera una línea de texto con el formato de Ejercicio3/TC*.txt: casi siempre
+    una palabra por línea y, de vez en cuando, varias. En la forma sucia se agregan
+    mayúsculas y signos de puntuación.
+    """
+    cantidad = 1 if aleatorio.random() < 0.9 else aleatorio.randint(2, 8)
+    palabras = [repetidos[aleatorio.randrange(len(repetidos))] for _ in range(cantidad)]
+    if forma == "sucia" and aleatorio.random() < 10 * PROPORCION_SUCIA:
+        palabras = [
+            palabra.capitalize() + aleatorio.choice(SIGNOS_PUNTUACION)
+            for palabra in palabras
+        ]
+    return " ".join(palabras)
+
+
+GENERADORES = {
+    "estadisticas": generar_linea_estadisticas,
+    "conversion": generar_linea_conversion,
+    "palabras": generar_linea_palabras,
+}
+
+
+def generar_entrada(herramienta, forma, tamano, ruta, semilla=0):
+    """
+    Escribe en ruta un archivo de `tamano` líneas para la herramienta y forma dadas.
+    La misma semilla produce siempre el mismo archivo.
+    """
+    aleatorio = random.Random(f"{semilla}-{herramienta}-{forma}")
+    if herramienta == "palabras":
+        vocabulario = cargar_vocabulario()
+        if forma == "duplicados":
+            repetidos = vocabulario[:VALORES_DISTINTOS_DUPLICADOS]
+        else:
+            repetidos = vocabulario
+    else:
+        repetidos = [
+            GENERADORES[herramienta](aleatorio, "limpia", None)
+            for _ in range(VALORES_DISTINTOS_DUPLICADOS)
+        ]
+    generar_linea = GENERADORES[herramienta]
+    temporal = ruta + ".parcial"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        restantes = tamano
+        while restantes:
+            lote = min(restantes, LINEAS_POR_ESCRITURA)
+            archivo.write("\n".join(
+                generar_linea(aleatorio, forma, repetidos) for _ in range(lote)
+            ))
+            archivo.write("\n")
+            restantes -= lote
+    os.replace(temporal, ruta)
+
+
+def obtener_entrada(directorio, herramienta, forma, tamano, semilla):
+    """
+    Devuelve la ruta de la entrada sintética pedida, generándola solo si todavía
+    no existe en el directorio de datos.
+    """
+    ruta = os.path.join(directorio, f"{herramienta}-{forma}-{tamano}-s{semilla}.txt")
+    if not os.path.exists(ruta):
+        generar_entrada(herramienta, forma, tamano, ruta, semilla)
+    return ruta
+
+
+def importar_herramienta(herramienta):
+    """Importa el módulo del script de la herramienta desde su directorio."""
+    datos = HERRAMIENTAS[herramienta]
+    sys.path.insert(0, os.path.join(RAIZ, datos["directorio"]))
+    return __import__(os.path.splitext(datos["script"])[0])
+
+
+@contextlib.contextmanager
+def cronometrar_generador(modulo, nombre, tiempos, fase):
+    """
+    Reemplaza temporalmente la función generadora `nombre` del módulo por una que
+    acumula en tiempos[fase] el tiempo de producir cada elemento. Así las funciones
+    de la herramienta que la usan se ejecutan sin cambios y el tiempo de análisis
+    de cada bloque se separa del resto.
+    """
+    original = getattr(modulo, nombre)
+
+    def cronometrada(*args, **kwargs):
+        iterador = iter(original(*args, **kwargs))
+        while True:
+            inicio = time.perf_counter()
+            try:
+                elemento = next(iterador)
+            except StopIteration:
+                return
+            finally:
+                tiempos[fase] += time.perf_counter() - inicio
+            yield elemento
+
+    setattr(modulo, nombre, cronometrada)
+    try:
+        yield
+    finally:
+        setattr(modulo, nombre, original)
+
+
+class DestinoCronometrado:
+    """Archivo de salida que acumula en tiempos[fase] el tiempo de cada write()."""
+
+    def __init__(self, archivo, tiempos, fase="salida"):
+        self.archivo = archivo
+        self.tiempos = tiempos
+        self.fase = fase
+
+    def write(self, texto):
+        """Escribe el texto en el archivo y suma el tiempo de la escritura."""
+        inicio = time.perf_counter()
+        self.archivo.write(texto)
+        self.tiempos[self.fase] += time.perf_counter() - inicio
+
+    def flush(self):
+        """Vacía el búfer del archivo y suma el tiempo de hacerlo."""
+        inicio = time.perf_counter()
+        self.archivo.flush()
+        self.tiempos[self.fase] += time.perf_counter() - inicio
+
+
+def nuevos_tiempos():
+    """Devuelve el diccionario de tiempos por fase, en cero."""
+    return dict.fromkeys(("analisis", "calculo", "salida"), 0.0)
+
+
+def fases_estadisticas(modulo, ruta_entrada, ruta_salida):
+    """
+    Ejecuta la ruta de main() con el backend de Python: acumular_archivo() agrega
+    cada bloque de iterar_bloques_de_numeros() al acumulador. El cálculo es el
+    tiempo de acumulación y de las estadísticas finales, sin el análisis.
+    """
+    tiempos = nuevos_tiempos()
+    inicio = time.perf_counter()
+    with cronometrar_generador(modulo, "iterar_bloques_de_numeros", tiempos, "analisis"):
+        acumulador, advertencias = modulo.acumular_archivo(ruta_entrada)
+    estadisticas = acumulador.estadisticas() if acumulador.cantidad else None
+    tiempos["calculo"] = time.perf_counter() - inicio - tiempos["analisis"]
+
+    inicio = time.perf_counter()
+    if estadisticas is not None:
+        with open(ruta_salida, "w", encoding="utf-8") as archivo:
+            archivo.write(modulo.formatear_resultados(estadisticas, 0.0))
+    tiempos["salida"] = time.perf_counter() - inicio
+    acumulador.cerrar()
+    return tiempos, acumulador.cantidad, len(advertencias)
+
+
+def fases_conversion(modulo, ruta_entrada, ruta_salida):
+    """
+    Ejecuta la ruta de main(): escribir_conversiones() convierte y escribe cada
+    bloque de iterar_bloques_de_numeros() en un archivo con el búfer de la
+    herramienta. El cálculo es el tiempo restante tras el análisis y la escritura.
+    """
+    tiempos = nuevos_tiempos()
+    advertencias = []
+    inicio = time.perf_counter()
+    with cronometrar_generador(modulo, "iterar_bloques_de_numeros", tiempos, "analisis"):
+        with open(ruta_salida, "w", encoding="utf-8",
+                  buffering=modulo.TAMANO_BUFFER_SALIDA) as archivo:
+            cantidad = modulo.escribir_conversiones(
+                ruta_entrada, [DestinoCronometrado(archivo, tiempos)], advertencias
+            )
+            inicio_cierre = time.perf_counter()
+        tiempos["salida"] += time.perf_counter() - inicio_cierre
+    tiempos["calculo"] = (
+        time.perf_counter() - inicio - tiempos["analisis"] - tiempos["salida"]
+    )
+    return tiempos, cantidad, len(advertencias)
+
+
+def fases_palabras(modulo, ruta_entrada, ruta_salida):
+    """
+    Ejecuta la ruta secuencial de main(): contar_palabras_en_archivos() cuenta cada
+    bloque de iterar_bloques_de_texto() en flujo, seleccionar_palabras() arma las
+    filas y escribir_reporte() las escribe por lotes.
+    """
+    tiempos = nuevos_tiempos()
+    inicio = time.perf_counter()
+    with cronometrar_generador(modulo, "iterar_bloques_de_texto", tiempos, "analisis"):
+        frecuencias, total = modulo.contar_palabras_en_archivos([ruta_entrada])
+    filas = modulo.seleccionar_palabras(frecuencias)
+    tiempos["calculo"] = time.perf_counter() - inicio - tiempos["analisis"]
+
+    inicio = time.perf_counter()
+    if frecuencias:
+        with open(ruta_salida, "w", encoding="utf-8",
+                  buffering=modulo.TAMANO_BUFFER_SALIDA) as archivo:
+            modulo.escribir_reporte(filas, [archivo])
+    tiempos["salida"] = time.perf_counter() - inicio
+    return tiempos, total, 0
+
+
+FASES = {
+    "estadisticas": fases_estadisticas,
+    "conversion": fases_conversion,
+    "palabras": fases_palabras,
+}
+
+
+def medir_fases(herramienta, ruta_entrada):
+    """
+    Mide las fases de una herramienta sobre un archivo dentro del proceso actual.
+    Devuelve un diccionario con los tiempos, los registros válidos e inválidos y
+    la memoria residente máxima del proceso en KiB.
+    """
+    modulo = importar_herramienta(herramienta)
+    descriptor, ruta_salida = tempfile.mkstemp(prefix="benchmark_", suffix=".txt")
+    os.close(descriptor)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            tiempos, registros, rechazados = FASES[herramienta](
+                modulo, ruta_entrada, ruta_salida
+            )
+    finally:
+        os.remove(ruta_salida)
+    return {
+        "fases": tiempos,
+        "registros": registros,
+        "rechazados": rechazados,
+        "rss_maximo_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def entorno_con_raiz():
+    """
+    Devuelve el entorno para los subprocesos con la raíz del repositorio al inicio
+    de PYTHONPATH, para que las herramientas importen comun aunque el paquete no
+    esté instalado.
+    """
+    entorno = dict(os.environ)
+    entorno["PYTHONPATH"] = os.pathsep.join(
+        ruta for ruta in (RAIZ, entorno.get("PYTHONPATH")) if ruta
+    )
+    return entorno
+
+
+def ejecutar_medido(comando, directorio_trabajo):
+    """
+    Ejecuta un comando y devuelve (segundos, memoria residente máxima en KiB, salida
+    estándar). La memoria se obtiene con wait4() para medir solo ese proceso hijo.
+    """
+    with tempfile.TemporaryFile() as salida, tempfile.TemporaryFile() as errores:
+        inicio = time.perf_counter()
+        with subprocess.Popen(
+            comando, cwd=directorio_trabajo, stdout=salida, stderr=errores,
+            env=entorno_con_raiz(),
+        ) as proceso:
+            _, estado, uso = os.wait4(proceso.pid, 0)
+            segundos = time.perf_counter() - inicio
+            proceso.returncode = os.waitstatus_to_exitcode(estado)
+        salida.seek(0)
+        errores.seek(0)
+        if proceso.returncode != 0:
+            raise RuntimeError(
+                f"El comando {' '.join(comando)} terminó con código "
+                f"{proceso.returncode}:\n{errores.read().decode('utf-8', 'replace')}"
+            )
+        return segundos, uso.ru_maxrss, salida.read().decode("utf-8")
+
+
+def medir_caso(herramienta, ruta_entrada, repeticiones):
+    """
+    Mide un caso completo: las fases en un subproceso de este módulo y la línea de
+    comandos real de la herramienta en otro. De cada medición se conserva la
+    repetición más rápida.
+    """
+    datos = HERRAMIENTAS[herramienta]
+    mediciones_fases = []
+    mediciones_cli = []
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as directorio_trabajo:
+        for _ in range(repeticiones):
+            _, _, salida = ejecutar_medido(
+                [sys.executable, os.path.abspath(__file__), "--medir-fases",
+                 herramienta, ruta_entrada],
+                directorio_trabajo,
+            )
+            mediciones_fases.append(json.loads(salida))
+
+            segundos, rss, _ = ejecutar_medido(
+                [sys.executable, os.path.join(RAIZ, datos["directorio"], datos["script"]),
+                 ruta_entrada, *datos["argumentos"]],
+                directorio_trabajo,
+            )
+            mediciones_cli.append({"segundos": segundos, "rss_maximo_kib": rss})
+    mejor_fases = min(mediciones_fases, key=lambda medicion: sum(medicion["fases"].values()))
+    mejor_cli = min(mediciones_cli, key=lambda medicion: medicion["segundos"])
+    return mejor_fases, mejor_cli
+
+
+def construir_resultado(caso, ruta_entrada, fases, cli):
+    """
+    Arma el registro JSON de un caso, dado como tupla (herramienta, forma, tamaño),
+    con sus tiempos y rendimientos.
+    """
+    herramienta, forma, tamano = caso
+    tamano_bytes = os.path.getsize(ruta_entrada)
+    total_fases = sum(fases["fases"].values())
+    return {
+        "herramienta": herramienta,
+        "forma": forma,
+        "lineas": tamano,
+        "bytes": tamano_bytes,
+        "registros": fases["registros"],
+        "rechazados": fases["rechazados"],
+        "fases_segundos": fases["fases"],
+        "total_fases_segundos": total_fases,
+        "registros_por_segundo": fases["registros"] / total_fases if total_fases else None,
+        "mb_por_segundo": tamano_bytes / 1e6 / total_fases if total_fases else None,
+        "rss_maximo_kib": fases["rss_maximo_kib"],
+        "cli": {
+            **cli,
+            "mb_por_segundo": tamano_bytes / 1e6 / cli["segundos"],
+        },
+    }
+
+
+def obtener_version_repositorio():
+    """Devuelve el commit actual del repositorio, o None si git no está disponible."""
+    try:
+        resultado = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=RAIZ, capture_output=True,
+            text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return resultado.stdout.strip()
+
+
+def main():
+    """
+    Función principal del programa.
+    Genera las entradas que falten, mide cada combinación de herramienta, forma y
+    tamaño y guarda los resultados en un archivo JSON.
+    """
+    parser = argparse.ArgumentParser(
+        description="Mide el rendimiento de las herramientas de los ejercicios."
+    )
+    parser.add_argument(
+        "--herramientas", nargs="+", choices=tuple(HERRAMIENTAS),
+        default=list(HERRAMIENTAS), help="herramientas a medir"
+    )
+    parser.add_argument(
+        "--formas", nargs="+", choices=FORMAS, default=list(FORMAS),
+        help="formas de entrada: limpia, sucia (con líneas inválidas) o duplicados"
+    )
+    parser.add_argument(
+        "--tamanos", nargs="+", type=leer_tamano, default=[1000, 10_000, 100_000],
+        help="cantidad de líneas de cada entrada, p. ej. 1e3 1e6 1e8"
+    )
+    parser.add_argument(
+        "--repeticiones", type=int, default=3,
+        help="repeticiones por caso; se conserva la más rápida"
+    )
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de los datos")
+    parser.add_argument(
+        "--datos", default=os.path.join(tempfile.gettempdir(), "benchmark_entradas"),
+        help="directorio donde se generan y reutilizan las entradas"
+    )
+    parser.add_argument(
+        "--salida", default="resultados_benchmark.json",
+        help="archivo JSON de resultados"
+    )
+    parser.add_argument("--medir-fases", nargs=2, metavar=("HERRAMIENTA", "ARCHIVO"),
+                        help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+
+    if argumentos.medir_fases:
+        herramienta, ruta_entrada = argumentos.medir_fases
+        print(json.dumps(medir_fases(herramienta, ruta_entrada)))
+        return
+
+    os.makedirs(argumentos.datos, exist_ok=True)
+    casos = []
+    for herramienta in argumentos.herramientas:
+        for forma in argumentos.formas:
+            for tamano in argumentos.tamanos:
+                ruta_entrada = obtener_entrada(
+                    argumentos.datos, herramienta, forma, tamano, argumentos.semilla
+                )
+                fases, cli = medir_caso(herramienta, ruta_entrada, argumentos.repeticiones)
+                caso = construir_resultado(
+                    (herramienta, forma, tamano), ruta_entrada, fases, cli
+                )
+                casos.append(caso)
+                print(
+                    f"{herramienta:<12} {forma:<10} {tamano:>11} líneas  "
+                    f"análisis {fases['fases']['analisis']:.4f} s  "
+                    f"cálculo {fases['fases']['calculo']:.4f} s  "
+                    f"salida {fases['fases']['salida']:.4f} s  "
+                    f"cli {cli['segundos']:.4f} s  "
+                    f"rss {fases['rss_maximo_kib'] / 1024:.1f} MiB"
+                )
+
+    resultados = {
+        "version_formato": VERSION_FORMATO,
+        "fecha": datetime.now(timezone.utc).isoformat(),
+        "commit": obtener_version_repositorio(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "procesadores": os.cpu_count(),
+        "semilla": argumentos.semilla,
+        "repeticiones": argumentos.repeticiones,
+        "casos": casos,
+    }
+    with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {argumentos.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+Paquete: comun
+Descripción: Utilidades compartidas por los programas de línea de comandos de los
+ejercicios.
+"""
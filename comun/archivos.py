@@ -0,0 +1,64 @@
+"""
+Módulo: archivos.py
+Descripción: Utilidades de archivos comunes a compute_statistics.py y
+word_count.py: expansión de patrones glob en la línea de comandos y división de
+un archivo en rangos de bytes para procesarlos en paralelo.
+"""
+
+import glob
+import os
+
+TAMANO_LECTURA = 1 << 16
+
+
+def expandir_rutas(patrones):
+    """
+    Expande los patrones glob de la lista (por ejemplo 'TC*.txt') y devuelve las
+    rutas resultantes. Los argumentos sin comodines se conservan tal cual.
+    """
+    rutas = []
+    for patron in patrones:
+        if glob.has_magic(patron):
+            rutas.extend(sorted(glob.glob(patron)))
+        else:
+            rutas.append(patron)
+    return rutas
+
+
+def primer_salto_de_linea(datos):
+    """Devuelve la posición del primer salto de línea de los bytes dados, o -1."""
+    return datos.find(b'\n')
+
+
+def dividir_en_rangos(ruta_archivo, partes, buscar_separador=primer_salto_de_linea):
+    """
+    Divide el archivo en hasta `partes` rangos de bytes (inicio, fin) contiguos.
+    Cada corte se hace justo después del primer separador desde el punto ideal;
+    buscar_separador(datos) devuelve su posición en los bytes dados, o -1. Con el
+    separador por omisión cada rango empieza al inicio de una línea, de modo que
+    ninguna línea queda partida entre dos rangos.
+    """
+    tamano = os.path.getsize(ruta_archivo)
+    if tamano == 0:
+        return []
+    limites = [0]
+    with open(ruta_archivo, 'rb') as archivo:
+        for parte in range(1, partes):
+            posicion = max(tamano * parte // partes - 1, limites[-1])
+            archivo.seek(posicion)
+            while True:
+                datos = archivo.read(TAMANO_LECTURA)
+                if not datos:
+                    posicion = tamano
+                    break
+                encontrado = buscar_separador(datos)
+                if encontrado != -1:
+                    posicion += encontrado + 1
+                    break
+                posicion += len(datos)
+            if posicion >= tamano:
+                break
+            if posicion > limites[-1]:
+                limites.append(posicion)
+    limites.append(tamano)
+    return list(zip(limites, limites[1:]))
@@ -0,0 +1,165 @@
+"""
+Módulo: instrumentacion.py
+Descripción: Capa de instrumentación común a los programas de línea de comandos
+(compute_statistics, convert_numbers, word_count y compute_sales).
+
+Mide fases con nombre usando time.perf_counter_ns(), cuenta los registros
+procesados y rechazados y, si se pide, perfila la ejecución con cProfile y mide el
+pico de memoria con tracemalloc. Al terminar emite un registro JSON de métricas
+en una sola línea (formato JSON Lines), que se agrega a un archivo o se escribe en
+la salida de errores para que lo recojan otras herramientas.
+
+Uso típico:
+    agregar_argumentos(parser)
+    argumentos = parser.parse_args()
+    instrumentacion = Instrumentacion.desde_argumentos("word_count", argumentos)
+    with instrumentacion.fase("lectura"):
+        ...
+    instrumentacion.contar(procesados=n, rechazados=m)
+    instrumentacion.terminar()
+"""
+
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+VERSION_METRICAS = 1
+
+
+def agregar_argumentos(parser):
+    """Agrega a un ArgumentParser las opciones de métricas y perfilado."""
+    grupo = parser.add_argument_group("instrumentación")
+    grupo.add_argument(
+        "--metricas", metavar="ARCHIVO",
+        help="agrega un registro JSON de métricas a ARCHIVO ('-' para la salida de errores)"
+    )
+    grupo.add_argument(
+        "--perfil", metavar="ARCHIVO",
+        help="perfila la ejecución con cProfile y guarda las estadísticas en ARCHIVO"
+    )
+    grupo.add_argument(
+        "--memoria", action="store_true",
+        help="mide el pico de memoria de Python con tracemalloc (más lento)"
+    )
+
+
+class Perfilado:
+    """
+    Perfilado opcional de una ejecución: cProfile si se indica la ruta donde
+    guardar sus estadísticas y el pico de memoria con tracemalloc si memoria es
+    True. Empieza al crear el objeto.
+    """
+
+    def __init__(self, ruta=None, memoria=False):
+        self.ruta = ruta
+        self.memoria = memoria
+        self.perfilador = None
+        if memoria:
+            tracemalloc.start()
+        if ruta:
+            self.perfilador = cProfile.Profile()
+            self.perfilador.enable()
+
+    def anotar(self, registro):
+        """Agrega al registro de métricas el pico de memoria y la ruta del perfil."""
+        if self.memoria and tracemalloc.is_tracing():
+            registro["memoria_pico_bytes"] = tracemalloc.get_traced_memory()[1]
+        if self.ruta:
+            registro["perfil"] = self.ruta
+
+    def guardar_perfil(self):
+        """Detiene cProfile, si estaba activo, y guarda sus estadísticas."""
+        if self.perfilador is not None:
+            self.perfilador.disable()
+            self.perfilador.dump_stats(self.ruta)
+            self.perfilador = None
+
+    def detener_memoria(self):
+        """Detiene tracemalloc si lo inició este perfilado."""
+        if self.memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class Instrumentacion:
+    """
+    Acumula los tiempos por fase y los contadores de registros de una ejecución.
+    Los tiempos de una fase que se repite se suman. El reloj total empieza al
+    crear el objeto.
+    """
+
+    def __init__(self, herramienta, destino=None, perfil=None, memoria=False):
+        self.herramienta = herramienta
+        self.destino = destino
+        self.fases = {}
+        self.contadores = {"procesados": 0, "rechazados": 0}
+        self.fecha_inicio = datetime.now(timezone.utc)
+        self.perfilado = Perfilado(perfil, memoria)
+        self.inicio_ns = time.perf_counter_ns()
+
+    @classmethod
+    def desde_argumentos(cls, herramienta, argumentos):
+        """Crea la instrumentación con las opciones de agregar_argumentos()."""
+        return cls(
+            herramienta,
+            destino=getattr(argumentos, "metricas", None),
+            perfil=getattr(argumentos, "perfil", None),
+            memoria=getattr(argumentos, "memoria", False),
+        )
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide el bloque `with` y suma su duración a la fase indicada."""
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.fases[nombre] = self.fases.get(nombre, 0) + time.perf_counter_ns() - inicio
+
+    def contar(self, procesados=0, rechazados=0):
+        """Suma registros procesados y rechazados a los contadores."""
+        self.contadores["procesados"] += procesados
+        self.contadores["rechazados"] += rechazados
+
+    def transcurrido(self):
+        """Devuelve los segundos transcurridos desde el inicio de la ejecución."""
+        return (time.perf_counter_ns() - self.inicio_ns) / 1e9
+
+    def registro(self):
+        """Devuelve el registro de métricas como un diccionario serializable."""
+        duracion_ns = time.perf_counter_ns() - self.inicio_ns
+        registro = {
+            "version": VERSION_METRICAS,
+            "herramienta": self.herramienta,
+            "inicio": self.fecha_inicio.isoformat(),
+            "pid": os.getpid(),
+            "argumentos": sys.argv[1:],
+            "duracion_ns": duracion_ns,
+            "fases_ns": dict(self.fases),
+            "procesados": self.contadores["procesados"],
+            "rechazados": self.contadores["rechazados"],
+            "registros_por_segundo": (
+                self.contadores["procesados"] * 1e9 / duracion_ns if duracion_ns else None
+            ),
+        }
+        self.perfilado.anotar(registro)
+        return registro
+
+    def terminar(self):
+        """
+        Detiene el perfilado, guarda las estadísticas de cProfile y emite el registro
+        de métricas si se indicó un destino. Devuelve el registro.
+        """
+        self.perfilado.guardar_perfil()
+        registro = self.registro()
+        self.perfilado.detener_memoria()
+        if self.destino == "-":
+            print(json.dumps(registro, ensure_ascii=False), file=sys.stderr)
+        elif self.destino:
+            with open(self.destino, "a", encoding="utf-8") as archivo:
+                archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        return registro
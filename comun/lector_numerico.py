@@ -0,0 +1,150 @@
+"""
+Módulo: lector_numerico.py
+Descripción: Lector por bloques de archivos con un número por línea, común a
+compute_statistics.py y convert_numbers.py. El archivo se mapea en memoria y se
+corta en bloques de líneas completas; cada lote de líneas bien formado se
+convierte de una sola vez y las líneas inválidas se reportan juntas al final.
+"""
+
+import mmap
+import os
+from collections import namedtuple
+
+TAMANO_BLOQUE = 1 << 20
+LINEAS_POR_LOTE = 4096
+MAXIMO_ADVERTENCIAS = 50
+
+
+class Conversion(namedtuple("Conversion", "rapida por_linea rango", defaults=(float, None, None))):
+    """
+    Reglas para convertir líneas en números. `rapida` se aplica con map() a cada
+    lote; en los lotes que fallan, cada línea se convierte con `por_linea` (por
+    omisión, la misma función). Los números fuera de `rango`, una tupla opcional
+    (mínimo, máximo), se tratan como inválidos.
+    """
+    __slots__ = ()
+
+
+def iterar_lotes_de_lineas(ruta_archivo, inicio=0, fin=None):
+    """
+    Genera listas de líneas en bytes del rango [inicio, fin) de un archivo.
+    Los cortes de cada bloque se buscan en los bytes crudos (sin decodificar UTF-8)
+    y cada bloque de hasta TAMANO_BLOQUE bytes se separa en líneas de una sola vez,
+    sin crear un str por línea. El rango debe empezar al inicio de una línea.
+    """
+    tamano = os.path.getsize(ruta_archivo)
+    fin = tamano if fin is None else min(fin, tamano)
+    if inicio >= fin:
+        return
+    with open(ruta_archivo, 'rb') as archivo:
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            posicion = inicio
+            while posicion < fin:
+                limite = min(posicion + TAMANO_BLOQUE, fin)
+                if limite < fin:
+                    corte = mapa.rfind(b'\n', posicion, limite)
+                    if corte == -1:
+                        corte = mapa.find(b'\n', limite, fin)
+                    limite = fin if corte == -1 else corte + 1
+                lineas = mapa[posicion:limite].split(b'\n')
+                if not lineas[-1]:
+                    lineas.pop()
+                yield lineas
+                posicion = limite
+
+
+def convertir_lineas(lineas, primera_linea, advertencias, conversion=Conversion()):
+    """
+    Convierte una lista de líneas (str o bytes) en números por lotes de
+    LINEAS_POR_LOTE, según las reglas de `conversion`. Solo los lotes con datos
+    inválidos o fuera de rango se analizan línea por línea. Las líneas inválidas
+    se agregan a advertencias como tuplas (número de línea, texto), contando desde
+    primera_linea + 1.
+    """
+    rapida, por_linea, rango = conversion
+    por_linea = por_linea or rapida
+    numeros = []
+    for inicio in range(0, len(lineas), LINEAS_POR_LOTE):
+        lote = lineas[inicio:inicio + LINEAS_POR_LOTE]
+        try:
+            convertidos = list(map(rapida, lote))
+            if rango is not None and convertidos and (
+                    min(convertidos) < rango[0] or max(convertidos) > rango[1]):
+                raise ValueError
+        except ValueError:
+            for numero_linea, linea in enumerate(lote, start=primera_linea + inicio + 1):
+                try:
+                    numero = por_linea(linea)
+                except ValueError:
+                    numero = None
+                if numero is not None and (rango is None or rango[0] <= numero <= rango[1]):
+                    numeros.append(numero)
+                    continue
+                if isinstance(linea, bytes):
+                    linea = linea.decode('utf-8', errors='replace')
+                advertencias.append((numero_linea, linea.strip()))
+        else:
+            numeros.extend(convertidos)
+    return numeros
+
+
+def iterar_bloques_de_numeros(ruta_archivo, advertencias, conversion=Conversion()):
+    """
+    Genera una lista de números válidos por cada bloque del archivo, leído con
+    iterar_lotes_de_lineas(). Las líneas inválidas se agregan a advertencias.
+    """
+    lineas_leidas = 0
+    for lineas in iterar_lotes_de_lineas(ruta_archivo):
+        yield convertir_lineas(lineas, lineas_leidas, advertencias, conversion)
+        lineas_leidas += len(lineas)
+
+
+class AdvertenciasAcotadas:
+    """
+    Líneas inválidas de un archivo con memoria acotada: guarda solo las primeras
+    `maximo` y cuenta todas. Sirve donde se espera la lista de advertencias, porque
+    convertir_lineas() solo llama a append() y reportar_advertencias() solo usa
+    len() y cortes, que se aplican a la muestra guardada.
+    """
+
+    def __init__(self, muestra=(), total=0, maximo=MAXIMO_ADVERTENCIAS):
+        self.maximo = maximo
+        self.muestra = [tuple(advertencia) for advertencia in muestra][:maximo]
+        self.total = max(total, len(self.muestra))
+
+    def append(self, advertencia):
+        """Cuenta una línea inválida y la guarda si la muestra aún no está llena."""
+        self.total += 1
+        if len(self.muestra) < self.maximo:
+            self.muestra.append(advertencia)
+
+    def copia(self):
+        """Devuelve una copia independiente de la muestra y el total."""
+        return AdvertenciasAcotadas(self.muestra, self.total, self.maximo)
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        return iter(self.muestra)
+
+    def __getitem__(self, indice):
+        return self.muestra[indice]
+
+
+def reportar_advertencias(advertencias):
+    """
+    Muestra en un solo bloque las líneas inválidas que se ignoraron.
+    Si son muchas, solo se detallan las primeras MAXIMO_ADVERTENCIAS.
+    """
+    if not advertencias:
+        return
+    mensajes = [
+        f"Dato inválido en la línea {numero_linea}: '{linea}' (ignorado)"
+        for numero_linea, linea in advertencias[:MAXIMO_ADVERTENCIAS]
+    ]
+    if len(advertencias) > MAXIMO_ADVERTENCIAS:
+        mensajes.append(
+            f"... y {len(advertencias) - MAXIMO_ADVERTENCIAS} líneas inválidas más (ignoradas)"
+        )
+    print("\n".join(mensajes))
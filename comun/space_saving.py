@@ -0,0 +1,142 @@
+"""
+Módulo: space_saving.py
+Descripción: Resumen Space-Saving de memoria acotada para encontrar los valores
+más frecuentes de un flujo. Lo usan compute_statistics.py (a través de
+frecuencias.py) para la moda aproximada y word_count.py para los n-gramas.
+Los valores pueden ser de cualquier tipo hashable y comparable entre sí.
+"""
+
+import heapq
+from collections import Counter
+
+
+class SpaceSaving:
+    """
+    Resumen Space-Saving (Metwally et al.) de los valores más frecuentes.
+    Guarda como máximo `capacidad` contadores; cuando llega un valor nuevo y no hay
+    espacio, reemplaza al contador mínimo y hereda su conteo como error. Para cada
+    valor guardado, conteo - error <= frecuencia real <= conteo, y todo valor con
+    frecuencia mayor que total / capacidad está garantizado en el resumen.
+    """
+
+    def __init__(self, capacidad=1000):
+        self.capacidad = capacidad
+        self.total = 0
+        self.contadores = {}
+        self.monticulo = []
+
+    def agregar(self, valor, conteo=1):
+        """Cuenta `conteo` apariciones de un valor."""
+        self.total += conteo
+        entrada = self.contadores.get(valor)
+        if entrada is not None:
+            entrada[0] += conteo
+        elif len(self.contadores) < self.capacidad:
+            entrada = self.contadores[valor] = [conteo, 0]
+        else:
+            minimo, expulsado = self._extraer_minimo()
+            del self.contadores[expulsado]
+            entrada = self.contadores[valor] = [minimo + conteo, minimo]
+        heapq.heappush(self.monticulo, (entrada[0], valor))
+        if len(self.monticulo) > 4 * self.capacidad + 16:
+            self._reconstruir_monticulo()
+
+    @classmethod
+    def desde_conteos(cls, conteos, capacidad=1000):
+        """
+        Crea un resumen a partir de una tabla exacta {valor: conteo}, conservando
+        los `capacidad` valores de mayor conteo con error 0. Los descartados tienen
+        a lo sumo el conteo mínimo conservado, así que las cotas de error siguen
+        valiendo para lo que se agregue después.
+        """
+        resumen = cls(capacidad)
+        resumen.total = sum(conteos.values())
+        mayores = heapq.nlargest(capacidad, conteos.items(), key=lambda par: par[1])
+        resumen.contadores = {valor: [conteo, 0] for valor, conteo in mayores}
+        resumen._reconstruir_monticulo()
+        return resumen
+
+    def agregar_bloque(self, valores):
+        """Cuenta una lista de valores, agrupando antes los repetidos del bloque."""
+        for valor, conteo in Counter(valores).items():
+            self.agregar(valor, conteo)
+
+    def _extraer_minimo(self):
+        """Devuelve (conteo, valor) del contador mínimo, descartando entradas obsoletas."""
+        while True:
+            conteo, valor = heapq.heappop(self.monticulo)
+            entrada = self.contadores.get(valor)
+            if entrada is not None and entrada[0] == conteo:
+                return conteo, valor
+
+    def _reconstruir_monticulo(self):
+        """Rehace el montículo solo con los conteos vigentes."""
+        self.monticulo = [(entrada[0], valor) for valor, entrada in self.contadores.items()]
+        heapq.heapify(self.monticulo)
+
+    def minimo(self):
+        """Conteo mínimo guardado si el resumen está lleno, o 0 si aún hay espacio."""
+        if len(self.contadores) < self.capacidad:
+            return 0
+        return min(entrada[0] for entrada in self.contadores.values())
+
+    def fusionar(self, otro):
+        """
+        Combina otro resumen con este (Agarwal et al.): a los valores ausentes en un
+        lado se les suma el mínimo de ese lado como conteo y error, y se conservan
+        los `capacidad` contadores mayores.
+        """
+        minimo_propio = self.minimo()
+        minimo_otro = otro.minimo()
+        combinados = {}
+        for valor in list(self.contadores) + [v for v in otro.contadores
+                                              if v not in self.contadores]:
+            conteo_propio, error_propio = self.contadores.get(
+                valor, (minimo_propio, minimo_propio))
+            conteo_otro, error_otro = otro.contadores.get(valor, (minimo_otro, minimo_otro))
+            combinados[valor] = [conteo_propio + conteo_otro, error_propio + error_otro]
+        if len(combinados) > self.capacidad:
+            conservados = heapq.nlargest(
+                self.capacidad, combinados.items(), key=lambda par: par[1][0])
+            combinados = dict(conservados)
+        self.contadores = combinados
+        self.total += otro.total
+        self._reconstruir_monticulo()
+        return self
+
+    def top(self, k):
+        """
+        Devuelve los k valores con mayor conteo estimado como tuplas
+        (valor, conteo, error), ordenadas de mayor a menor conteo.
+        """
+        mayores = heapq.nlargest(k, self.contadores.items(), key=lambda par: par[1][0])
+        return [(valor, conteo, error) for valor, (conteo, error) in mayores]
+
+    def moda(self):
+        """
+        Devuelve el valor (o la lista de valores) con el mayor conteo estimado.
+        """
+        maximo = max(entrada[0] for entrada in self.contadores.values())
+        modas = [valor for valor, entrada in self.contadores.items() if entrada[0] == maximo]
+        return modas if len(modas) > 1 else modas[0]
+
+    def to_dict(self):
+        """Devuelve una representación serializable (JSON) del resumen."""
+        return {
+            "modo": "aproximada",
+            "capacidad": self.capacidad,
+            "total": self.total,
+            "contadores": [[valor, conteo, error]
+                           for valor, (conteo, error) in self.contadores.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, datos):
+        """Reconstruye el resumen a partir de to_dict()."""
+        resumen = cls(datos["capacidad"])
+        resumen.total = datos["total"]
+        resumen.contadores = {
+            valor: [conteo, error] for valor, conteo, error in datos["contadores"]
+        }
+        resumen._reconstruir_monticulo()
+        return resumen